@@ -0,0 +1,91 @@
+""" Benchmark of the peak memory of a repeated task whose sub-tasks use the same model, with and without sharing a single
+RoadRunner instance among the sub-tasks (``SHARE_MODELS``)
+
+Each configuration is measured in a new process, so that the peak resident set sizes don't include each other.
+
+Usage::
+
+    python benchmarks/share_models_memory.py [--num-sub-tasks 40] [--model tests/fixtures/BIOMD0000000297.xml]
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from biosimulators_tellurium import core
+from biosimulators_tellurium.config import Config as SimulatorConfig
+from biosimulators_utils.sedml import data_model as sedml_data_model
+import argparse
+import os
+import resource
+import subprocess
+import sys
+
+
+def get_peak_memory(model_filename, num_sub_tasks, share_models):
+    """ Preprocess and execute a repeated task with sub-tasks which use the same model
+
+    Args:
+        model_filename (:obj:`str`): path to an SBML file
+        num_sub_tasks (:obj:`int`): number of sub-tasks
+        share_models (:obj:`bool`): whether the sub-tasks should share a single RoadRunner instance
+
+    Returns:
+        :obj:`float`: peak resident set size of the process, in MB
+    """
+    model = sedml_data_model.Model(id='model', source=os.path.abspath(model_filename),
+                                   language=sedml_data_model.ModelLanguage.SBML.value)
+    tasks = []
+    for i_task in range(num_sub_tasks):
+        tasks.append(sedml_data_model.Task(
+            id='task_{}'.format(i_task),
+            model=model,
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=10. * (i_task + 1),
+                number_of_points=100,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        ))
+    repeated_task = sedml_data_model.RepeatedTask(
+        id='repeated_task',
+        sub_tasks=[sedml_data_model.SubTask(task=task, order=i_task) for i_task, task in enumerate(tasks)],
+    )
+    variables = [
+        sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time.value, task=repeated_task),
+    ]
+
+    simulator_config = SimulatorConfig()
+    simulator_config.share_models = share_models
+    preprocessed_task = core.preprocess_sed_task(repeated_task, variables, simulator_config=simulator_config)
+    for task in tasks:
+        core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, simulator_config=simulator_config)
+
+    # ``ru_maxrss`` is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--num-sub-tasks', type=int, default=40)
+    parser.add_argument('--model', default=os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures',
+                                                        'BIOMD0000000297.xml'))
+    parser.add_argument('--share-models', type=int, choices=[0, 1], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.share_models is not None:
+        print(get_peak_memory(args.model, args.num_sub_tasks, bool(args.share_models)))
+        return
+
+    for share_models in [0, 1]:
+        peak_memory = float(subprocess.check_output([
+            sys.executable, __file__,
+            '--num-sub-tasks', str(args.num_sub_tasks),
+            '--model', args.model,
+            '--share-models', str(share_models),
+        ]).decode().strip().split('\n')[-1])
+        print('SHARE_MODELS={}: peak RSS {:.0f} MB'.format(share_models, peak_memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,10 @@
 from ._version import __version__  # noqa: F401
 # :obj:`str`: version
 
+from .batch import exec_sedml_docs_in_combine_archives, read_combine_archive_manifest  # noqa: F401
 from .core import exec_sed_task, preprocess_sed_task, exec_sed_doc, exec_sedml_docs_in_combine_archive  # noqa: F401
-from .data_model import SedmlInterpreter, PlottingEngine, PreprocesssedTask  # noqa: F401
+from .planning import plan_combine_archive  # noqa: F401
+from .data_model import SedmlInterpreter, PlottingEngine, PreprocesssedTask, TaskPlan, ArchivePlan  # noqa: F401
 import tellurium
 
 __all__ = [
@@ -12,10 +14,15 @@ __all__ = [
     'preprocess_sed_task',
     'exec_sed_doc',
     'exec_sedml_docs_in_combine_archive',
+    'exec_sedml_docs_in_combine_archives',
+    'read_combine_archive_manifest',
+    'plan_combine_archive',
 
     'SedmlInterpreter',
     'PlottingEngine',
     'PreprocesssedTask',
+    'TaskPlan',
+    'ArchivePlan',
 ]
 
 
@@ -8,13 +8,21 @@
 
 from . import get_simulator_version
 from ._version import __version__
+from .batch import exec_sedml_docs_in_combine_archives, read_combine_archive_manifest
 from .config import Config
 from .core import exec_sedml_docs_in_combine_archive
 from .data_model import SedmlInterpreter, PlottingEngine
+from .planning import plan_combine_archive
+from biosimulators_utils.config import get_config
 from biosimulators_utils.simulator.cli import build_cli
 from biosimulators_utils.simulator.data_model import EnvironmentVariable
 from biosimulators_utils.simulator.environ import ENVIRONMENT_VARIABLES
 from unittest import mock
+import cement
+import copy
+import dataclasses
+import json
+import termcolor
 
 with mock.patch.dict('os.environ', {}):
     config = Config()
@@ -34,12 +42,277 @@ environment_variables = list(ENVIRONMENT_VARIABLES.values()) + [
         default=config.plotting_engine,
         more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
     ),
+    EnvironmentVariable(
+        name='SAVE_PLOT_DATA',
+        description=('Whether the tellurium SED-ML interpreter should save the data for plots as reports. If no visualization '
+                     'formats are requested and the data for plots is not saved, only the data needed for reports is simulated.'),
+        options=['0', '1'],
+        default='1' if config.save_plot_data else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='SCRATCH_DIR',
+        description=('Directory where the tellurium SED-ML interpreter should create temporary directories for its outputs '
+                     '(e.g., a RAM-backed file system). Defaults to the system temporary directory.'),
+        default=config.scratch_dir,
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='MODEL_CACHE_SIZE',
+        description='Maximum number of compiled models to keep in memory for reuse (0 disables the cache).',
+        default=str(config.model_cache_size),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='CODE_CACHE_SIZE',
+        description=('Maximum number of SED documents whose Python code generated by tellurium is kept in memory for reuse '
+                     '(0 disables the cache).'),
+        default=str(config.code_cache_size),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='RESULT_CACHE_SIZE',
+        description=('Maximum number of results of SED tasks to keep for reuse by identical tasks (0 disables the cache). '
+                     'Results are not reused for stochastic simulations without a fixed seed.'),
+        default=str(config.result_cache_size),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='RESULT_CACHE_DIR',
+        description='Directory where results of SED tasks should also be stored for reuse across processes.',
+        default=config.result_cache_dir,
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='VALIDATION_CACHE_SIZE',
+        description=('Maximum number of errors and warnings of the validation of SED-ML elements and models to keep in memory '
+                     'for reuse.'),
+        default=str(config.validation_cache_size),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='VALIDATION_CACHE_DIR',
+        description=('Directory where the errors and warnings of the validation of SED-ML elements and models should also be '
+                     'stored for reuse across processes.'),
+        default=config.validation_cache_dir,
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='H5_COMPRESSION',
+        description='Compression filter for the reports which the tellurium SED-ML interpreter saves in HDF5 format.',
+        options=['gzip', 'lzf', 'none'],
+        default=config.h5_compression,
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='INCREMENTAL',
+        description=('Whether to only re-execute the outputs of an archive whose SED documents, models or algorithms have '
+                     'changed since the previous execution of the archive into the same output directory.'),
+        options=['0', '1'],
+        default='1' if config.incremental else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='CHECKPOINT',
+        description=('Whether to durably record the progress of the execution of an archive in its output directory, so that '
+                     'an interrupted execution resumes from where it stopped when the archive is executed again.'),
+        options=['0', '1'],
+        default='1' if config.checkpoint else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='NUM_WORKERS',
+        description='Number of processes to use to execute a manifest of COMBINE/OMEX archives.',
+        default=str(config.num_workers),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='RUNTIME_DB',
+        description=('Path to a database of the observed runtimes of SED tasks, which is used to predict the durations of the '
+                     'archives of a manifest so that they can be executed longest first, and is updated with their runtimes.'),
+        default=config.runtime_db,
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='DEDUPLICATE_TASKS',
+        description=('Whether the biosimulators SED-ML interpreter should only simulate one of each set of equivalent tasks '
+                     '(tasks with equivalent models, changes and simulations), and reuse its results for the other tasks.'),
+        options=['0', '1'],
+        default='1' if config.deduplicate_tasks else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='IN_MEMORY_MODEL_CHANGES',
+        description=('Whether the biosimulators SED-ML interpreter should apply changes to the initial values of species, '
+                     'compartments and parameters to compiled models rather than to their XML, so that models which only '
+                     'differ in these values are only compiled once, and precompute the values of the set value changes '
+                     'of repeated tasks for all of their iterations at once.'),
+        options=['0', '1'],
+        default='1' if config.in_memory_model_changes else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='SHARE_MODELS',
+        description='Whether the sub-tasks of a task which use the same model should share a single RoadRunner instance.',
+        options=['0', '1'],
+        default='1' if config.share_models else '0',
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='MAX_RESIDENT_MODELS',
+        description=('Maximum number of RoadRunner instances for the sub-tasks of a task which are held in memory at once '
+                     '(0 for no limit).'),
+        default=str(config.max_resident_models),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='SIMULATION_CHUNK_SIZE',
+        description=('Number of steps of each chunk of a time course which is simulated and checked for nan, infinite, and '
+                     'out-of-bounds values before the next chunk is simulated (0 to simulate time courses without checks, '
+                     'except for the time courses of tasks with time limits, which are simulated in chunks of 1000 steps).'),
+        default=str(config.simulation_chunk_size),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='MAX_ABSOLUTE_VALUE',
+        description='Maximum magnitude of a simulated value before a time course simulated in chunks is aborted.',
+        default=str(config.max_absolute_value),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='STEADY_STATE_SOLVER_FALLBACKS',
+        description=('Comma-separated KiSAO ids of the steady-state algorithms which are tried, in order, when the algorithm '
+                     'of a task fails to find a steady state, before the model is presimulated.'),
+        default=','.join(config.steady_state_solver_fallbacks),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='TASK_TIME_LIMIT',
+        description='Maximum wall-clock time in seconds for the execution of each SED task (0 for no limit).',
+        default=str(config.task_time_limit),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
+    EnvironmentVariable(
+        name='ARCHIVE_TIME_LIMIT',
+        description='Maximum wall-clock time in seconds for the execution of each COMBINE/OMEX archive (0 for no limit).',
+        default=str(config.archive_time_limit),
+        more_info_url='https://docs.biosimulators.org/Biosimulators_tellurium/source/Biosimulators_tellurium.html',
+    ),
 ]
 
-App = build_cli('biosimulators-tellurium', __version__,
-                'tellurium', get_simulator_version(), 'http://tellurium.analogmachine.org',
-                exec_sedml_docs_in_combine_archive,
-                environment_variables=environment_variables)
+SingleArchiveApp = build_cli('biosimulators-tellurium', __version__,
+                             'tellurium', get_simulator_version(), 'http://tellurium.analogmachine.org',
+                             exec_sedml_docs_in_combine_archive,
+                             environment_variables=environment_variables)
+
+_SingleArchiveController = SingleArchiveApp.Meta.handlers[0]
+
+
+def _get_arguments():
+    """ Get the arguments of the command-line application, including the arguments for executing batches of archives
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: arguments
+    """
+    arguments = []
+    for flags, options in _SingleArchiveController.Meta.arguments:
+        options = copy.copy(options)
+        if '--archive' in flags:
+            options['required'] = False
+        arguments.append((flags, options))
+
+    arguments.append((
+        ['--manifest'],
+        dict(
+            type=str,
+            default=None,
+            help=('Path to a file which lists COMBINE/OMEX files to execute, one per line. The outputs of each archive '
+                  'are saved to a subdirectory of the output directory named after the archive.'),
+        ),
+    ))
+    arguments.append((
+        ['--workers'],
+        dict(
+            type=int,
+            default=None,
+            help='Number of processes to use to execute the archives listed in the manifest',
+        ),
+    ))
+    arguments.append((
+        ['--plan'],
+        dict(
+            action='store_true',
+            help=('Print a plan of the execution of the archive(s) in JSON format, with estimates of the number of their '
+                  'simulations, the sizes of their results, their peak memory and the sizes of their reports, without '
+                  'executing them. The models are compiled to validate the tasks and to estimate their memory, but not '
+                  'simulated.'),
+        ),
+    ))
+    return arguments
+
+
+class BaseController(_SingleArchiveController):
+    """ Base controller for command line application """
+
+    class Meta:
+        arguments = _get_arguments()
+
+    @cement.ex(hide=True)
+    def _default(self):
+        args = self.app.pargs
+
+        if args.manifest and args.archive:
+            raise SystemExit(termcolor.colored('Only one of an archive and a manifest of archives can be executed.', 'red'))
+
+        if not args.manifest and not args.archive:
+            raise SystemExit(termcolor.colored('An archive or a manifest of archives must be provided.', 'red'))
+
+        if args.plan:
+            return self._plan()
+
+        if not args.manifest:
+            return super()._default()
+
+        config = get_config()
+        config.LOG = True
+        try:
+            archive_filenames = read_combine_archive_manifest(args.manifest)
+            results = exec_sedml_docs_in_combine_archives(archive_filenames, args.out_dir, config=config, num_workers=args.workers)
+        except Exception as exception:
+            if config.DEBUG:
+                raise
+            raise SystemExit(termcolor.colored(str(exception), 'red')) from exception
+
+        failed_archive_filenames = [archive_filename for archive_filename, (_, log) in results.items() if log and log.exception]
+        if failed_archive_filenames:
+            raise SystemExit(termcolor.colored('{} of {} archives did not execute successfully:\n  - {}'.format(
+                len(failed_archive_filenames), len(results), '\n  - '.join(failed_archive_filenames)), 'red'))
+
+    def _plan(self):
+        """ Print plans of the executions of the archive or the archives of the manifest, without executing them """
+        args = self.app.pargs
+
+        config = get_config()
+        try:
+            if args.manifest:
+                archive_filenames = read_combine_archive_manifest(args.manifest)
+            else:
+                archive_filenames = [args.archive]
+            plans = [plan_combine_archive(archive_filename, config=config) for archive_filename in archive_filenames]
+        except Exception as exception:
+            if config.DEBUG:
+                raise
+            raise SystemExit(termcolor.colored(str(exception), 'red')) from exception
+
+        print(json.dumps([dataclasses.asdict(plan) for plan in plans], indent=2))
+
+
+class App(SingleArchiveApp):
+    """ Command line application """
+    class Meta:
+        handlers = [
+            BaseController,
+        ]
 
 
 def main():
@@ -0,0 +1,432 @@
+""" Methods for executing multiple COMBINE/OMEX archives and for scheduling them by the predicted costs of their tasks
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from .config import Config as SimulatorConfig
+from .core import exec_sedml_docs_in_combine_archive, get_all_tasks_from_task
+from .data_model import TaskCostPrediction
+from .utils import read_combine_archive_sed_docs, get_range_length
+from biosimulators_utils.config import get_config
+from biosimulators_utils.log.data_model import CombineArchiveLog, Status
+from biosimulators_utils.sedml.data_model import Task, UniformTimeCourseSimulation
+from biosimulators_utils.warnings import warn, BioSimulatorsWarning
+import collections
+import concurrent.futures
+import hashlib
+import json
+import lxml.etree
+import os
+import shutil
+import tempfile
+import warnings
+
+
+__all__ = [
+    'exec_sedml_docs_in_combine_archives',
+    'read_combine_archive_manifest',
+    'predict_archive_task_costs',
+]
+
+# :obj:`int`: version of the format of the databases of observed runtimes of tasks (:obj:`SimulatorConfig.runtime_db`)
+RUNTIME_DB_VERSION = 1
+
+# :obj:`dict`: relative costs of algorithms per time point and model element. Algorithms which aren't listed have
+# relative cost 1.
+ALGORITHM_COST_FACTORS = {
+    'KISAO_0000029': 10.,  # Gillespie
+}
+
+# :obj:`float`: predicted duration in seconds per unit of cost of tasks (see :obj:`get_task_cost`) when no runtimes have
+# been observed
+DEFAULT_RUNTIME_PER_COST = 1e-7
+
+
+def exec_sedml_docs_in_combine_archives(archive_filenames, out_dir, config=None, simulator_config=None, num_workers=None):
+    """ Execute the SED tasks defined in multiple COMBINE/OMEX archives and save their outputs
+
+    The archives are executed with the same configuration by one process, or by a pool of processes. Each process keeps
+    the models that it compiles, the algorithm substitutions that it resolves, and its configuration warm across the
+    archives that it executes. Pools execute the archives in the order of their predicted durations, longest first (see
+    :obj:`predict_archive_task_costs`). The predicted durations of the tasks are recorded in the logs of the archives,
+    and their runtimes are recorded in the database of observed runtimes (``simulator_config.runtime_db``), if any.
+
+    An exception raised by the execution of an archive (e.g., by a worker process which crashed) doesn't stop the
+    execution of the other archives. The exception is recorded in the log of the archive, whose results are :obj:`None`,
+    unless ``config.DEBUG`` is set.
+
+    Args:
+        archive_filenames (:obj:`list` of :obj:`str`): paths to COMBINE/OMEX archives
+        out_dir (:obj:`str`): path to store the outputs of the archives. The outputs of each archive are saved to
+            ``{ out_dir }/{ name of archive without its extension }``.
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+        num_workers (:obj:`int`, optional): number of processes to execute the archives with. Defaults to
+            ``simulator_config.num_workers``.
+
+    Returns:
+        :obj:`collections.OrderedDict`: dictionary that maps the path of each archive to a tuple of its results
+        (:obj:`SedDocumentResults`) and log (:obj:`CombineArchiveLog`)
+    """
+    if not config:
+        config = get_config()
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+    if num_workers is None:
+        num_workers = simulator_config.num_workers
+
+    archive_out_dirs = collections.OrderedDict()
+    for archive_filename in archive_filenames:
+        archive_out_dir = os.path.join(out_dir, os.path.splitext(os.path.basename(archive_filename))[0])
+        if archive_out_dir in archive_out_dirs.values():
+            raise ValueError('The outputs of multiple archives would be saved to `{}`. Archives must have unique names.'.format(
+                archive_out_dir))
+        archive_out_dirs[archive_filename] = archive_out_dir
+
+    # predict the durations of the archives, and execute them longest first so that the pool isn't left waiting for a
+    # long archive which started last
+    predictions = None
+    if num_workers > 1 or simulator_config.runtime_db:
+        runtime_db = read_runtime_database(simulator_config.runtime_db) if simulator_config.runtime_db else {}
+        predictions = collections.OrderedDict(
+            (archive_filename, predict_archive_task_costs(archive_filename, runtime_db=runtime_db, config=config))
+            for archive_filename in archive_out_dirs.keys()
+        )
+        schedule = sorted(archive_out_dirs.keys(),
+                          key=lambda archive_filename: -sum(prediction.duration for prediction in predictions[archive_filename]))
+    else:
+        schedule = list(archive_out_dirs.keys())
+
+    results = collections.OrderedDict((archive_filename, None) for archive_filename in archive_out_dirs.keys())
+    if num_workers == 1:
+        for archive_filename in schedule:
+            try:
+                results[archive_filename] = exec_sedml_docs_in_combine_archive(
+                    archive_filename, archive_out_dirs[archive_filename], config=config, simulator_config=simulator_config)
+            except Exception as exception:
+                if config.DEBUG:
+                    raise
+                results[archive_filename] = get_failed_archive_results(exception)
+
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = collections.OrderedDict(
+                (archive_filename, executor.submit(exec_sedml_docs_in_combine_archive,
+                                                   archive_filename, archive_out_dirs[archive_filename],
+                                                   config=config, simulator_config=simulator_config))
+                for archive_filename in schedule
+            )
+            for archive_filename, future in futures.items():
+                try:
+                    results[archive_filename] = future.result()
+                except Exception as exception:
+                    if config.DEBUG:
+                        raise
+                    results[archive_filename] = get_failed_archive_results(exception)
+
+    # record the predicted durations of the tasks in the logs of the archives, and their observed runtimes in the database
+    if predictions is not None:
+        if simulator_config.runtime_db:
+            runtime_db = read_runtime_database(simulator_config.runtime_db)
+        for archive_filename, (_, log) in results.items():
+            record_task_runtimes(predictions[archive_filename], log, runtime_db)
+        if simulator_config.runtime_db:
+            write_runtime_database(simulator_config.runtime_db, runtime_db)
+
+    return results
+
+
+def get_failed_archive_results(exception):
+    """ Get the results and log of a COMBINE/OMEX archive whose execution raised an exception
+
+    Args:
+        exception (:obj:`Exception`): exception
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`None`: results
+            * :obj:`CombineArchiveLog`: log, with the exception
+    """
+    return None, CombineArchiveLog(status=Status.FAILED, exception=exception)
+
+
+def read_combine_archive_manifest(filename):
+    """ Read a list of paths to COMBINE/OMEX archives from a manifest file
+
+    The manifest should contain one path per line. Blank lines and lines which begin with ``#`` are ignored. Relative
+    paths are interpreted relative to the directory of the manifest.
+
+    Args:
+        filename (:obj:`str`): path to the manifest
+
+    Returns:
+        :obj:`list` of :obj:`str`: paths to COMBINE/OMEX archives
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+
+    archive_filenames = []
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            archive_filenames.append(os.path.join(dirname, line))
+
+    return archive_filenames
+
+
+def predict_archive_task_costs(archive_filename, runtime_db=None, config=None):
+    """ Predict the costs and durations of the SED tasks of a COMBINE/OMEX archive without executing them
+
+    Only the tasks whose results the data generators of the SED documents of the archive need are predicted. The
+    duration of each task is predicted from its cost (see :obj:`get_task_cost`) and the runtimes of the previous tasks
+    with the same models and algorithms (see :obj:`predict_task_duration`).
+
+    Args:
+        archive_filename (:obj:`str`): path to COMBINE/OMEX archive
+        runtime_db (:obj:`dict`, optional): database of observed runtimes (see :obj:`read_runtime_database`)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`list` of :obj:`TaskCostPrediction`: predictions of the costs of the tasks of the archive, or an empty list
+            if the archive can't be read (the error is reported as a :obj:`BioSimulatorsWarning`)
+    """
+    archive_dir = tempfile.mkdtemp()
+    try:
+        # the warnings about the archive are reported when it's executed
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                docs = read_combine_archive_sed_docs(archive_filename, archive_dir, config=config)
+        except (OSError, ValueError) as exception:
+            warn('The costs of the tasks of `{}` could not be predicted because the archive could not be read:\n  {}'.format(
+                archive_filename, str(exception).replace('\n', '\n  ')), BioSimulatorsWarning)
+            return []
+
+        predictions = []
+        for location, doc in docs.items():
+            model_features = get_model_cost_features(doc, os.path.dirname(os.path.join(archive_dir, location)))
+
+            task_ids = set(variable.task.id
+                           for data_generator in doc.data_generators
+                           for variable in data_generator.variables
+                           if variable.task)
+            for task in doc.tasks:
+                if task.id not in task_ids:
+                    continue
+
+                sub_tasks = get_all_tasks_from_task(task)
+                model_hashes = sorted(set(model_features[sub_task.model.id][0] or '' for sub_task in sub_tasks))
+                if len(model_hashes) == 1:
+                    model_hash = model_hashes[0]
+                else:
+                    model_hash = hashlib.sha256(' '.join(model_hashes).encode()).hexdigest()
+
+                prediction = TaskCostPrediction(
+                    sed_document=location,
+                    task=task.id,
+                    model_hash=model_hash,
+                    algorithm=' '.join(sorted(set(sub_task.simulation.algorithm.kisao_id for sub_task in sub_tasks))),
+                    cost=get_task_cost(task, model_features),
+                )
+                prediction.duration = predict_task_duration(prediction, runtime_db or {})
+                predictions.append(prediction)
+
+    finally:
+        shutil.rmtree(archive_dir)
+
+    return predictions
+
+
+def get_model_cost_features(doc, working_dir):
+    """ Get the features of the models of a SED document which determine the costs of simulating them
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each model to a tuple of the hash of the contents of its file
+            (:obj:`None` if the model isn't a local file) and its number of elements (species, reactions, compartments,
+            parameters, rules and events; at least 1)
+    """
+    models = {model.id: model for model in doc.models}
+
+    features = {}
+    file_features = {}
+    for model in doc.models:
+        source = model.source
+        while source.startswith('#') and source[1:] in models and models[source[1:]] is not model:
+            source = models[source[1:]].source
+
+        # models which share a file are only read once
+        filename = os.path.join(working_dir, source)
+        if filename in file_features:
+            features[model.id] = file_features[filename]
+            continue
+
+        model_hash = None
+        size = 1
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as file:
+                contents = file.read()
+            model_hash = hashlib.sha256(contents).hexdigest()
+            try:
+                size = max(1, len(lxml.etree.fromstring(contents).xpath(
+                    "//*[local-name()='species' or local-name()='reaction' or local-name()='compartment'"
+                    " or local-name()='parameter' or local-name()='localParameter' or local-name()='assignmentRule'"
+                    " or local-name()='rateRule' or local-name()='algebraicRule' or local-name()='event']")))
+            except lxml.etree.XMLSyntaxError:
+                pass
+
+        features[model.id] = file_features[filename] = (model_hash, size)
+
+    return features
+
+
+def get_task_cost(task, model_features):
+    """ Estimate the cost of a SED task as the sum over its executions (including the executions of the sub-tasks of each
+    iteration of repeated tasks) of the product of the number of time points of the simulation of the execution, the
+    number of elements of its model, and the relative cost of its algorithm (:obj:`ALGORITHM_COST_FACTORS`)
+
+    Args:
+        task (:obj:`AbstractTask`): task
+        model_features (:obj:`dict`): dictionary that maps the id of each model to its features (see
+            :obj:`get_model_cost_features`)
+
+    Returns:
+        :obj:`float`: cost of the task, in arbitrary units
+    """
+    if isinstance(task, Task):
+        simulation = task.simulation
+        if isinstance(simulation, UniformTimeCourseSimulation):
+            num_time_points = simulation.number_of_steps + 1
+        else:
+            num_time_points = 1
+        return (num_time_points
+                * model_features[task.model.id][1]
+                * ALGORITHM_COST_FACTORS.get(simulation.algorithm.kisao_id, 1.))
+
+    return get_range_length(task.range) * sum(get_task_cost(sub_task.task, model_features) for sub_task in task.sub_tasks)
+
+
+def predict_task_duration(prediction, runtime_db):
+    """ Predict the duration of a SED task from its cost and the average runtime per unit of cost of the previous tasks
+    with the same models and algorithms. If no such tasks were observed, the average runtime of the previous tasks with
+    the same algorithms, or of all previous tasks, is used.
+
+    Args:
+        prediction (:obj:`TaskCostPrediction`): prediction of the cost of the task
+        runtime_db (:obj:`dict`): database of observed runtimes (see :obj:`read_runtime_database`)
+
+    Returns:
+        :obj:`float`: predicted duration in seconds
+    """
+    observations = [
+        [runtime_db.get(prediction.model_hash, {}).get(prediction.algorithm, None)],
+        [algorithms.get(prediction.algorithm, None) for algorithms in runtime_db.values()],
+        [observation for algorithms in runtime_db.values() for observation in algorithms.values()],
+    ]
+    for observation_set in observations:
+        observation_set = [observation for observation in observation_set if observation and observation['cost'] > 0]
+        if observation_set:
+            runtime_per_cost = (sum(observation['duration'] for observation in observation_set)
+                                / sum(observation['cost'] for observation in observation_set))
+            return prediction.cost * runtime_per_cost
+    return prediction.cost * DEFAULT_RUNTIME_PER_COST
+
+
+def record_task_runtimes(predictions, log, runtime_db):
+    """ Record the predicted durations of the SED tasks of a COMBINE/OMEX archive in its log
+    (``simulatorDetails.predictedDuration``), and add the observed runtimes of the tasks to a database
+
+    Only the runtimes of tasks which were simulated are observed (not those of tasks whose results were reused from
+    equivalent tasks, caches or checkpoints). When the log doesn't record tasks, the duration of each SED document is
+    apportioned to its tasks in proportion to their costs.
+
+    Args:
+        predictions (:obj:`list` of :obj:`TaskCostPrediction`): predictions of the costs of the tasks of the archive
+        log (:obj:`CombineArchiveLog`): log of the execution of the archive
+        runtime_db (:obj:`dict`): database of observed runtimes (see :obj:`read_runtime_database`)
+    """
+    if not log or not log.sed_documents:
+        return
+
+    def observe(prediction, cost, duration):
+        observation = runtime_db.setdefault(prediction.model_hash, {}).setdefault(prediction.algorithm, {'cost': 0., 'duration': 0.})
+        observation['cost'] += cost
+        observation['duration'] += duration
+
+    for location, doc_log in log.sed_documents.items():
+        doc_predictions = [prediction for prediction in predictions if prediction.sed_document == location]
+
+        if doc_log.tasks:
+            for prediction in doc_predictions:
+                task_log = doc_log.tasks.get(prediction.task, None)
+                if task_log is None:
+                    continue
+
+                simulator_details = task_log.simulator_details or {}
+                if (
+                    task_log.status == Status.SUCCEEDED
+                    and task_log.duration is not None
+                    and 'duplicateOf' not in simulator_details
+                    and not simulator_details.get('restoredFromCheckpoint', False)
+                    and simulator_details.get('resultCache', None) != 'hit'
+                ):
+                    observe(prediction, prediction.cost, task_log.duration)
+
+                task_log.simulator_details = dict(simulator_details, predictedDuration=prediction.duration)
+
+        elif doc_log.status == Status.SUCCEEDED and doc_log.duration is not None:
+            total_cost = sum(prediction.cost for prediction in doc_predictions)
+            for prediction in doc_predictions:
+                if total_cost > 0:
+                    observe(prediction, prediction.cost, doc_log.duration * prediction.cost / total_cost)
+
+    if log.out_dir:
+        log.export()
+
+
+def read_runtime_database(filename):
+    """ Read a database of the observed runtimes of SED tasks
+
+    Args:
+        filename (:obj:`str`): path to the database
+
+    Returns:
+        :obj:`dict`: dictionary that maps the hash of the models of tasks to dictionaries which map the KiSAO ids of the
+            algorithms of tasks to the total cost (``cost``) and duration in seconds (``duration``) of the tasks with
+            the models and algorithms which were observed
+    """
+    if not os.path.isfile(filename):
+        return {}
+
+    try:
+        with open(filename, 'r') as file:
+            runtime_db = json.load(file)
+    except ValueError:
+        return {}
+
+    if not isinstance(runtime_db, dict) or runtime_db.get('version', None) != RUNTIME_DB_VERSION:
+        return {}
+    return runtime_db['runtimes']
+
+
+def write_runtime_database(filename, runtimes):
+    """ Save a database of the observed runtimes of SED tasks
+
+    Args:
+        filename (:obj:`str`): path to the database
+        runtimes (:obj:`dict`): dictionary that maps the hash of the models of tasks to dictionaries which map the KiSAO
+            ids of the algorithms of tasks to the total cost (``cost``) and duration in seconds (``duration``) of the
+            tasks with the models and algorithms which were observed
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(filename + '.tmp', 'w') as file:
+        json.dump({'version': RUNTIME_DB_VERSION, 'runtimes': runtimes}, file, indent=2, sort_keys=True)
+    os.replace(filename + '.tmp', filename)
@@ -0,0 +1,489 @@
+""" Caches of compiled models, algorithm substitutions, solver configurations, validation results and task results
+which are shared by the tasks, SED documents and COMBINE/OMEX archives that a process executes
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from .config import Config as SimulatorConfig
+from .data_model import KISAO_ALGORITHM_MAP, KISAO_ALGORITHM_SCHEMAS, SolverConfiguration
+from biosimulators_utils.config import get_config
+from biosimulators_utils.sedml import validation
+from biosimulators_utils.sedml.data_model import ModelLanguage, SteadyStateSimulation, UniformTimeCourseSimulation
+from biosimulators_utils.warnings import warn, BioSimulatorsWarning
+from kisao.data_model import AlgorithmSubstitutionPolicy, ALGORITHM_SUBSTITUTION_POLICY_LEVELS
+from kisao.utils import get_preferred_substitute_algorithm_by_ids
+import biosimulators_utils
+import collections
+import copy
+import glob
+import hashlib
+import json
+import libsbml
+import numpy
+import os
+import tempfile
+import roadrunner
+import warnings
+
+
+__all__ = [
+    'load_road_runner',
+    'clear_caches',
+]
+
+# :obj:`collections.OrderedDict`: serialized states of freshly compiled RoadRunner instances, keyed by the hash of their
+# SBML source, in least- to most-recently used order. This is shared by all of the tasks, SED documents and COMBINE/OMEX
+# archives that are executed by the same process.
+_ROAD_RUNNER_STATE_CACHE = collections.OrderedDict()
+
+# :obj:`dict`: resolved algorithm substitutions, keyed by tuples of the KiSAO id of a requested algorithm and an algorithm
+# substitution policy. Each value is a tuple of the KiSAO id of the algorithm to execute, the warnings raised by the
+# resolution, and the exception raised by the resolution (or :obj:`None`). Resolutions are memoized on first use.
+_ALGORITHM_SUBSTITUTION_CACHE = {}
+
+# :obj:`dict`: compiled solver configurations, keyed by the KiSAO id of the algorithm to execute, the requested algorithm and
+# its parameter changes, the algorithm substitution policy and whether SED-ML is validated. Each value is a tuple of the
+# configuration (:obj:`SolverConfiguration`), the warnings raised by the compilation and the exception raised by the
+# compilation (or :obj:`None`).
+_SOLVER_CONFIGURATION_CACHE = {}
+
+# :obj:`collections.OrderedDict`: least-recently-used cache of the Python code objects which tellurium generates for SED
+# documents. Keys are tuples of the SHA-256 hash of the SED-ML file, the SHA-256 hashes of its models and data description
+# files and the plot format.
+_TELLURIUM_CODE_CACHE = collections.OrderedDict()
+
+# :obj:`collections.OrderedDict`: least-recently-used cache of the results of tasks, keyed by the SHA-256 hashes computed
+# by :obj:`get_result_cache_key`. Optionally backed by ``.npy`` files in :obj:`SimulatorConfig.result_cache_dir`.
+_RESULT_CACHE = collections.OrderedDict()
+
+# :obj:`dict`: numbers of the ``.npy`` files in the directories of the result cache (see :obj:`cache_results`), which are
+# counted on the first write to each directory and recounted when files are evicted
+_RESULT_CACHE_DIR_SIZES = {}
+
+# :obj:`collections.OrderedDict`: least-recently-used cache of the errors and warnings of the validation of SED-ML elements
+# and models, keyed by the SHA-256 hashes of the validated elements and the contents of the model files. Optionally backed
+# by JSON files in :obj:`SimulatorConfig.validation_cache_dir`.
+_VALIDATION_CACHE = collections.OrderedDict()
+
+
+def load_road_runner(filename, simulator_config=None):
+    """ Compile an SBML model into a RoadRunner instance, with its local parameters promoted to global parameters
+
+    Compiled models are cached (up to ``simulator_config.model_cache_size`` models) so that the same model can be
+    loaded repeatedly without recompiling it.
+
+    Args:
+        filename (:obj:`str`): path to an SBML file
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`roadrunner.RoadRunner`: RoadRunner instance in its initial state
+    """
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    if not simulator_config.model_cache_size:
+        road_runner = roadrunner.RoadRunner()
+        return roadrunner.RoadRunner(road_runner.getParamPromotedSBML(filename))
+
+    with open(filename, 'rb') as file:
+        key = hashlib.sha256(file.read()).hexdigest()
+
+    state = _ROAD_RUNNER_STATE_CACHE.get(key, None)
+    if state is None:
+        road_runner = roadrunner.RoadRunner()
+        road_runner = roadrunner.RoadRunner(road_runner.getParamPromotedSBML(filename))
+        _ROAD_RUNNER_STATE_CACHE[key] = road_runner.saveStateS()
+        while len(_ROAD_RUNNER_STATE_CACHE) > simulator_config.model_cache_size:
+            _ROAD_RUNNER_STATE_CACHE.popitem(last=False)
+
+    else:
+        _ROAD_RUNNER_STATE_CACHE.move_to_end(key)
+        road_runner = roadrunner.RoadRunner()
+        road_runner.loadStateS(state)
+
+    return road_runner
+
+
+def get_cached_results(key, simulator_config):
+    """ Get the cached results of a task
+
+    Args:
+        key (:obj:`str`): key for the results (see :obj:`get_result_cache_key`)
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`numpy.ndarray`: results, or :obj:`None` if the results haven't been cached
+    """
+    results = _RESULT_CACHE.get(key, None)
+    if results is not None:
+        _RESULT_CACHE.move_to_end(key)
+
+    elif simulator_config.result_cache_dir:
+        filename = os.path.join(simulator_config.result_cache_dir, key + '.npy')
+        try:
+            results = numpy.load(filename, allow_pickle=False)
+            os.utime(filename)
+        except (OSError, ValueError):
+            return None
+        _cache_results_in_memory(key, results, simulator_config)
+
+    else:
+        return None
+
+    return results.copy()
+
+
+def cache_results(key, results, simulator_config):
+    """ Cache the results of a task in memory and, optionally, on disk (``simulator_config.result_cache_dir``). The least
+    recently used results are evicted when the cache holds more than ``simulator_config.result_cache_size`` results. Files
+    are evicted in batches, down to three quarters of the size of the cache, so that the directory is only listed when
+    its number of files crosses the size of the cache.
+
+    Args:
+        key (:obj:`str`): key for the results (see :obj:`get_result_cache_key`)
+        results (:obj:`numpy.ndarray`): results
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+    """
+    results = numpy.array(results)
+    _cache_results_in_memory(key, results, simulator_config)
+
+    if simulator_config.result_cache_dir:
+        dirname = simulator_config.result_cache_dir
+        os.makedirs(dirname, exist_ok=True)
+        if dirname not in _RESULT_CACHE_DIR_SIZES:
+            _RESULT_CACHE_DIR_SIZES[dirname] = len(glob.glob(os.path.join(dirname, '*.npy')))
+
+        filename = os.path.join(dirname, key + '.npy')
+        if not os.path.isfile(filename):
+            _RESULT_CACHE_DIR_SIZES[dirname] += 1
+        file, temp_filename = tempfile.mkstemp(dir=dirname, suffix='.npy.tmp')
+        with os.fdopen(file, 'wb') as file:
+            numpy.save(file, results, allow_pickle=False)
+        os.replace(temp_filename, filename)
+
+        if _RESULT_CACHE_DIR_SIZES[dirname] > simulator_config.result_cache_size:
+            filenames = sorted(glob.glob(os.path.join(dirname, '*.npy')), key=os.path.getmtime)
+            num_kept = simulator_config.result_cache_size - simulator_config.result_cache_size // 4
+            for filename in filenames[:max(0, len(filenames) - num_kept)]:
+                try:
+                    os.remove(filename)
+                except FileNotFoundError:  # pragma: no cover # evicted by another process
+                    pass
+            _RESULT_CACHE_DIR_SIZES[dirname] = min(len(filenames), num_kept)
+
+
+def _cache_results_in_memory(key, results, simulator_config):
+    _RESULT_CACHE[key] = results
+    _RESULT_CACHE.move_to_end(key)
+    while len(_RESULT_CACHE) > simulator_config.result_cache_size:
+        _RESULT_CACHE.popitem(last=False)
+
+
+def get_validation_results(key, validate, simulator_config):
+    """ Get the memoized errors and warnings of a validation, either from memory, from
+    ``simulator_config.validation_cache_dir`` or by executing the validation. The least recently used validations are
+    evicted from memory when more than ``simulator_config.validation_cache_size`` validations are kept.
+
+    Args:
+        key (:obj:`str`): key for the validation (a hash of its inputs)
+        validate (:obj:`types.FunctionType`): function which executes the validation and returns a :obj:`list` of
+            :obj:`tuple` of nested :obj:`list` of errors and nested :obj:`list` of warnings
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: errors and warnings of each check of the validation
+    """
+    results = _VALIDATION_CACHE.get(key, None)
+
+    if results is None and simulator_config.validation_cache_dir:
+        filename = os.path.join(simulator_config.validation_cache_dir, key + '.json')
+        try:
+            with open(filename, 'r') as file:
+                results = [tuple(result) for result in json.load(file)]
+        except (OSError, ValueError):
+            results = None
+
+    if results is None:
+        results = [tuple(result) for result in validate()]
+
+        if simulator_config.validation_cache_dir:
+            os.makedirs(simulator_config.validation_cache_dir, exist_ok=True)
+            file, temp_filename = tempfile.mkstemp(dir=simulator_config.validation_cache_dir, suffix='.json.tmp')
+            with os.fdopen(file, 'w') as file:
+                json.dump(results, file)
+            os.replace(temp_filename, os.path.join(simulator_config.validation_cache_dir, key + '.json'))
+
+    if simulator_config.validation_cache_size:
+        _VALIDATION_CACHE[key] = results
+        _VALIDATION_CACHE.move_to_end(key)
+        while len(_VALIDATION_CACHE) > simulator_config.validation_cache_size:
+            _VALIDATION_CACHE.popitem(last=False)
+    return copy.deepcopy(results)
+
+
+def validate_sed_task_elements(task, variables, simulator_config):
+    """ Validate a (sub-)task, its model and simulation and the variables that should be recorded from it. The errors and
+    warnings of each check are memoized by the contents of the SED-ML elements (see :obj:`get_validation_results`).
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: errors and warnings of each check, up to and including the first check which found
+        errors
+    """
+    model = task.model
+    sim = task.simulation
+    # the key includes the id of the task, which the errors and warnings mention
+    key = (
+        task.__class__.__name__,
+        task.id,
+        model.__class__.__name__,
+        model.to_tuple() if model else None,
+        sim.__class__.__name__,
+        sim.to_tuple() if sim else None,
+        tuple(variable.to_tuple() for variable in variables),
+        biosimulators_utils.__version__,
+    )
+    key = hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def validate():
+        checks = [
+            lambda: (validation.validate_task(task), []),
+            lambda: (validation.validate_model_language(model.language, ModelLanguage.SBML), []),
+            lambda: validation.validate_model_changes(model),
+            lambda: (validation.validate_simulation_type(sim, (SteadyStateSimulation, UniformTimeCourseSimulation)), []),
+            lambda: validation.validate_simulation(sim),
+            lambda: validation.validate_data_generator_variables(variables),
+        ]
+        results = []
+        for check in checks:
+            errors, warns = check()
+            results.append((errors, warns))
+            if errors:
+                break
+        return results
+
+    return get_validation_results(key, validate, simulator_config)
+
+
+def validate_model_with_cache(model, simulator_config):
+    """ Validate a model, including its SBML source, with :obj:`validation.validate_model`. The errors and warnings are
+    memoized by the contents of the model file, the language and id of the model and its changes (see
+    :obj:`get_validation_results`), so that the consistency of each model file is only checked once.
+
+    Args:
+        model (:obj:`Model`): model
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * nested :obj:`list` of :obj:`str`: nested list of errors
+            * nested :obj:`list` of :obj:`str`: nested list of warnings
+    """
+    try:
+        with open(model.source, 'rb') as file:
+            model_hash = hashlib.sha256(file.read()).hexdigest()
+    except (OSError, TypeError):
+        return validation.validate_model(model, [], working_dir='.')
+
+    # the key excludes the path of the model file, which the errors and warnings mention, so that the validation can be
+    # reused by copies of the file (e.g., the files extracted from each execution of a COMBINE/OMEX archive)
+    key = (
+        model_hash,
+        model.id,
+        model.language,
+        tuple(change.to_tuple() for change in model.changes),
+        biosimulators_utils.__version__,
+        libsbml.getLibSBMLDottedVersion(),
+    )
+    key = hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def validate():
+        errors, warns = validation.validate_model(model, [], working_dir='.')
+        return [(errors, warns, model.source)]
+
+    (errors, warns, source), = get_validation_results(key, validate, simulator_config)
+    if source != model.source:
+        errors = _replace_in_messages(errors, source, model.source)
+        warns = _replace_in_messages(warns, source, model.source)
+    return (errors, warns)
+
+
+def _replace_in_messages(messages, old, new):
+    if isinstance(messages, str):
+        return messages.replace(old, new)
+    return [_replace_in_messages(message, old, new) for message in messages]
+
+
+def clear_caches():
+    """ Clear the compiled models and other state that is cached across tasks and archives """
+    _ROAD_RUNNER_STATE_CACHE.clear()
+    _TELLURIUM_CODE_CACHE.clear()
+    _RESULT_CACHE.clear()
+    _RESULT_CACHE_DIR_SIZES.clear()
+    _VALIDATION_CACHE.clear()
+
+
+def _get_memoized(cache, key, func, *args, **kwargs):
+    """ Get the memoized result of a function, re-raising the warnings and exceptions that the function raised
+
+    Args:
+        cache (:obj:`dict`): cache which maps keys to tuples of results, warnings and exceptions
+        key (:obj:`object`): key for the result
+        func (:obj:`types.FunctionType`): function
+        *args (:obj:`list`): positional arguments to :obj:`func`
+        **kwargs (:obj:`dict`): keyword arguments to :obj:`func`
+
+    Returns:
+        :obj:`object`: result of the function
+    """
+    if key not in cache:
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            try:
+                result = func(*args, **kwargs)
+                exception = None
+            except Exception as caught_exception:
+                result = None
+                exception = caught_exception
+        cache[key] = (
+            result,
+            [(str(caught_warning.message), caught_warning.category) for caught_warning in caught_warnings],
+            exception,
+        )
+
+    result, caught_warnings, exception = cache[key]
+    for message, category in caught_warnings:
+        warnings.warn(message, category, stacklevel=3)
+    if exception is not None:
+        raise exception.__class__(*exception.args)
+    return result
+
+
+def get_algorithm_substitution(kisao_id, substitution_policy):
+    """ Get the algorithm that tellurium should execute for a requested algorithm
+
+    Algorithms which tellurium implements are executed themselves at every policy, without querying KiSAO. The
+    resolutions of other algorithms are memoized. The warnings (e.g., :obj:`AlgorithmSubstitutedWarning`) and exceptions
+    (e.g., :obj:`AlgorithmCannotBeSubstitutedException`) of each resolution are raised again each time the resolution is
+    used.
+
+    Args:
+        kisao_id (:obj:`str`): KiSAO id of the requested algorithm
+        substitution_policy (:obj:`AlgorithmSubstitutionPolicy`): algorithm substitution policy
+
+    Returns:
+        :obj:`str`: KiSAO id of the algorithm to execute
+    """
+    if kisao_id in KISAO_ALGORITHM_MAP:
+        return kisao_id
+
+    return _get_memoized(_ALGORITHM_SUBSTITUTION_CACHE, (kisao_id, substitution_policy),
+                         get_preferred_substitute_algorithm_by_ids,
+                         kisao_id, KISAO_ALGORITHM_MAP.keys(), substitution_policy=substitution_policy)
+
+
+def get_solver_configuration(algorithm, exec_alg_kisao_id, substitution_policy, config=None):
+    """ Get the configuration of the solver for an algorithm and its parameter changes
+
+    Configurations are memoized, so that identical algorithms are only parsed and validated once. The warnings and
+    exceptions of each compilation are raised again each time the configuration is used.
+
+    Args:
+        algorithm (:obj:`Algorithm`): requested algorithm and its parameter changes
+        exec_alg_kisao_id (:obj:`str`): KiSAO id of the algorithm that will be executed
+        substitution_policy (:obj:`AlgorithmSubstitutionPolicy`): algorithm substitution policy
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`SolverConfiguration`: configuration of the solver
+
+    Raises:
+        :obj:`ValueError`: if a value is invalid and the algorithm is not being substituted
+        :obj:`NotImplementedError`: if a parameter is not supported and the algorithm is not being substituted
+    """
+    if not config:
+        config = get_config()
+
+    key = (
+        exec_alg_kisao_id,
+        algorithm.kisao_id,
+        tuple((change.kisao_id, change.new_value) for change in algorithm.changes),
+        substitution_policy,
+        config.VALIDATE_SEDML,
+    )
+    return _get_memoized(_SOLVER_CONFIGURATION_CACHE, key,
+                         _compile_solver_configuration,
+                         algorithm, exec_alg_kisao_id, substitution_policy, config.VALIDATE_SEDML)
+
+
+def _compile_solver_configuration(algorithm, exec_alg_kisao_id, substitution_policy, validate):
+    """ Parse and validate an algorithm and its parameter changes into the configuration of a solver
+
+    Args:
+        algorithm (:obj:`Algorithm`): requested algorithm and its parameter changes
+        exec_alg_kisao_id (:obj:`str`): KiSAO id of the algorithm that will be executed
+        substitution_policy (:obj:`AlgorithmSubstitutionPolicy`): algorithm substitution policy
+        validate (:obj:`bool`): whether to validate the parameter changes
+
+    Returns:
+        :obj:`SolverConfiguration`: configuration of the solver
+    """
+    alg_schema = KISAO_ALGORITHM_SCHEMAS[exec_alg_kisao_id]
+    strict = (
+        exec_alg_kisao_id == algorithm.kisao_id and
+        ALGORITHM_SUBSTITUTION_POLICY_LEVELS[substitution_policy]
+        <= ALGORITHM_SUBSTITUTION_POLICY_LEVELS[AlgorithmSubstitutionPolicy.NONE]
+    )
+
+    solver_id = alg_schema.id
+    parameter_values = []
+    for change in algorithm.changes:
+        param_schema = alg_schema.parameters.get(change.kisao_id, None)
+        if not validate or param_schema:
+            if not validate or param_schema.is_valid(change.new_value):
+                if param_schema.solver_ids is not None:
+                    solver_id = param_schema.solver_ids[param_schema.parse(change.new_value)]
+                else:
+                    parameter_values.append((param_schema.roadrunner_attribute, param_schema.parse(change.new_value)))
+
+            else:
+                if strict:
+                    msg = "'{}' is not a valid {} value for parameter {}".format(
+                        change.new_value, param_schema.type.name, change.kisao_id)
+                    raise ValueError(msg)
+                else:
+                    msg = "'{}' was ignored because it is not a valid {} value for parameter {}".format(
+                        change.new_value, param_schema.type.name, change.kisao_id)
+                    warn(msg, BioSimulatorsWarning)
+
+        else:
+            if strict:
+                msg = "".join([
+                    "Algorithm parameter with KiSAO id '{}' is not supported. ".format(change.kisao_id),
+                    "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
+                        '{}: {} ({})'.format(kisao_id, param_schema.id, param_schema.name)
+                        for kisao_id, param_schema in alg_schema.parameters.items())),
+                ])
+                raise NotImplementedError(msg)
+            else:
+                msg = "".join([
+                    "Algorithm parameter with KiSAO id '{}' was ignored because it is not supported. ".format(change.kisao_id),
+                    "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
+                        '{}: {} ({})'.format(kisao_id, param_schema.id, param_schema.name)
+                        for kisao_id, param_schema in alg_schema.parameters.items())),
+                ])
+                warn(msg, BioSimulatorsWarning)
+
+    return SolverConfiguration(
+        algorithm_kisao_id=exec_alg_kisao_id,
+        solver_id=solver_id,
+        steady_state=alg_schema.steady_state,
+        parameter_values=tuple(parameter_values),
+    )
@@ -0,0 +1,679 @@
+""" Methods for incrementally re-executing COMBINE/OMEX archives and for checkpointing the progress of their execution
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from ._version import __version__
+from .config import Config as SimulatorConfig
+from .data_model import SedmlInterpreter
+from .utils import get_data_generators_for_outputs, get_tasks_for_data_generators, write_sed_doc_to_string
+from biosimulators_utils.config import get_config
+from biosimulators_utils.log.data_model import Status, StandardOutputErrorCapturerLevel
+from biosimulators_utils.log.utils import init_sed_document_log
+from biosimulators_utils.viz.data_model import VizFormat
+from biosimulators_utils.report.data_model import ReportResults, ReportFormat, VariableResults
+from biosimulators_utils.sedml.data_model import Task, RepeatedTask, Report, Plot2D, Plot3D
+from biosimulators_utils.sedml.io import SedmlSimulationReader
+from biosimulators_utils.sedml.utils import resolve_range
+from biosimulators_utils.simulator.utils import get_algorithm_substitution_policy
+import copy
+import h5py
+import hashlib
+import json
+import numpy
+import os
+import tellurium
+import tempfile
+import roadrunner
+import zipfile
+
+
+__all__ = [
+    'exec_sed_doc_incrementally',
+    'read_incremental_manifest',
+    'write_incremental_manifest',
+]
+
+# :obj:`str`: name of the file in the output directory of an archive where the fingerprints of its outputs are saved for
+# incremental re-execution
+INCREMENTAL_MANIFEST_FILENAME = 'incremental-manifest.json'
+
+# :obj:`int`: version of the format of :obj:`INCREMENTAL_MANIFEST_FILENAME`
+INCREMENTAL_MANIFEST_VERSION = 1
+
+# :obj:`str`: name of the directory in the output directory of an archive where the progress of the execution of its tasks
+# is recorded in checkpoint mode
+CHECKPOINT_DIRNAME = '.checkpoint'
+
+# :obj:`int`: version of the format of the checkpoints in :obj:`CHECKPOINT_DIRNAME`
+CHECKPOINT_VERSION = 1
+
+
+def read_incremental_manifest(out_dir):
+    """ Read the fingerprints of the outputs of the previous execution of an archive from its output directory
+
+    Args:
+        out_dir (:obj:`str`): path to the outputs of the archive
+
+    Returns:
+        :obj:`dict`: dictionary that maps the path of each output (``{ relative-path-to-SED-ML-file }/{ output.id }``)
+            to its fingerprint (see :obj:`get_output_fingerprints`)
+    """
+    filename = os.path.join(out_dir, INCREMENTAL_MANIFEST_FILENAME)
+    if not os.path.isfile(filename):
+        return {}
+
+    try:
+        with open(filename, 'r') as file:
+            manifest = json.load(file)
+    except ValueError:
+        return {}
+
+    if not isinstance(manifest, dict) or manifest.get('version', None) != INCREMENTAL_MANIFEST_VERSION:
+        return {}
+    return manifest['outputs']
+
+
+def write_incremental_manifest(out_dir, outputs):
+    """ Save the fingerprints of the outputs of an archive to its output directory
+
+    Args:
+        out_dir (:obj:`str`): path to the outputs of the archive
+        outputs (:obj:`dict`): dictionary that maps the path of each output (``{ relative-path-to-SED-ML-file }/{ output.id }``)
+            to its fingerprint (see :obj:`get_output_fingerprints`)
+    """
+    filename = os.path.join(out_dir, INCREMENTAL_MANIFEST_FILENAME)
+    with open(filename + '.tmp', 'w') as file:
+        json.dump({'version': INCREMENTAL_MANIFEST_VERSION, 'outputs': outputs}, file, indent=2, sort_keys=True)
+    os.replace(filename + '.tmp', filename)
+
+
+def exec_sed_doc_incrementally(sed_doc_executer, manifest, doc, working_dir, base_out_path, rel_out_path=None,
+                               apply_xml_model_changes=False,
+                               log=None, indent=0, pretty_print_modified_xml_models=False,
+                               log_level=StandardOutputErrorCapturerLevel.c, config=None, simulator_config=None):
+    """ Execute the outputs of a SED document whose fingerprints have changed since the previous execution of the
+    document, and reuse the files of the previous execution for the other outputs. Only the tasks needed for the
+    changed outputs are executed. Outputs are also re-executed if their files are no longer available.
+
+    Args:
+        sed_doc_executer (:obj:`types.FunctionType`): function which executes a SED document (e.g., :obj:`exec_sed_doc`)
+        manifest (:obj:`dict`): dictionary that maps the path of each output of the previous execution
+            (``{ rel_out_path }/{ output.id }``) to its fingerprint. Updated with the fingerprints of the outputs which
+            succeed and cleared of the outputs which fail. In checkpoint mode, the manifest is also saved to
+            :obj:`base_out_path` after the document is executed.
+        doc (:obj:`SedDocument` or :obj:`str`): SED document or a path to SED-ML file which defines a SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        base_out_path (:obj:`str`): path to store the outputs
+        rel_out_path (:obj:`str`, optional): path relative to :obj:`base_out_path` to store the outputs
+        apply_xml_model_changes (:obj:`bool`, optional): if :obj:`True`, apply any model changes specified in the SED-ML file before
+            calling :obj:`task_executer`.
+        log (:obj:`SedDocumentLog`, optional): log of the document
+        indent (:obj:`int`, optional): degree to indent status messages
+        pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
+        log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which to log output
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`ReportResults`: results of each executed report
+            * :obj:`SedDocumentLog`: log of the document
+    """
+    if not config:
+        config = get_config()
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    exec_kwargs = {
+        'apply_xml_model_changes': apply_xml_model_changes,
+        'indent': indent,
+        'pretty_print_modified_xml_models': pretty_print_modified_xml_models,
+        'log_level': log_level,
+        'config': config,
+    }
+
+    if isinstance(doc, str):
+        try:
+            doc = SedmlSimulationReader().run(doc, config=config)
+        except Exception:
+            # report the errors in the document through the executer
+            return sed_doc_executer(doc, working_dir, base_out_path, rel_out_path, log=log, **exec_kwargs)
+
+    if config.LOG and not log:
+        log = init_sed_document_log(doc)
+
+    fingerprints = get_output_fingerprints(doc, working_dir, config=config, simulator_config=simulator_config)
+    output_paths = {output.id: '/'.join(filter(None, [rel_out_path, output.id])) for output in doc.outputs}
+
+    exec_doc = copy.copy(doc)
+    exec_doc.outputs = []
+    for output in doc.outputs:
+        if (
+            manifest.get(output_paths[output.id], None) == fingerprints[output.id]
+            and restore_output_files(output, base_out_path, rel_out_path, config=config, simulator_config=simulator_config)
+        ):
+            if config.LOG:
+                log.outputs[output.id].status = Status.SKIPPED
+        else:
+            exec_doc.outputs.append(output)
+    exec_doc.data_generators = get_data_generators_for_outputs(exec_doc)
+    exec_doc.tasks = get_tasks_for_data_generators(exec_doc)
+
+    if config.LOG and log.tasks:
+        exec_task_ids = set(task.id for task in exec_doc.tasks)
+        for task_id, task_log in log.tasks.items():
+            if task_id not in exec_task_ids:
+                task_log.status = Status.SKIPPED
+
+    if not exec_doc.outputs:
+        return (ReportResults() if config.COLLECT_SED_DOCUMENT_RESULTS else None), log
+
+    exception = None
+    try:
+        results, _ = sed_doc_executer(exec_doc, working_dir, base_out_path, rel_out_path, log=log, **exec_kwargs)
+    except Exception as caught_exception:
+        exception = caught_exception
+
+    for output in exec_doc.outputs:
+        if (log.outputs[output.id].status == Status.SUCCEEDED) if config.LOG else exception is None:
+            manifest[output_paths[output.id]] = fingerprints[output.id]
+        else:
+            manifest.pop(output_paths[output.id], None)
+
+    if simulator_config.checkpoint and os.path.isdir(base_out_path):
+        # record the completed outputs before the next document is executed
+        write_incremental_manifest(base_out_path, manifest)
+
+    if exception is not None:
+        raise exception
+    return results, log
+
+
+def get_output_fingerprints(doc, working_dir, config=None, simulator_config=None):
+    """ Get fingerprints of the outputs of a SED document. The fingerprint of each output is a hash of the parts of the
+    document that the output depends on (its data generators, tasks, simulations and models), the contents of the files
+    of its models, and the versions of the software which executes it.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each output to its fingerprint
+    """
+    fingerprint = _get_sub_doc_fingerprinter(doc, working_dir, config=config, simulator_config=simulator_config)
+
+    fingerprints = {}
+    for output in doc.outputs:
+        output_doc = copy.copy(doc)
+        output_doc.outputs = [output]
+        output_doc.data_generators = get_data_generators_for_outputs(output_doc)
+        output_doc.tasks = get_tasks_for_data_generators(output_doc)
+        fingerprints[output.id] = fingerprint(output_doc)
+
+    return fingerprints
+
+
+def get_task_fingerprints(doc, working_dir, config=None, simulator_config=None):
+    """ Get fingerprints of the tasks of a SED document. The fingerprint of each task is a hash of the parts of the
+    document that the task depends on (its sub-tasks, simulations and models), the contents of the files of its models,
+    and the versions of the software which executes it.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each task to its fingerprint
+    """
+    fingerprint = _get_sub_doc_fingerprinter(doc, working_dir, config=config, simulator_config=simulator_config)
+
+    fingerprints = {}
+    for task in doc.tasks:
+        task_ids = set()
+        sub_tasks = [task]
+        while sub_tasks:
+            sub_task = sub_tasks.pop()
+            if sub_task.id not in task_ids:
+                task_ids.add(sub_task.id)
+                if isinstance(sub_task, RepeatedTask):
+                    sub_tasks.extend(sub_task_sub_task.task for sub_task_sub_task in sub_task.sub_tasks)
+
+        task_doc = copy.copy(doc)
+        task_doc.outputs = []
+        task_doc.data_generators = []
+        task_doc.tasks = [doc_task for doc_task in doc.tasks if doc_task.id in task_ids]
+        fingerprints[task.id] = fingerprint(task_doc)
+
+    return fingerprints
+
+
+def _get_sub_doc_fingerprinter(doc, working_dir, config=None, simulator_config=None):
+    """ Get a function which computes the fingerprints of parts of a SED document (copies of the document with a subset of
+    its outputs, data generators and tasks). The models and simulations of each part are limited to those which its tasks
+    depend on.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`types.FunctionType`: function which computes the fingerprint of a part of the document
+    """
+    if not config:
+        config = get_config()
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    environment = (
+        __version__,
+        tellurium.__version__,
+        roadrunner.__version__,
+        simulator_config.sedml_interpreter.name,
+        get_algorithm_substitution_policy(config=config),
+    )
+
+    model_hashes = {}
+    for model in doc.models:
+        filename = os.path.join(working_dir, model.source)
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as file:
+                model_hashes[model.id] = hashlib.sha256(file.read()).hexdigest()
+        else:
+            model_hashes[model.id] = None
+
+    def fingerprint(sub_doc):
+        model_ids = get_model_ids_for_tasks(doc, sub_doc.tasks)
+        sub_doc.models = [model for model in doc.models if model.id in model_ids]
+        simulation_ids = set(task.simulation.id for task in sub_doc.tasks if isinstance(task, Task))
+        sub_doc.simulations = [sim for sim in doc.simulations if sim.id in simulation_ids]
+
+        key = (
+            environment,
+            write_sed_doc_to_string(sub_doc),
+            tuple(model_hashes[model.id] for model in sub_doc.models),
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    return fingerprint
+
+
+def get_model_ids_for_tasks(doc, tasks):
+    """ Get the ids of the models of a SED document which tasks depend on, including the models which the models and changes
+    of the tasks reference
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        tasks (:obj:`list` of :obj:`AbstractTask`): tasks
+
+    Returns:
+        :obj:`set` of :obj:`str`: ids of models
+    """
+    models = {model.id: model for model in doc.models}
+    model_ids = set()
+
+    def add_model(model):
+        if model is None or model.id in model_ids:
+            return
+        model_ids.add(model.id)
+        if model.source.startswith('#'):
+            add_model(models.get(model.source[1:], None))
+        for change in model.changes:
+            for variable in getattr(change, 'variables', []):
+                add_model(variable.model)
+
+    for task in tasks:
+        if isinstance(task, Task):
+            add_model(task.model)
+        elif isinstance(task, RepeatedTask):
+            for change in task.changes:
+                add_model(change.model)
+                for variable in change.variables:
+                    add_model(variable.model)
+
+    return model_ids
+
+
+def restore_output_files(output, out_dir, rel_out_path=None, config=None, simulator_config=None):
+    """ Determine whether the files of an output from a previous execution are available, restoring individual files from
+    the bundles of the previous execution (e.g., ``reports.zip``) if necessary
+
+    Args:
+        output (:obj:`Output`): output
+        out_dir (:obj:`str`): path to the outputs of the archive
+        rel_out_path (:obj:`str`, optional): path of the outputs of the SED document relative to :obj:`out_dir`
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`bool`: whether all of the files of the output are available
+    """
+    if not config:
+        config = get_config()
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    if simulator_config.sedml_interpreter == SedmlInterpreter.tellurium:
+        save_plot_data = simulator_config.save_plot_data
+    else:
+        save_plot_data = config.SAVE_PLOT_DATA
+
+    rel_path = '/'.join(filter(None, [rel_out_path, output.id]))
+    bundled_paths = []
+
+    if isinstance(output, Report) or save_plot_data:
+        for report_format in config.REPORT_FORMATS:
+            report_format = ReportFormat(report_format)
+            if report_format == ReportFormat.h5:
+                h5_filename = os.path.join(out_dir, config.H5_REPORTS_PATH)
+                if not os.path.isfile(h5_filename):
+                    return False
+                with h5py.File(h5_filename, 'r') as file:
+                    if rel_path not in file:
+                        return False
+            elif report_format in [ReportFormat.csv, ReportFormat.tsv]:
+                bundled_paths.append((rel_path + '.' + report_format.value, config.REPORTS_PATH))
+            else:
+                return False
+
+    if isinstance(output, (Plot2D, Plot3D)):
+        for viz_format in config.VIZ_FORMATS:
+            bundled_paths.append((rel_path + '.' + VizFormat(viz_format).value, config.PLOTS_PATH))
+
+    for path, bundle_path in bundled_paths:
+        if os.path.isfile(os.path.join(out_dir, path)):
+            continue
+        bundle_filename = os.path.join(out_dir, bundle_path)
+        if not os.path.isfile(bundle_filename):
+            return False
+        with zipfile.ZipFile(bundle_filename, 'r') as bundle:
+            if path not in bundle.namelist():
+                return False
+            bundle.extract(path, out_dir)
+
+    return True
+
+
+def get_num_task_executions(task):
+    """ Get the number of times which the biosimulators SED-ML interpreter executes :obj:`exec_sed_task` to execute a task,
+    including the executions of the sub-tasks of each iteration of repeated tasks
+
+    Args:
+        task (:obj:`AbstractTask`): task
+
+    Returns:
+        :obj:`int`: number of executions, or :obj:`None` if it can't be determined before the task is executed (e.g.,
+        because it depends on functional ranges of variables of models)
+    """
+    if isinstance(task, Task):
+        return 1
+
+    try:
+        num_iterations = len(resolve_range(task.range))
+    except Exception:
+        return None
+
+    num_sub_task_executions = [get_num_task_executions(sub_task.task) for sub_task in task.sub_tasks]
+    if None in num_sub_task_executions:
+        return None
+    return num_iterations * sum(num_sub_task_executions)
+
+
+class _TaskCheckpoint(object):
+    """ Durable record of the executions of :obj:`exec_sed_task` for a task (one execution for a task, and one execution
+    for each sub-task of each iteration of a repeated task) in a directory. The directory contains
+
+    * ``results-{ i }.npz``: the results and log of the ``i``-th execution
+    * ``state-{ sub-task id }-{ i }``: the state (``saveStateS``) of the RoadRunner instance of a sub-task of a repeated
+      task after its last recorded execution (the ``i``-th execution)
+    * ``checkpoint.json``: the number of recorded executions and the names of the files of the states, which is saved
+      after the files of each execution
+
+    Attributes:
+        dirname (:obj:`str`): path to the directory of the checkpoint
+        repeated (:obj:`bool`): whether the task is a repeated task, whose RoadRunner instances carry state from one
+            execution to the next
+        num_recorded_executions (:obj:`int`): number of executions which were recorded when the checkpoint was read
+        num_executions (:obj:`int`): number of executions which have been requested since the checkpoint was read
+        states (:obj:`dict`): dictionary that maps the ids of sub-tasks to the index of their last recorded execution
+            and the name of the file of their state after it
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task, or :obj:`None` if all of
+            the executions of the task have been recorded and the task doesn't need to be preprocessed
+    """
+
+    def __init__(self, dirname, repeated=False):
+        """
+        Args:
+            dirname (:obj:`str`): path to the directory of the checkpoint
+            repeated (:obj:`bool`, optional): whether the task is a repeated task
+        """
+        self.dirname = dirname
+        self.repeated = repeated
+        self.num_recorded_executions = 0
+        self.num_executions = 0
+        self.states = {}
+        self.preprocessed_task = None
+
+        try:
+            with open(os.path.join(dirname, 'checkpoint.json'), 'r') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(index, dict) and index.get('version', None) == CHECKPOINT_VERSION:
+            self.num_recorded_executions = index['numExecutions']
+            self.states = {sub_task_id: tuple(state) for sub_task_id, state in index['states'].items()}
+
+    def read_execution(self, i_execution):
+        """ Read the results and log of a recorded execution
+
+        Args:
+            i_execution (:obj:`int`): index of the execution
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`VariableResults`: results of the variables
+                * :obj:`dict`: algorithm and simulator details of the log of the execution
+        """
+        with numpy.load(os.path.join(self.dirname, 'results-{}.npz'.format(i_execution))) as file:
+            results = VariableResults((key[len('results/'):], file[key]) for key in file.files if key.startswith('results/'))
+            log = json.loads(str(file['log']))
+        return results, log
+
+    def write_execution(self, i_execution, results, log, sub_task_id=None, road_runner=None):
+        """ Record an execution, and, for a sub-task of a repeated task, the state of its RoadRunner instance after the
+        execution
+
+        Args:
+            i_execution (:obj:`int`): index of the execution
+            results (:obj:`VariableResults`): results of the variables
+            log (:obj:`TaskLog`): log of the execution
+            sub_task_id (:obj:`str`, optional): id of the sub-task of a repeated task
+            road_runner (:obj:`roadrunner.RoadRunner`, optional): RoadRunner instance of the sub-task
+        """
+        os.makedirs(self.dirname, exist_ok=True)
+
+        log = {
+            'algorithm': log.algorithm if log else None,
+            'simulatorDetails': log.simulator_details if log else None,
+        }
+        arrays = {'results/' + id: numpy.asarray(value) for id, value in results.items()}
+        arrays['log'] = numpy.array(json.dumps(log, default=str))
+        self._write(numpy.savez, 'results-{}.npz'.format(i_execution), **arrays)
+
+        superseded_state = None
+        if road_runner is not None:
+            superseded_state = self.states.get(sub_task_id, None)
+            state_filename = 'state-{}-{}'.format(sub_task_id, i_execution)
+            state = road_runner.saveStateS()
+            self._write(lambda file: file.write(state), state_filename)
+            self.states[sub_task_id] = (i_execution, state_filename)
+
+        index = {
+            'version': CHECKPOINT_VERSION,
+            'numExecutions': i_execution + 1,
+            'states': self.states,
+        }
+        self._write(lambda file: file.write(json.dumps(index).encode()), 'checkpoint.json')
+
+        if superseded_state is not None:
+            os.remove(os.path.join(self.dirname, superseded_state[1]))
+
+    def restore_states(self, preprocessed_task):
+        """ Restore the RoadRunner instances of the sub-tasks of a repeated task to their recorded states
+
+        Args:
+            preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        """
+        for sub_task_id, (_, state_filename) in sorted(self.states.items(), key=lambda item: item[1][0]):
+            with open(os.path.join(self.dirname, state_filename), 'rb') as file:
+                state = file.read()
+            road_runner = preprocessed_task.road_runners[sub_task_id]
+            road_runner.loadStateS(state)
+
+            # states also include the solvers and selections with which they were saved, whose variables may have been
+            # ordered differently
+            preprocessed_task.solver_configurations[sub_task_id].apply(road_runner)
+            road_runner.timeCourseSelections = preprocessed_task.selections[sub_task_id]
+            road_runner.steadyStateSelections = preprocessed_task.selections[sub_task_id]
+            preprocessed_task.active_task_ids[preprocessed_task.road_runners.slots[sub_task_id]] = sub_task_id
+            preprocessed_task.road_runners.mark_modified(sub_task_id)
+
+    def _write(self, write, filename, *args, **kwargs):
+        fid, temp_filename = tempfile.mkstemp(dir=self.dirname)
+        with os.fdopen(fid, 'wb') as file:
+            write(file, *args, **kwargs)
+        os.replace(temp_filename, os.path.join(self.dirname, filename))
+
+
+class _TaskCheckpointer(object):
+    """ Wrapper for the executers of the biosimulators SED-ML interpreter which durably records each execution of each task
+    (see :obj:`_TaskCheckpoint`) so that an interrupted execution of a SED document can be resumed. When the document is
+    executed again, the recorded executions of each task are replayed from their checkpoints rather than re-executed, and
+    the RoadRunner instances of partially executed repeated tasks are restored to their recorded states before their
+    remaining executions. Tasks whose executions have all been recorded are not preprocessed.
+
+    Checkpoints are keyed by the fingerprints of their tasks (see :obj:`get_task_fingerprints`) and the variables which
+    they record.
+    """
+
+    def __init__(self, dirname, task_fingerprints, task_executer, preprocessed_task_executer, set_value_executer,
+                 reset_executer):
+        """
+        Args:
+            dirname (:obj:`str`): path to the directory of the checkpoints
+            task_fingerprints (:obj:`dict`): dictionary that maps the id of each task to its fingerprint
+            task_executer (:obj:`types.FunctionType`): function which executes a task
+            preprocessed_task_executer (:obj:`types.FunctionType`): function which preprocesses a task
+            set_value_executer (:obj:`types.FunctionType`): function which sets a value of the model of a preprocessed task
+            reset_executer (:obj:`types.FunctionType`): function which resets the models of a preprocessed task
+        """
+        self.dirname = dirname
+        self._task_fingerprints = task_fingerprints
+        self._task_executer = task_executer
+        self._preprocessed_task_executer = preprocessed_task_executer
+        self._set_value_executer = set_value_executer
+        self._reset_executer = reset_executer
+        self._checkpoints = {}
+
+    def preprocess_task(self, task, variables, config=None):
+        """ Preprocess a task, unless all of its executions have been recorded
+
+        Args:
+            task (:obj:`AbstractTask`): task
+            variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+            config (:obj:`Config`, optional): BioSimulators common configuration
+
+        Returns:
+            :obj:`PreprocessedTask`: preprocessed information about the task, or the checkpoint of the task if all of its
+                executions have been recorded
+        """
+        key = (
+            self._task_fingerprints[task.id],
+            tuple(sorted((variable.id, variable.target or '', variable.symbol or '') for variable in variables)),
+        )
+        checkpoint = _TaskCheckpoint(os.path.join(self.dirname, hashlib.sha256(repr(key).encode()).hexdigest()),
+                                     repeated=isinstance(task, RepeatedTask))
+
+        num_executions = get_num_task_executions(task)
+        if num_executions is not None and checkpoint.num_recorded_executions >= num_executions:
+            return checkpoint
+
+        checkpoint.preprocessed_task = self._preprocessed_task_executer(task, variables, config=config)
+        self._checkpoints[id(checkpoint.preprocessed_task)] = checkpoint
+        return checkpoint.preprocessed_task
+
+    def exec_task(self, task, variables, preprocessed_task=None, log=None, config=None):
+        """ Execute a task and record its execution, or replay the recorded execution
+
+        Args:
+            task (:obj:`Task`): task
+            variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+            preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task
+            log (:obj:`TaskLog`, optional): log for the task
+            config (:obj:`Config`, optional): BioSimulators common configuration
+
+        Returns:
+            :obj:`tuple`:
+
+                :obj:`VariableResults`: results of variables
+                :obj:`TaskLog`: log
+        """
+        if isinstance(preprocessed_task, _TaskCheckpoint):
+            checkpoint = preprocessed_task
+        else:
+            checkpoint = self._checkpoints.get(id(preprocessed_task), None)
+        if checkpoint is None:
+            return self._task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+
+        i_execution = checkpoint.num_executions
+        checkpoint.num_executions += 1
+
+        if i_execution < checkpoint.num_recorded_executions:
+            results, recorded_log = checkpoint.read_execution(i_execution)
+            if checkpoint.preprocessed_task is not None and i_execution == checkpoint.num_recorded_executions - 1:
+                checkpoint.restore_states(checkpoint.preprocessed_task)
+            if log:
+                log.algorithm = recorded_log['algorithm']
+                log.simulator_details = dict(recorded_log['simulatorDetails'] or {}, restoredFromCheckpoint=True)
+            return VariableResults((variable.id, results[variable.id]) for variable in variables), log
+
+        results, log = self._task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+        if checkpoint.repeated:
+            checkpoint.write_execution(i_execution, results, log, sub_task_id=task.id,
+                                       road_runner=preprocessed_task.road_runners[task.id])
+        else:
+            checkpoint.write_execution(i_execution, results, log)
+        return results, log
+
+    def set_value(self, model, target, symbol, value, preprocessed_task):
+        """ Set a value of the model of a preprocessed task. Values of tasks whose executions have all been recorded are
+        ignored.
+
+        Args:
+            model (:obj:`Model`): model
+            target (:obj:`str`): target of the value
+            symbol (:obj:`str`): symbol of the value
+            value (:obj:`float`): value
+            preprocessed_task (:obj:`PreprocessedTask`): preprocessed information about the task
+        """
+        if not isinstance(preprocessed_task, _TaskCheckpoint):
+            self._set_value_executer(model, target, symbol, value, preprocessed_task)
+
+    def reset(self, preprocessed_task):
+        """ Reset the models of a preprocessed task. Tasks whose executions have all been recorded are ignored.
+
+        Args:
+            preprocessed_task (:obj:`PreprocessedTask`): preprocessed information about the task
+        """
+        if not isinstance(preprocessed_task, _TaskCheckpoint):
+            self._reset_executer(preprocessed_task)
@@ -6,7 +6,7 @@
 :License: MIT
 """
 
-from .data_model import SedmlInterpreter, PlottingEngine
+from .data_model import SedmlInterpreter, PlottingEngine, KISAO_ALGORITHM_SCHEMAS
 import os
 
 __all__ = ['Config']
@@ -18,6 +18,65 @@ class Config(object):
     Attributes:
         sedml_interpreter (:obj:`SedmlInterpreter`): SED-ML interpreter
         plotting_engine (:obj:`PlottingEngine`): plotting engine
+        save_plot_data (:obj:`bool`): whether the tellurium SED-ML interpreter should save the data for plots as reports.
+            If no visualization formats are requested and the data for plots is not saved, only the data needed for
+            reports is simulated.
+        scratch_dir (:obj:`str`): directory where the tellurium SED-ML interpreter should create temporary directories for
+            its outputs (:obj:`None` for the default temporary directory)
+        model_cache_size (:obj:`int`): maximum number of compiled models to keep in memory for reuse across tasks,
+            SED documents and COMBINE/OMEX archives (0 disables the cache)
+        code_cache_size (:obj:`int`): maximum number of SED documents whose Python code generated by tellurium is kept
+            in memory for reuse (0 disables the cache)
+        result_cache_size (:obj:`int`): maximum number of results of SED tasks to keep for reuse by identical tasks (0
+            disables the cache). Results are only reused for tasks whose models have not been changed or simulated by
+            previous tasks, and never for stochastic simulations without a fixed seed.
+        result_cache_dir (:obj:`str`): directory where results of SED tasks should also be stored for reuse across
+            processes (:obj:`None` to only keep results in memory)
+        validation_cache_size (:obj:`int`): maximum number of errors and warnings of the validation of SED-ML elements
+            and models to keep in memory for reuse (0 to only keep them in :obj:`validation_cache_dir`)
+        validation_cache_dir (:obj:`str`): directory where the errors and warnings of the validation of SED-ML elements
+            and models should also be stored for reuse across processes (:obj:`None` to only keep them in memory)
+        h5_compression (:obj:`str`): compression filter for the reports which the tellurium SED-ML interpreter saves in
+            HDF5 format (``gzip``, ``lzf`` or ``none``)
+        incremental (:obj:`bool`): whether to only re-execute the outputs of COMBINE/OMEX archives whose SED documents, models
+            or algorithms have changed since the previous execution of the archive into the same output directory, and
+            reuse the files of the previous execution for the other outputs
+        checkpoint (:obj:`bool`): whether to durably record the progress of the execution of COMBINE/OMEX archives in their
+            output directories (the results of each execution of each task, the states of the RoadRunner instances of
+            repeated tasks, and the outputs of each SED document) so that an interrupted execution resumes from where it
+            stopped when the archive is executed again into the same output directory
+        num_workers (:obj:`int`): number of processes to use to execute batches of COMBINE/OMEX archives
+        runtime_db (:obj:`str`): path to a database of the observed runtimes of SED tasks which is used to predict the
+            durations of the archives of batches, so that they can be executed longest first (:obj:`None` to predict
+            durations without observed runtimes and not record runtimes)
+        deduplicate_tasks (:obj:`bool`): whether the biosimulators SED-ML interpreter should only simulate one of each set
+            of equivalent tasks of a SED document (tasks with equivalent models, changes and simulations), and reuse its
+            results for the other tasks of the set
+        in_memory_model_changes (:obj:`bool`): whether the biosimulators SED-ML interpreter should apply changes to the
+            initial values of species, compartments and parameters of SBML models to their compiled RoadRunner instances
+            rather than to their XML, so that models which only differ in these values share a single compilation, and
+            precompute the values of the set value changes of repeated tasks for all of their iterations at once
+        share_models (:obj:`bool`): whether the sub-tasks of a task which use the same model should share a single
+            RoadRunner instance. The instance is reconfigured and reset each time execution switches between sub-tasks.
+        max_resident_models (:obj:`int`): maximum number of RoadRunner instances for the sub-tasks of a task which are
+            held in memory at once (0 for no limit). The states of the least recently used instances are serialized and
+            the instances are restored from their states when they are needed again.
+        simulation_chunk_size (:obj:`int`): number of steps of each chunk of a time course which is simulated and checked
+            for divergence before the next chunk is simulated (0 to simulate time courses in one call without checks,
+            except for the time courses of tasks which have time limits, which are simulated in chunks of
+            :obj:`biosimulators_tellurium.core.DEADLINE_SIMULATION_CHUNK_SIZE` steps)
+        max_absolute_value (:obj:`float`): maximum magnitude of a value of a chunk of a time course before the simulation
+            is considered to have diverged
+        steady_state_solver_fallbacks (:obj:`list` of :obj:`str`): KiSAO ids of the steady-state algorithms which are tried,
+            with their default parameters and in order, when the algorithm of a task fails to find a steady state, before
+            the model is presimulated and the algorithms are tried again
+        task_time_limit (:obj:`float`): maximum wall-clock time in seconds for the execution of each SED task (0 for no
+            limit). The limit is checked before each execution of a task, between the attempts to find steady states, and
+            between the chunks of time courses.
+        archive_time_limit (:obj:`float`): maximum wall-clock time in seconds for the execution of each COMBINE/OMEX
+            archive (0 for no limit)
+        deadline (:obj:`float`): time (:obj:`time.monotonic`) by which the execution of the current archive must
+            finish, or :obj:`None`. Set by :obj:`exec_sedml_docs_in_combine_archive` from :obj:`archive_time_limit`.
     """
 
     def __init__(self):
@@ -36,3 +95,81 @@ class Config(object):
                 plotting_engine, '\n  - '.join(sorted('`' + name + '`' for name in PlottingEngine.__members__.keys()))))
 
         self.plotting_engine = PlottingEngine[plotting_engine]
+
+        self.save_plot_data = os.getenv('SAVE_PLOT_DATA', '1').lower() in ['1', 'true']
+        self.scratch_dir = os.getenv('SCRATCH_DIR', None) or None
+
+        self.model_cache_size = int(os.getenv('MODEL_CACHE_SIZE', '16'))
+        if self.model_cache_size < 0:
+            raise ValueError('`MODEL_CACHE_SIZE` must be a non-negative integer, not `{}`.'.format(self.model_cache_size))
+
+        self.code_cache_size = int(os.getenv('CODE_CACHE_SIZE', '16'))
+        if self.code_cache_size < 0:
+            raise ValueError('`CODE_CACHE_SIZE` must be a non-negative integer, not `{}`.'.format(self.code_cache_size))
+
+        self.result_cache_size = int(os.getenv('RESULT_CACHE_SIZE', '0'))
+        if self.result_cache_size < 0:
+            raise ValueError('`RESULT_CACHE_SIZE` must be a non-negative integer, not `{}`.'.format(self.result_cache_size))
+        self.result_cache_dir = os.getenv('RESULT_CACHE_DIR', None) or None
+
+        self.validation_cache_size = int(os.getenv('VALIDATION_CACHE_SIZE', '256'))
+        if self.validation_cache_size < 0:
+            raise ValueError('`VALIDATION_CACHE_SIZE` must be a non-negative integer, not `{}`.'.format(
+                self.validation_cache_size))
+        self.validation_cache_dir = os.getenv('VALIDATION_CACHE_DIR', None) or None
+
+        self.h5_compression = os.getenv('H5_COMPRESSION', 'gzip').lower()
+        if self.h5_compression not in ['gzip', 'lzf', 'none']:
+            raise ValueError('`H5_COMPRESSION` must be `gzip`, `lzf` or `none`, not `{}`.'.format(self.h5_compression))
+
+        self.incremental = os.getenv('INCREMENTAL', '0').lower() in ['1', 'true']
+
+        self.checkpoint = os.getenv('CHECKPOINT', '0').lower() in ['1', 'true']
+
+        self.num_workers = int(os.getenv('NUM_WORKERS', '1'))
+        if self.num_workers < 1:
+            raise ValueError('`NUM_WORKERS` must be a positive integer, not `{}`.'.format(self.num_workers))
+
+        self.runtime_db = os.getenv('RUNTIME_DB', None) or None
+
+        self.deduplicate_tasks = os.getenv('DEDUPLICATE_TASKS', '0').lower() in ['1', 'true']
+
+        self.in_memory_model_changes = os.getenv('IN_MEMORY_MODEL_CHANGES', '0').lower() in ['1', 'true']
+
+        self.share_models = os.getenv('SHARE_MODELS', '0').lower() in ['1', 'true']
+
+        self.max_resident_models = int(os.getenv('MAX_RESIDENT_MODELS', '0'))
+        if self.max_resident_models < 0:
+            raise ValueError('`MAX_RESIDENT_MODELS` must be a non-negative integer, not `{}`.'.format(self.max_resident_models))
+
+        self.simulation_chunk_size = int(os.getenv('SIMULATION_CHUNK_SIZE', '0'))
+        if self.simulation_chunk_size < 0:
+            raise ValueError('`SIMULATION_CHUNK_SIZE` must be a non-negative integer, not `{}`.'.format(self.simulation_chunk_size))
+
+        self.max_absolute_value = float(os.getenv('MAX_ABSOLUTE_VALUE', 'inf'))
+        if not self.max_absolute_value > 0:
+            raise ValueError('`MAX_ABSOLUTE_VALUE` must be a positive number, not `{}`.'.format(self.max_absolute_value))
+
+        self.steady_state_solver_fallbacks = [
+            kisao_id.strip()
+            for kisao_id in os.getenv('STEADY_STATE_SOLVER_FALLBACKS', 'KISAO_0000569').split(',')
+            if kisao_id.strip()
+        ]
+        for kisao_id in self.steady_state_solver_fallbacks:
+            alg_schema = KISAO_ALGORITHM_SCHEMAS.get(kisao_id, None)
+            if alg_schema is None or not alg_schema.steady_state:
+                raise ValueError('`STEADY_STATE_SOLVER_FALLBACKS` must be a comma-separated list of the KiSAO ids of '
+                                 'steady-state algorithms ({}), not `{}`.'.format(
+                                     ', '.join(kisao_id for kisao_id, alg_schema in KISAO_ALGORITHM_SCHEMAS.items()
+                                               if alg_schema.steady_state),
+                                     kisao_id))
+
+        self.task_time_limit = float(os.getenv('TASK_TIME_LIMIT', '0'))
+        if self.task_time_limit < 0:
+            raise ValueError('`TASK_TIME_LIMIT` must be a non-negative number, not `{}`.'.format(self.task_time_limit))
+
+        self.archive_time_limit = float(os.getenv('ARCHIVE_TIME_LIMIT', '0'))
+        if self.archive_time_limit < 0:
+            raise ValueError('`ARCHIVE_TIME_LIMIT` must be a non-negative number, not `{}`.'.format(self.archive_time_limit))
+
+        self.deadline = None
@@ -6,31 +6,44 @@
 :License: MIT
 """
 
+from .cache import (_TELLURIUM_CODE_CACHE, load_road_runner, get_cached_results, cache_results, validate_sed_task_elements,
+                    validate_model_with_cache, get_algorithm_substitution, get_solver_configuration, clear_caches)
+from .checkpoint import (CHECKPOINT_DIRNAME, read_incremental_manifest, write_incremental_manifest, exec_sed_doc_incrementally,
+                         get_task_fingerprints, _TaskCheckpointer)
 from .config import Config as SimulatorConfig
-from .data_model import SedmlInterpreter, KISAO_ALGORITHM_MAP, PreprocesssedTask
+from .data_model import (SedmlInterpreter, KISAO_ALGORITHM_MAP, KISAO_ALGORITHM_SCHEMAS, SolverConfiguration, RESET_METHODS,
+                         RoadRunnerPool, PreprocesssedTask, SimulationTimeoutError, TauLeapingIntegrator)
+from .dedup import _TaskDeduplicator
+from .model_changes import precompute_compute_model_changes, plan_in_memory_model_changes, get_in_memory_initial_values
+from .tau_leaping import simulate_tau_leaping
+from .utils import get_data_generators_for_outputs, get_tasks_for_data_generators, write_sed_doc_to_string
 from biosimulators_utils.combine.exec import exec_sedml_docs_in_archive
 from biosimulators_utils.config import get_config, Config  # noqa: F401
 from biosimulators_utils.log.data_model import Status, CombineArchiveLog, SedDocumentLog, StandardOutputErrorCapturerLevel, TaskLog  # noqa: F401
 from biosimulators_utils.log.utils import init_sed_document_log, StandardOutputErrorCapturer
 from biosimulators_utils.viz.data_model import VizFormat  # noqa: F401
 from biosimulators_utils.report.data_model import DataSetResults, ReportResults, ReportFormat, SedDocumentResults, VariableResults  # noqa: F401
-from biosimulators_utils.report.io import ReportWriter
+from biosimulators_utils.report.io import ReportWriter, Hdf5DataSetType
 from biosimulators_utils.sedml import exec as sedml_exec
 from biosimulators_utils.sedml import validation
-from biosimulators_utils.sedml.data_model import (
-    Task, RepeatedTask, ModelLanguage, ModelAttributeChange, ComputeModelChange, SteadyStateSimulation, UniformTimeCourseSimulation,
-    Symbol, Report, DataSet, Plot2D, Curve, Plot3D, Surface)
-from biosimulators_utils.sedml.io import SedmlSimulationReader, SedmlSimulationWriter
+from biosimulators_utils.sedml.data_model import (SedDocument, Task, RepeatedTask, ModelAttributeChange, ComputeModelChange,
+                                                  SteadyStateSimulation, UniformTimeCourseSimulation, Symbol, Report, DataSet,
+                                                  Plot2D, Curve, Plot3D, Surface)
+from biosimulators_utils.sedml.io import SedmlSimulationReader
 from biosimulators_utils.simulator.utils import get_algorithm_substitution_policy
-from biosimulators_utils.utils.core import raise_errors_warnings, validate_str_value, parse_value
-from biosimulators_utils.warnings import warn, BioSimulatorsWarning
-from kisao.data_model import AlgorithmSubstitutionPolicy, ALGORITHM_SUBSTITUTION_POLICY_LEVELS
-from kisao.utils import get_preferred_substitute_algorithm_by_ids
+from biosimulators_utils.utils.core import pad_arrays_to_consistent_shapes, raise_errors_warnings
+from biosimulators_utils.xml.utils import get_namespaces_with_prefixes
 from tellurium.sedml.tesedml import SEDMLCodeFactory
+import collections
+import contextlib
 import copy
+import dataclasses
 import datetime
 import functools
 import glob
+import h5py
+import hashlib
+import itertools
 import lxml.etree
 import numpy
 import os
@@ -39,6 +52,7 @@ import shutil
 import tellurium
 import tempfile
 import tellurium.sedml.tesedml
+import time
 import roadrunner
 
 
@@ -47,8 +61,15 @@ __all__ = [
     'exec_sed_doc',
     'exec_sed_task',
     'preprocess_sed_task',
+    'load_road_runner',
+    'clear_caches',
 ]
 
+# :obj:`int`: number of steps of each chunk of the time courses of tasks which have deadlines (see
+# :obj:`SimulatorConfig.task_time_limit` and :obj:`SimulatorConfig.archive_time_limit`), when
+# :obj:`SimulatorConfig.simulation_chunk_size` isn't set, so that the deadlines are checked during long time courses
+DEADLINE_SIMULATION_CHUNK_SIZE = 1000
+
 
 def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, simulator_config=None):
     """ Execute the SED tasks defined in a COMBINE/OMEX archive and save the outputs
@@ -75,6 +96,10 @@ def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, s
         simulator_config = SimulatorConfig()
     sedml_interpreter = simulator_config.sedml_interpreter
 
+    if simulator_config.archive_time_limit:
+        simulator_config = copy.copy(simulator_config)
+        simulator_config.deadline = time.monotonic() + simulator_config.archive_time_limit
+
     if sedml_interpreter == SedmlInterpreter.biosimulators:
         apply_xml_model_changes = True
         sed_doc_executer_logged_features = (Task, Report, DataSet, Plot2D, Curve, Plot3D, Surface)
@@ -82,8 +107,14 @@ def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, s
         apply_xml_model_changes = False
         sed_doc_executer_logged_features = (Report, Plot2D, Plot3D)
 
-    return exec_sedml_docs_in_archive(
-        functools.partial(exec_sed_doc, simulator_config=simulator_config),
+    sed_doc_executer = functools.partial(exec_sed_doc, simulator_config=simulator_config)
+    if simulator_config.incremental or simulator_config.checkpoint:
+        manifest = read_incremental_manifest(out_dir)
+        sed_doc_executer = functools.partial(exec_sed_doc_incrementally, sed_doc_executer, manifest,
+                                             simulator_config=simulator_config)
+
+    results = exec_sedml_docs_in_archive(
+        sed_doc_executer,
         archive_filename, out_dir,
         apply_xml_model_changes=apply_xml_model_changes,
         sed_doc_executer_supported_features=(Task, Report, DataSet, Plot2D, Curve, Plot3D, Surface),
@@ -91,6 +122,17 @@ def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, s
         config=config,
     )
 
+    if (simulator_config.incremental or simulator_config.checkpoint) and os.path.isdir(out_dir):
+        write_incremental_manifest(out_dir, manifest)
+
+    _, log = results
+
+    # the checkpoints of the tasks are only needed to resume interrupted executions
+    if simulator_config.checkpoint and not (log and log.exception):
+        shutil.rmtree(os.path.join(out_dir, CHECKPOINT_DIRNAME), ignore_errors=True)
+
+    return results
+
 
 def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
                  apply_xml_model_changes=False,
@@ -199,19 +241,79 @@ def exec_sed_doc_with_biosimulators(doc, working_dir, base_out_path, rel_out_pat
     # The value_executer's don't need the simulator_config.
     # get_value_executer = functools.partial(get_model_variable_value, simulator_config=simulator_config)
     # set_value_executer = functools.partial(set_model_variable_value, simulator_config=simulator_config)
+    set_value_executer = set_model_variable_value
     preprocessed_task_executer = functools.partial(preprocess_sed_task, simulator_config=simulator_config)
-    return sedml_exec.exec_sed_doc(sed_task_executer, doc, working_dir, base_out_path,
-                                   rel_out_path=rel_out_path,
-                                   apply_xml_model_changes=True,
-                                   log=log,
-                                   indent=indent,
-                                   pretty_print_modified_xml_models=pretty_print_modified_xml_models,
-                                   log_level=log_level,
-                                   config=config,
-                                   get_value_executer=get_model_variable_value,
-                                   set_value_executer=set_model_variable_value,
-                                   preprocessed_task_executer=preprocessed_task_executer,
-                                   reset_executer=reset_all_models)
+
+    if not isinstance(doc, SedDocument):
+        doc = SedmlSimulationReader().run(doc, config=config)
+    elif simulator_config.in_memory_model_changes:
+        # the changes of the repeated tasks and models of the document are modified below
+        doc = copy.deepcopy(doc)
+
+    if simulator_config.checkpoint:
+        task_fingerprints = get_task_fingerprints(doc, working_dir, config=config, simulator_config=simulator_config)
+
+    in_memory_model_changes = {}
+    if simulator_config.in_memory_model_changes:
+        precompute_compute_model_changes(doc)
+        in_memory_model_changes = plan_in_memory_model_changes(doc, working_dir)
+        preprocessed_task_executer = functools.partial(preprocess_sed_task, simulator_config=simulator_config,
+                                                       in_memory_model_changes=in_memory_model_changes)
+
+    reset_executer = reset_all_models
+    if simulator_config.checkpoint:
+        checkpointer = _TaskCheckpointer(os.path.join(base_out_path, CHECKPOINT_DIRNAME), task_fingerprints,
+                                         sed_task_executer, preprocessed_task_executer, set_value_executer, reset_executer)
+        sed_task_executer = checkpointer.exec_task
+        preprocessed_task_executer = checkpointer.preprocess_task
+        set_value_executer = checkpointer.set_value
+        reset_executer = checkpointer.reset
+
+    if simulator_config.deduplicate_tasks:
+        deduplicator = _TaskDeduplicator(doc, sed_task_executer, preprocessed_task_executer, set_value_executer)
+        sed_task_executer = deduplicator.exec_task
+        preprocessed_task_executer = deduplicator.preprocess_task
+        set_value_executer = deduplicator.set_value
+
+    # the logs of repeated tasks aren't passed to the executions of their sub-tasks, so the statistics of their solvers
+    # are collected from their preprocessed tasks
+    repeated_preprocessed_tasks = collections.OrderedDict()
+
+    def collect_preprocessed_task(task, variables, config=None, preprocessed_task_executer=preprocessed_task_executer):
+        preprocessed_task = preprocessed_task_executer(task, variables, config=config)
+        if (
+            isinstance(task, RepeatedTask)
+            and isinstance(preprocessed_task, PreprocesssedTask)
+            and not any(other is preprocessed_task for other in repeated_preprocessed_tasks.values())
+        ):
+            repeated_preprocessed_tasks[task.id] = preprocessed_task
+        return preprocessed_task
+
+    for model in doc.models:
+        in_memory_change_ids = set(id(change) for change in in_memory_model_changes.get(model.id, []))
+        if in_memory_change_ids:
+            model.changes = [change for change in model.changes if id(change) not in in_memory_change_ids]
+
+    results, log = sedml_exec.exec_sed_doc(sed_task_executer, doc, working_dir, base_out_path,
+                                           rel_out_path=rel_out_path,
+                                           apply_xml_model_changes=True,
+                                           log=log,
+                                           indent=indent,
+                                           pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+                                           log_level=log_level,
+                                           config=config,
+                                           get_value_executer=get_model_variable_value,
+                                           set_value_executer=set_value_executer,
+                                           preprocessed_task_executer=collect_preprocessed_task,
+                                           reset_executer=reset_executer)
+
+    for task_id, preprocessed_task in repeated_preprocessed_tasks.items():
+        task_log = log.tasks.get(task_id, None) if log and log.tasks else None
+        if task_log and preprocessed_task.solver_statistics:
+            task_log.simulator_details = dict(task_log.simulator_details or {},
+                                              solverStatistics=preprocessed_task.solver_statistics)
+
+    return results, log
 
 
 def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None, simulator_config=None):
@@ -241,6 +343,9 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
     if not config:
         config = get_config()
 
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
     if config.LOG and not log:
         log = TaskLog()
 
@@ -249,17 +354,102 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
 
     model = task.model
     sim = task.simulation
-    road_runner = preprocessed_task.road_runners[task.id]
+    check_deadline(task.id, preprocessed_task, log=log)
 
-    # apply model changes
     if model.changes:
         raise_errors_warnings(validation.validate_model_change_types(model.changes, (ModelAttributeChange, ComputeModelChange, )),
                               error_summary='Task changes for model ' + model.id
                               + ' that are not attribute changes or compute model changes are not supported.')
-        for change in model.changes:
-            component_id = preprocessed_task.model_change_target_tellurium_id_maps[task.id][(change.model, change.target, change.symbol)]
-            new_value = float(change.new_value)
-            road_runner[component_id] = new_value
+
+    result_cache_key = get_result_cache_key(task, preprocessed_task, simulator_config)
+    road_runner = get_task_road_runner(preprocessed_task, task.id)
+
+    results = None
+    if result_cache_key is not None:
+        results = get_cached_results(result_cache_key, simulator_config)
+    result_cache_hit = results is not None
+
+    reset_method = get_task_reset_method(task, preprocessed_task)
+    if not result_cache_hit:
+        preprocessed_task.road_runners.mark_modified(task.id, reset_method)
+        solver_statistics = {}
+        results = simulate_task(road_runner, task, preprocessed_task, simulator_config, log=log,
+                                solver_statistics=solver_statistics)
+        if preprocessed_task.solver_statistics is not None:
+            merge_solver_statistics(preprocessed_task.solver_statistics, solver_statistics)
+    else:
+        # subsequent tasks (e.g., iterations of repeated tasks) may continue from the state of the simulation
+        replay_simulator_config = copy.copy(simulator_config)
+        replay_simulator_config.simulation_chunk_size = get_simulation_chunk_size(preprocessed_task, simulator_config)
+        replay_preprocessed_task = dataclasses.replace(preprocessed_task, deadline=None)
+        preprocessed_task.road_runners.defer_simulation(
+            task.id,
+            lambda road_runner: simulate_task(road_runner, task, replay_preprocessed_task, replay_simulator_config),
+            reset_method)
+
+    # check simulation succeeded
+    if config.VALIDATE_RESULTS and numpy.any(numpy.isnan(results)):
+        raise ValueError(get_simulation_failure_message(
+            str(numpy.count_nonzero(numpy.isnan(results))) + ' nan value(s) found in results',
+            task.id, preprocessed_task))
+
+    if result_cache_key is not None and not result_cache_hit:
+        cache_results(result_cache_key, results, simulator_config)
+
+    # record results
+    variable_results = VariableResults()
+    for variable, result in zip(variables, results):
+        if isinstance(sim, UniformTimeCourseSimulation):
+            result = result[-(sim.number_of_points + 1):]
+
+        variable_results[variable.id] = result
+
+    # log action
+    if config.LOG:
+        log.algorithm = preprocessed_task.algorithm_kisao_ids[task.id]
+        log.simulator_details = {
+            'method': 'simulate' if isinstance(sim, UniformTimeCourseSimulation) else 'steadyState',
+            'solver': preprocessed_task.solvers[task.id].getName(),
+        }
+        for i_param in range(preprocessed_task.solvers[task.id].getNumParams()):
+            param_name = preprocessed_task.solvers[task.id].getParamName(i_param)
+            log.simulator_details[param_name] = getattr(preprocessed_task.solvers[task.id], param_name)
+        if result_cache_key is not None:
+            log.simulator_details['resultCache'] = 'hit' if result_cache_hit else 'miss'
+        if not result_cache_hit:
+            log.simulator_details['solverStatistics'] = solver_statistics
+
+    # return results and log
+    return variable_results, log
+
+
+def simulate_task(road_runner, task, preprocessed_task, simulator_config, log=None, solver_statistics=None):
+    """ Apply the changes of the model of a task to its RoadRunner instance and simulate the task
+
+    Args:
+        road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance configured for the task
+        task (:obj:`Task`): task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+        log (:obj:`TaskLog`, optional): log for the task
+        solver_statistics (:obj:`dict`, optional): dictionary where the work of the solvers is recorded (see
+            :obj:`record_solver_work`)
+
+    Returns:
+        :obj:`numpy.ndarray`: results, with one row for each selection
+
+    Raises:
+        :obj:`ValueError`: if the simulation failed
+        :obj:`SimulationTimeoutError`: if the simulation exceeds the time budget of the task
+    """
+    model = task.model
+    sim = task.simulation
+
+    # apply model changes
+    for change in model.changes:
+        component_id = preprocessed_task.model_change_target_tellurium_id_maps[task.id][(change.model, change.target, change.symbol)]
+        new_value = float(change.new_value)
+        road_runner[component_id] = new_value
 
     # simulate
     if isinstance(sim, UniformTimeCourseSimulation):
@@ -269,73 +459,419 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
 
             number_of_presim_points = round(number_of_presim_points) - sim.number_of_steps
             number_of_presim_points = max(2, number_of_presim_points)
-            road_runner.simulate(sim.initial_time, sim.output_start_time, number_of_presim_points)
+            simulate_time_course(road_runner, sim.initial_time, sim.output_start_time, number_of_presim_points - 1,
+                                 task.id, preprocessed_task, simulator_config, log=log,
+                                 solver_statistics=solver_statistics)
 
-        results = numpy.array(road_runner.simulate(sim.output_start_time, sim.output_end_time, sim.number_of_steps+1).tolist()).transpose()
+        results = simulate_time_course(road_runner, sim.output_start_time, sim.output_end_time, sim.number_of_steps,
+                                       task.id, preprocessed_task, simulator_config, log=log,
+                                       solver_statistics=solver_statistics)
     else:
         results = None
         simdists = [0, 0.1, 1, 10, 100, 1000]
         sd = 0
         lasterr = ""
-        while sd < len(simdists) and results is None:
-            try:
-                if simdists[sd] > 0:
-                    road_runner.resetAll()
-                    if model.changes:
+        reset_method = get_simulation_reset_method(task.id, preprocessed_task)
+        solver_configurations = get_steady_state_solver_configurations(task.id, preprocessed_task, simulator_config)
+        try:
+            while sd < len(simdists) and results is None:
+                check_deadline(task.id, preprocessed_task, log=log)
+                try:
+                    if simdists[sd] > 0:
+                        # only undo the previous attempt, and only re-apply the changes which the reset undid
+                        getattr(road_runner, reset_method)()
                         for change in model.changes:
-                            component_id = preprocessed_task.model_change_target_tellurium_id_maps[task.id][(change.model,
-                                                                                                             change.target,
-                                                                                                             change.symbol)]
-                            new_value = float(change.new_value)
-                            road_runner[component_id] = new_value
-                    road_runner.simulate(end=simdists[sd])
-                road_runner.steadyState()
-                results = road_runner.getSteadyStateValues()
-            except Exception as e:
-                lasterr = str(e)
-            sd += 1
+                            component_id = preprocessed_task.model_change_target_tellurium_id_maps[task.id][(
+                                change.model, change.target, change.symbol)]
+                            if reset_method != RESET_METHODS[0] or \
+                                    get_value_reset_method(task.id, component_id, preprocessed_task) == RESET_METHODS[0]:
+                                road_runner[component_id] = float(change.new_value)
+                        with record_solver_work(solver_statistics, 'integrationTime', integrations=1):
+                            road_runner.simulate(end=simdists[sd])
+
+                    # try each solver of the chain from the same state
+                    if len(solver_configurations) > 1:
+                        state = road_runner.saveStateS()
+                    for i_solver, solver_configuration in enumerate(solver_configurations):
+                        if i_solver > 0:
+                            # states also include the solvers and selections with which they were saved
+                            road_runner.loadStateS(state)
+                            road_runner.steadyStateSelections = preprocessed_task.selections[task.id]
+                        if len(solver_configurations) > 1:
+                            solver_configuration.apply(road_runner)
+                        solver_id_statistics = (
+                            solver_statistics.setdefault('steadyStateSolvers', {}).setdefault(solver_configuration.solver_id, {})
+                            if solver_statistics is not None else None
+                        )
+                        try:
+                            with record_solver_work(solver_statistics, 'steadyStateTime', steadyStateAttempts=1):
+                                with record_solver_work(solver_id_statistics, 'time', attempts=1):
+                                    road_runner.steadyState()
+                        except Exception as e:
+                            lasterr = str(e)
+                            continue
+                        results = road_runner.getSteadyStateValues()
+                        if solver_statistics is not None:
+                            solver_statistics['presimulationTimes'] = {str(simdists[sd]): 1}
+                            solver_id_statistics['successes'] = 1
+                        break
+                except Exception as e:
+                    lasterr = str(e)
+                sd += 1
+
+        finally:
+            # restore the solver of the task, which fallbacks and failed attempts may have replaced or reconfigured
+            preprocessed_task.solvers[task.id] = solver_configurations[0].apply(road_runner)
+
         if results is None:
-            msg = 'Steady state analysis failed with algorithm `{}` ({}):'.format(
+            msg = 'Steady state analysis failed with algorithm `{}` ({}){}:'.format(
                 preprocessed_task.algorithm_kisao_ids[task.id],
-                KISAO_ALGORITHM_MAP[preprocessed_task.algorithm_kisao_ids[task.id]]['id'])
+                KISAO_ALGORITHM_MAP[preprocessed_task.algorithm_kisao_ids[task.id]]['id'],
+                ''.join(' and fallback algorithm `{}` ({})'.format(
+                    solver_configuration.algorithm_kisao_id, solver_configuration.solver_id)
+                    for solver_configuration in solver_configurations[1:]))
             msg += "\n   '" + lasterr + "'"
             for i_param in range(preprocessed_task.solvers[task.id].getNumParams()):
                 param_name = preprocessed_task.solvers[task.id].getParamName(i_param)
                 msg += '\n  - {}: {}'.format(param_name, getattr(preprocessed_task.solvers[task.id], param_name))
             raise ValueError(msg)
 
-    # check simulation succeeded
-    if config.VALIDATE_RESULTS and numpy.any(numpy.isnan(results)):
-        msg = 'Simulation failed: ' + str(numpy.count_nonzero(numpy.isnan(results))) +\
-              ' nan value(s) found in results with algorithm `{}` ({})'.format(
-            preprocessed_task.algorithm_kisao_ids[task.id],
-            KISAO_ALGORITHM_MAP[preprocessed_task.algorithm_kisao_ids[task.id]]['id'])
-        for i_param in range(preprocessed_task.solvers[task.id].getNumParams()):
-            param_name = preprocessed_task.solvers[task.id].getParamName(i_param)
-            msg += '\n  - {}: {}'.format(param_name, getattr(preprocessed_task.solvers[task.id], param_name))
-        raise ValueError(msg)
+    return results
 
-    # record results
-    variable_results = VariableResults()
-    for variable, result in zip(variables, results):
-        if isinstance(sim, UniformTimeCourseSimulation):
-            result = result[-(sim.number_of_points + 1):]
 
-        variable_results[variable.id] = result
+def get_steady_state_solver_configurations(task_id, preprocessed_task, simulator_config):
+    """ Get the chain of the configurations of the steady-state solvers which are tried to find the steady state of a task:
+    the solver of the task, followed by the fallback algorithms (:obj:`SimulatorConfig.steady_state_solver_fallbacks`)
+    with their default parameters. Fallbacks which are implemented by the solver of the task, or by a previous
+    fallback, are skipped.
 
-    # log action
-    if config.LOG:
-        log.algorithm = preprocessed_task.algorithm_kisao_ids[task.id]
-        log.simulator_details = {
-            'method': 'simulate' if isinstance(sim, UniformTimeCourseSimulation) else 'steadyState',
-            'solver': preprocessed_task.solvers[task.id].getName(),
-        }
-        for i_param in range(preprocessed_task.solvers[task.id].getNumParams()):
-            param_name = preprocessed_task.solvers[task.id].getParamName(i_param)
-            log.simulator_details[param_name] = getattr(preprocessed_task.solvers[task.id], param_name)
+    Args:
+        task_id (:obj:`str`): id of the task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
 
-    # return results and log
-    return variable_results, log
+    Returns:
+        :obj:`list` of :obj:`SolverConfiguration`: configurations of the solvers, in the order in which they are tried
+    """
+    solver_configurations = [preprocessed_task.solver_configurations[task_id]]
+    for kisao_id in simulator_config.steady_state_solver_fallbacks:
+        alg_schema = KISAO_ALGORITHM_SCHEMAS[kisao_id]
+        if all(solver_configuration.solver_id != alg_schema.id for solver_configuration in solver_configurations):
+            solver_configurations.append(SolverConfiguration(
+                algorithm_kisao_id=kisao_id,
+                solver_id=alg_schema.id,
+                steady_state=True,
+                parameter_values=(),
+            ))
+    return solver_configurations
+
+
+def get_task_reset_method(task, preprocessed_task):
+    """ Get the cheapest of the :obj:`RESET_METHODS` which restores the initial state of the RoadRunner instance of a task
+    after the task is simulated. Instances whose models have changes which haven't been applied to their XML are reset
+    completely.
+
+    Args:
+        task (:obj:`Task`): task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+
+    Returns:
+        :obj:`str`: name of the method
+    """
+    if task.model.changes:
+        return RESET_METHODS[-1]
+    return get_simulation_reset_method(task.id, preprocessed_task)
+
+
+def get_simulation_reset_method(task_id, preprocessed_task):
+    """ Get the cheapest of the :obj:`RESET_METHODS` which undoes a simulation of a task
+
+    Args:
+        task_id (:obj:`str`): id of the task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+
+    Returns:
+        :obj:`str`: name of the method
+    """
+    return (preprocessed_task.simulation_reset_methods or {}).get(task_id, RESET_METHODS[-1])
+
+
+def get_value_reset_method(task_id, tellurium_id, preprocessed_task):
+    """ Get the cheapest of the :obj:`RESET_METHODS` which undoes a change to the value of a model component of a task
+
+    Args:
+        task_id (:obj:`str`): id of the task
+        tellurium_id (:obj:`str`): tellurium identifier of the model component
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+
+    Returns:
+        :obj:`str`: name of the method
+    """
+    return (preprocessed_task.value_reset_methods or {}).get(task_id, {}).get(tellurium_id, RESET_METHODS[-1])
+
+
+def get_reset_methods(model_etree, model, tellurium_ids):
+    """ Determine the cheapest of the :obj:`RESET_METHODS` which undo simulations of a model and changes to the values of
+    its components. ``reset`` undoes simulations unless events assign boundary species, compartments or global parameters
+    (other than the variables of rate rules), and it undoes changes to floating species and the variables of rate rules.
+    Both methods re-evaluate initial assignments, including those which depend on the changed components. Changes to the
+    structure of models are applied to their XML before they are compiled, so both methods restore structurally changed
+    models to their changed initial states; ``resetToOrigin`` is never needed.
+
+    Args:
+        model_etree (:obj:`lxml.etree._ElementTree`): element tree for model
+        model (:obj:`roadrunner.roadrunner.ExecutableModel`): model
+        tellurium_ids (:obj:`list` of :obj:`str`): tellurium identifiers of the model components which can be changed
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: method which undoes simulations
+            * :obj:`dict`: dictionary that maps tellurium identifiers to the methods which undo changes to their values
+    """
+    reset_ids = set(model.getFloatingSpeciesIds())
+    reset_ids.update(model_etree.xpath('//*[local-name()="rateRule"]/@variable'))
+    event_assignment_ids = set(model_etree.xpath('//*[local-name()="eventAssignment"]/@variable'))
+
+    simulation_reset_method = RESET_METHODS[0] if event_assignment_ids.issubset(reset_ids) else RESET_METHODS[-1]
+    value_reset_methods = {
+        tellurium_id: RESET_METHODS[0] if tellurium_id.strip('[]') in reset_ids else RESET_METHODS[-1]
+        for tellurium_id in tellurium_ids
+    }
+    return simulation_reset_method, value_reset_methods
+
+
+def get_simulation_chunk_size(preprocessed_task, simulator_config):
+    """ Get the number of steps of each chunk in which time courses of a task are simulated. Time courses of tasks which
+    have deadlines are simulated in chunks of :obj:`DEADLINE_SIMULATION_CHUNK_SIZE` steps when
+    :obj:`SimulatorConfig.simulation_chunk_size` isn't set.
+
+    Args:
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`int`: number of steps of each chunk (0 to simulate time courses in one call)
+    """
+    if not simulator_config.simulation_chunk_size and preprocessed_task.deadline is not None:
+        return DEADLINE_SIMULATION_CHUNK_SIZE
+    return simulator_config.simulation_chunk_size
+
+
+def simulate_time_course(road_runner, start_time, end_time, number_of_steps, task_id, preprocessed_task, simulator_config,
+                         log=None, solver_statistics=None):
+    """ Simulate a time course. If the time course is simulated in chunks of steps (see :obj:`get_simulation_chunk_size`),
+    abort as soon as a chunk contains a nan or infinite value or a value whose magnitude exceeds
+    :obj:`SimulatorConfig.max_absolute_value`. If the task has a time budget, its deadline is also checked after each
+    chunk.
+
+    Args:
+        road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance configured for the task
+        start_time (:obj:`float`): start time
+        end_time (:obj:`float`): end time
+        number_of_steps (:obj:`int`): number of steps
+        task_id (:obj:`str`): id of the task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+        log (:obj:`TaskLog`, optional): log for the task, where the location of a divergence is recorded
+        solver_statistics (:obj:`dict`, optional): dictionary where the work of the integrator is recorded (see
+            :obj:`record_solver_work`)
+
+    Returns:
+        :obj:`numpy.ndarray`: results, with one row for each selection
+
+    Raises:
+        :obj:`ValueError`: if the simulation diverges
+        :obj:`SimulationTimeoutError`: if the simulation exceeds the time budget of the task
+    """
+    solver = preprocessed_task.solvers[task_id]
+    chunk_size = get_simulation_chunk_size(preprocessed_task, simulator_config)
+    if not chunk_size:
+        with record_solver_work(solver_statistics, 'integrationTime', integrations=1, steps=number_of_steps):
+            results = integrate_time_course(road_runner, solver, start_time, end_time, number_of_steps + 1)
+        return results.transpose()
+
+    times = numpy.linspace(start_time, end_time, number_of_steps + 1)
+    checked_selections = numpy.array([selection != 'time' for selection in preprocessed_task.selections[task_id]])
+
+    chunks = []
+    for i_start_step in range(0, max(number_of_steps, 1), chunk_size):
+        i_end_step = min(i_start_step + chunk_size, number_of_steps)
+        with record_solver_work(solver_statistics, 'integrationTime', integrations=1, steps=i_end_step - i_start_step):
+            chunk = integrate_time_course(road_runner, solver, times[i_start_step], times[i_end_step],
+                                          i_end_step - i_start_step + 1)
+
+        # the first point of each chunk after the first is the last point of the previous chunk
+        if chunks:
+            chunk = chunk[1:, :]
+            i_start_step += 1
+
+        invalid = (
+            ~numpy.isfinite(chunk)
+            | (numpy.abs(chunk) > simulator_config.max_absolute_value)
+        ) & checked_selections
+        if numpy.any(invalid):
+            i_invalid_step = i_start_step + numpy.argwhere(invalid)[0][0]
+            divergence_time = float(times[i_invalid_step])
+            invalid_selections = [selection
+                                  for selection, selection_invalid in zip(preprocessed_task.selections[task_id],
+                                                                          invalid[i_invalid_step - i_start_step, :])
+                                  if selection_invalid]
+            if log:
+                if not log.simulator_details:
+                    log.simulator_details = {}
+                log.simulator_details['divergence'] = {
+                    'time': divergence_time,
+                    'step': int(i_invalid_step),
+                    'selections': invalid_selections,
+                }
+            raise ValueError(get_simulation_failure_message(
+                '{} nan, infinite, or out-of-bounds value(s) found in results at time {} ({})'.format(
+                    numpy.count_nonzero(invalid), divergence_time, ', '.join(invalid_selections)),
+                task_id, preprocessed_task))
+
+        chunks.append(chunk)
+
+        if i_end_step < number_of_steps:
+            check_deadline(task_id, preprocessed_task, log=log, simulation_time=float(times[i_end_step]))
+
+    return numpy.concatenate(chunks).transpose()
+
+
+def integrate_time_course(road_runner, solver, start_time, end_time, number_of_points):
+    """ Integrate a time course with the integrator of a task, which is either the integrator of its RoadRunner instance or
+    an integrator which RoadRunner doesn't implement
+
+    Args:
+        road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance configured for the task
+        solver (:obj:`roadrunner.Integrator` or :obj:`TauLeapingIntegrator`): integrator of the task
+        start_time (:obj:`float`): start time
+        end_time (:obj:`float`): end time
+        number_of_points (:obj:`int`): number of time points, including the start and end times
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the selections of the instance, with one row for each time point
+    """
+    if isinstance(solver, TauLeapingIntegrator):
+        return simulate_tau_leaping(road_runner, solver, start_time, end_time, number_of_points)
+    return numpy.array(road_runner.simulate(start_time, end_time, number_of_points).tolist())
+
+
+@contextlib.contextmanager
+def record_solver_work(solver_statistics, time_key, **counts):
+    """ Context manager which records the wall-clock time of a call to a solver and the work which it performs
+
+    The statistics of a task include the number of calls to the integrator (``integrations``), the number of output steps
+    which it integrated (``steps``), the time spent in the integrator (``integrationTime``), the number of attempts to
+    find a steady state (``steadyStateAttempts``), the time spent in the steady-state solvers (``steadyStateTime``), the
+    number of attempts, time and number of steady states found of each steady-state solver (``steadyStateSolvers``), and
+    the number of steady states which were found after each presimulation time (``presimulationTimes``).
+
+    Args:
+        solver_statistics (:obj:`dict`): dictionary where the work of the solver is recorded, or :obj:`None` to not record
+            the work
+        time_key (:obj:`str`): key of the time spent in the solver
+        **counts: amounts to add to the counters of the work of the solver
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        if solver_statistics is not None:
+            solver_statistics[time_key] = solver_statistics.get(time_key, 0.) + time.perf_counter() - start_time
+            for key, count in counts.items():
+                solver_statistics[key] = solver_statistics.get(key, 0) + count
+
+
+def merge_solver_statistics(total, solver_statistics):
+    """ Add statistics of the work of solvers (see :obj:`record_solver_work`) to a total
+
+    Args:
+        total (:obj:`dict`): total statistics
+        solver_statistics (:obj:`dict`): statistics to add
+    """
+    for key, value in solver_statistics.items():
+        if isinstance(value, dict):
+            merge_solver_statistics(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def summarize_solver_statistics(log):
+    """ Summarize the work of the solvers of the tasks of a COMBINE/OMEX archive (see :obj:`record_solver_work`)
+
+    Args:
+        log (:obj:`CombineArchiveLog`): log of the execution of the archive
+
+    Returns:
+        :obj:`dict`: dictionary with the number of tasks whose solvers were executed (``tasks``), the totals of their
+            statistics, and the tasks which spent the most time in their solvers (``slowestTasks``)
+    """
+    summary = {'tasks': 0}
+    task_times = []
+    for location, doc_log in (log.sed_documents or {}).items():
+        for task_id, task_log in (doc_log.tasks or {}).items():
+            solver_statistics = (task_log.simulator_details or {}).get('solverStatistics', None)
+            if solver_statistics is None:
+                continue
+
+            summary['tasks'] += 1
+            merge_solver_statistics(summary, solver_statistics)
+            task_times.append((
+                solver_statistics.get('integrationTime', 0.) + solver_statistics.get('steadyStateTime', 0.),
+                location + '/' + task_id,
+            ))
+
+    summary['slowestTasks'] = [task for _, task in sorted(task_times, key=lambda task_time: -task_time[0])[0:5]]
+    return summary
+
+
+def check_deadline(task_id, preprocessed_task, log=None, simulation_time=None):
+    """ Check that a task has not exceeded its time budget
+
+    Args:
+        task_id (:obj:`str`): id of the task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task, where the simulation time at which the task was stopped is
+            recorded
+        simulation_time (:obj:`float`, optional): simulation time which the task has reached
+
+    Raises:
+        :obj:`SimulationTimeoutError`: if the task has exceeded its time budget
+    """
+    if preprocessed_task.deadline is None or time.monotonic() < preprocessed_task.deadline:
+        return
+
+    if log:
+        if not log.simulator_details:
+            log.simulator_details = {}
+        log.simulator_details['timeout'] = {'time': simulation_time}
+
+    msg = 'Task `{}` exceeded its time budget'.format(task_id)
+    if simulation_time is not None:
+        msg += ' at simulation time {}'.format(simulation_time)
+    raise SimulationTimeoutError(msg + '.')
+
+
+def get_simulation_failure_message(summary, task_id, preprocessed_task):
+    """ Get a message which describes the failure of a simulation, including the algorithm and the values of the
+    parameters of its solver
+
+    Args:
+        summary (:obj:`str`): summary of the failure
+        task_id (:obj:`str`): id of the task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+
+    Returns:
+        :obj:`str`: message
+    """
+    msg = 'Simulation failed: ' + summary + ' with algorithm `{}` ({})'.format(
+        preprocessed_task.algorithm_kisao_ids[task_id],
+        KISAO_ALGORITHM_MAP[preprocessed_task.algorithm_kisao_ids[task_id]]['id'])
+    for i_param in range(preprocessed_task.solvers[task_id].getNumParams()):
+        param_name = preprocessed_task.solvers[task_id].getParamName(i_param)
+        msg += '\n  - {}: {}'.format(param_name, getattr(preprocessed_task.solvers[task_id], param_name))
+    return msg
 
 
 def get_all_tasks_from_task(task):
@@ -366,12 +902,98 @@ def get_all_task_changes_from_task(task):
         raise NotImplementedError("Tasks other than 'Task' or 'RepeatedTask' are not supported.")
 
 
+def get_result_cache_key(task, preprocessed_task, simulator_config):
+    """ Get the key for the results of a task in the result cache
+
+    Results can only be reused for tasks whose RoadRunner instances are in the initial states of their models (i.e.,
+    which haven't been changed or simulated since they were loaded or last reset), and for deterministic simulations or
+    stochastic simulations with fixed seeds whose random number generators haven't been used by previous executions.
+
+    Args:
+        task (:obj:`Task`): task
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about the task
+        simulator_config (:obj:`SimulatorConfig`): tellurium configuration
+
+    Returns:
+        :obj:`str`: key, or :obj:`None` if the results of the task cannot be cached
+    """
+    if not simulator_config.result_cache_size or preprocessed_task.road_runners.is_modified(task.id):
+        return None
+
+    solver_configuration = preprocessed_task.solver_configurations[task.id]
+    alg_schema = KISAO_ALGORITHM_SCHEMAS[solver_configuration.algorithm_kisao_id]
+    if alg_schema.stochastic:
+        seed_schema = alg_schema.parameters.get('KISAO_0000488', None)
+        if seed_schema is None or seed_schema.roadrunner_attribute not in dict(solver_configuration.parameter_values):
+            return None
+
+        # the random number generators of integrators which RoadRunner doesn't implement are only seeded once per task
+        solver = preprocessed_task.solvers[task.id]
+        if isinstance(solver, TauLeapingIntegrator) and solver.is_random_number_generator_used():
+            return None
+
+    model = task.model
+    sim = task.simulation
+    if preprocessed_task.model_hashes is None:
+        preprocessed_task.model_hashes = {}
+    model_hash = preprocessed_task.model_hashes.get(task.id, None)
+    if model_hash is None:
+        with open(model.source, 'rb') as file:
+            model_hash = preprocessed_task.model_hashes[task.id] = hashlib.sha256(file.read()).hexdigest()
+    change_target_tellurium_id_map = preprocessed_task.model_change_target_tellurium_id_maps[task.id]
+
+    key = (
+        model_hash,
+        tuple((change_target_tellurium_id_map[(change.model, change.target, change.symbol)], str(change.new_value))
+              for change in model.changes),
+        tuple((preprocessed_task.initial_values or {}).get(task.id, {}).items()),
+        sim.__class__.__name__,
+        tuple(getattr(sim, attr, None) for attr in ['initial_time', 'output_start_time', 'output_end_time', 'number_of_steps']),
+        solver_configuration,
+        tuple(preprocessed_task.selections[task.id]),
+        get_simulation_chunk_size(preprocessed_task, simulator_config),
+        tuple(simulator_config.steady_state_solver_fallbacks) if isinstance(sim, SteadyStateSimulation) else None,
+        roadrunner.__version__,
+    )
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
 def reset_all_models(preprocessed_task):
-    for taskid in preprocessed_task.road_runners:
-        preprocessed_task.road_runners[taskid].resetAll()
+    preprocessed_task.road_runners.reset_all()
+
 
+def get_task_road_runner(preprocessed_task, task_id):
+    """ Get the RoadRunner instance for a task. If the instance is shared with other tasks and is currently configured
+    for another task, select the solver and selections of the task and reset the state of the instance.
 
-def preprocess_sed_task(task, variables, config=None, simulator_config=None):
+    Args:
+        preprocessed_task (:obj:`PreprocesssedTask`): preprocessed information about a task
+        task_id (:obj:`str`): id of the task
+
+    Returns:
+        :obj:`roadrunner.RoadRunner`: RoadRunner instance configured for the task
+    """
+    slot = preprocessed_task.road_runners.slots[task_id]
+    road_runner = preprocessed_task.road_runners.get_slot(slot)
+    solver_configuration = preprocessed_task.solver_configurations[task_id]
+
+    if preprocessed_task.active_task_ids.get(slot, task_id) != task_id:
+        solver_configuration.apply(road_runner)
+        road_runner.timeCourseSelections = preprocessed_task.selections[task_id]
+        road_runner.steadyStateSelections = preprocessed_task.selections[task_id]
+        road_runner.reset()
+    preprocessed_task.active_task_ids[slot] = task_id
+
+    # the instance may have been restored since the solver was last retrieved. Integrators which RoadRunner doesn't
+    # implement are kept by the preprocessed task, so that their random number generators are only seeded once.
+    solver = solver_configuration.get_solver(road_runner)
+    if solver is not None:
+        preprocessed_task.solvers[task_id] = solver
+
+    return road_runner
+
+
+def preprocess_sed_task(task, variables, config=None, simulator_config=None, in_memory_model_changes=None):
     """ Preprocess a SED task, including its possible model changes and variables. This is useful for avoiding
     repeatedly initializing tasks on repeated calls of :obj:`exec_sed_task`.
 
@@ -380,6 +1002,9 @@ def preprocess_sed_task(task, variables, config=None, simulator_config=None):
         variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
         config (:obj:`Config`, optional): BioSimulators common configuration
         simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+        in_memory_model_changes (:obj:`dict`, optional): dictionary that maps the ids of models to changes which should be
+            applied to the initial values of their compiled models rather than to their XML (see
+            :obj:`plan_in_memory_model_changes`)
 
     Returns:
         :obj:`PreprocessedTask`: preprocessed information about the task
@@ -397,119 +1022,75 @@ def preprocess_sed_task(task, variables, config=None, simulator_config=None):
     alltasks = get_all_tasks_from_task(task)
     alltaskchanges = get_all_task_changes_from_task(task)
 
-    if config.VALIDATE_SEDML:
-        for subtask in alltasks:
-            model = subtask.model
-            sim = subtask.simulation
-            raise_errors_warnings(validation.validate_task(subtask),
-                                  error_summary='Task `{}` is invalid.'.format(task.id))
-            raise_errors_warnings(validation.validate_model_language(model.language, ModelLanguage.SBML),
-                                  error_summary='Language for model `{}` is not supported.'.format(model.id))
-            raise_errors_warnings(*validation.validate_model_changes(subtask.model),
-                                  error_summary='Changes for model `{}` are invalid.'.format(model.id))
-            raise_errors_warnings(validation.validate_simulation_type(sim, (SteadyStateSimulation, UniformTimeCourseSimulation)),
-                                  error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
-            raise_errors_warnings(*validation.validate_simulation(sim),
-                                  error_summary='Simulation `{}` is invalid.'.format(sim.id))
-            raise_errors_warnings(*validation.validate_data_generator_variables(variables),
-                                  error_summary='Data generator variables for task `{}` are invalid.'.format(subtask.id))
+    validate_sed_task(task, variables, config=config, simulator_config=simulator_config)
 
-    allroadrunners = {}
+    algorithm_substitution_policy = get_algorithm_substitution_policy(config=config)
+
+    deadline = simulator_config.deadline
+    if simulator_config.task_time_limit:
+        task_deadline = time.monotonic() + simulator_config.task_time_limit
+        deadline = task_deadline if deadline is None else min(deadline, task_deadline)
+
+    allroadrunners = RoadRunnerPool(max_resident=simulator_config.max_resident_models)
     model_change_target_tellurium_id_maps = {}
     exec_alg_kisao_ids = {}
     variable_target_tellurium_observable_maps = {}
     solvers = {}
-    for subtasks in alltasks:
+    solver_configurations = {}
+    selections = {}
+    active_task_ids = {}
+    simulation_reset_methods = {}
+    value_reset_methods = {}
+    initial_values = {}
+    for subtask in alltasks:
         model = subtask.model
+        model_in_memory_changes = (in_memory_model_changes or {}).get(model.id, [])
         allchanges = model.changes + list(alltaskchanges)
         sim = subtask.simulation
         model_etree = lxml.etree.parse(model.source)
 
-        if config.VALIDATE_SEDML_MODELS:
-            raise_errors_warnings(*validation.validate_model(model, [], working_dir='.'),
-                                  error_summary='Model `{}` is invalid.'.format(model.id),
-                                  warning_summary='Model `{}` may be invalid.'.format(model.id))
-
         # read model
-        road_runner = roadrunner.RoadRunner()
-        road_runner = roadrunner.RoadRunner(road_runner.getParamPromotedSBML(model.source))
+        if simulator_config.share_models:
+            # models with changes which have not been applied to their XML are only shared by the tasks which use them
+            slot = (model.source, id(model) if model.changes or model_in_memory_changes else None)
+        else:
+            slot = subtask.id
+        if allroadrunners.has_slot(slot):
+            allroadrunners.add(subtask.id, slot)
+        else:
+            allroadrunners.add(subtask.id, slot, load_road_runner(model.source, simulator_config=simulator_config))
+        road_runner = allroadrunners[subtask.id]
 
         # get algorithm to execute
-        algorithm_substitution_policy = get_algorithm_substitution_policy(config=config)
-        exec_alg_kisao_id = get_preferred_substitute_algorithm_by_ids(
-            sim.algorithm.kisao_id, KISAO_ALGORITHM_MAP.keys(),
-            substitution_policy=algorithm_substitution_policy)
-        alg_props = KISAO_ALGORITHM_MAP[exec_alg_kisao_id]
-
-        if alg_props['id'] == 'nleq2':
-            solver = road_runner.getSteadyStateSolver()
-            if config.VALIDATE_SEDML:
-                raise_errors_warnings(validation.validate_simulation_type(sim, (SteadyStateSimulation,)),
-                                      error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
-
-        else:
-            road_runner.setIntegrator(alg_props['id'])
-            solver = road_runner.getIntegrator()
-            if config.VALIDATE_SEDML:
-                raise_errors_warnings(validation.validate_simulation_type(sim, (UniformTimeCourseSimulation,)),
-                                      error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
-
-        # set the parameters of the solver
-        for change in sim.algorithm.changes:
-            param_props = alg_props['parameters'].get(change.kisao_id, None)
-            if not config.VALIDATE_SEDML or param_props:
-                if not config.VALIDATE_SEDML or validate_str_value(change.new_value, param_props['type']):
-                    new_value = parse_value(change.new_value, param_props['type'])
-                    att = param_props['id']
-                    if "roadrunner_attribute" in param_props:
-                        att = param_props['roadrunner_attribute']
-                    setattr(solver, att, new_value)
+        exec_alg_kisao_id = get_algorithm_substitution(sim.algorithm.kisao_id, algorithm_substitution_policy)
+        alg_schema = KISAO_ALGORITHM_SCHEMAS[exec_alg_kisao_id]
 
-                else:
-                    if (
-                        exec_alg_kisao_id == sim.algorithm.kisao_id and
-                        ALGORITHM_SUBSTITUTION_POLICY_LEVELS[algorithm_substitution_policy]
-                        <= ALGORITHM_SUBSTITUTION_POLICY_LEVELS[AlgorithmSubstitutionPolicy.NONE]
-                    ):
-                        msg = "'{}' is not a valid {} value for parameter {}".format(
-                            change.new_value, param_props['type'].name, change.kisao_id)
-                        raise ValueError(msg)
-                    else:
-                        msg = "'{}' was ignored because it is not a valid {} value for parameter {}".format(
-                            change.new_value, param_props['type'].name, change.kisao_id)
-                        warn(msg, BioSimulatorsWarning)
+        if config.VALIDATE_SEDML:
+            sim_type = SteadyStateSimulation if alg_schema.steady_state else UniformTimeCourseSimulation
+            raise_errors_warnings(validation.validate_simulation_type(sim, (sim_type,)),
+                                  error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
 
-            else:
-                if (
-                    exec_alg_kisao_id == sim.algorithm.kisao_id and
-                    ALGORITHM_SUBSTITUTION_POLICY_LEVELS[algorithm_substitution_policy]
-                    <= ALGORITHM_SUBSTITUTION_POLICY_LEVELS[AlgorithmSubstitutionPolicy.NONE]
-                ):
-                    msg = "".join([
-                        "Algorithm parameter with KiSAO id '{}' is not supported. ".format(change.kisao_id),
-                        "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
-                            '{}: {} ({})'.format(kisao_id, param_props['id'], param_props['name'])
-                            for kisao_id, param_props in alg_props['parameters'].items())),
-                    ])
-                    raise NotImplementedError(msg)
-                else:
-                    msg = "".join([
-                        "Algorithm parameter with KiSAO id '{}' was ignored because it is not supported. ".format(change.kisao_id),
-                        "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
-                            '{}: {} ({})'.format(kisao_id, param_props['id'], param_props['name'])
-                            for kisao_id, param_props in alg_props['parameters'].items())),
-                    ])
-                    warn(msg, BioSimulatorsWarning)
+        # configure the solver
+        solver_configuration = get_solver_configuration(sim.algorithm, exec_alg_kisao_id, algorithm_substitution_policy,
+                                                        config=config)
+        solver = solver_configuration.apply(road_runner)
 
         # validate model changes and build map
         if isinstance(subtask, RepeatedTask):
             allchanges = allchanges + subtask.changes
+        local_parameter_tellurium_id_map = get_local_parameter_tellurium_id_map(model_etree, road_runner.model)
+        subtask_initial_values = get_in_memory_initial_values(model_etree, model_in_memory_changes, model.id,
+                                                              local_parameter_tellurium_id_map)
+        if subtask_initial_values:
+            allroadrunners.set_initial_values(subtask.id, subtask_initial_values)
         model_change_target_tellurium_id_map = get_model_change_target_tellurium_change_map(
-            model_etree, allchanges, exec_alg_kisao_id, road_runner.model, model.id)
+            model_etree, allchanges, exec_alg_kisao_id, road_runner.model, model.id,
+            local_parameter_tellurium_id_map=local_parameter_tellurium_id_map)
 
         # validate variables and build map
         variable_target_tellurium_observable_map = get_variable_target_tellurium_observable_map(
-            model_etree, sim, exec_alg_kisao_id, variables, road_runner.model, model.id)
+            model_etree, sim, exec_alg_kisao_id, variables, road_runner.model, model.id,
+            local_parameter_tellurium_id_map=local_parameter_tellurium_id_map)
 
         variable_tellurium_observable_ids = []
         for variable in variables:
@@ -518,12 +1099,23 @@ def preprocess_sed_task(task, variables, config=None, simulator_config=None):
 
         road_runner.timeCourseSelections = variable_tellurium_observable_ids
         road_runner.steadyStateSelections = variable_tellurium_observable_ids
+
+        # determine how to undo simulations and changes
+        simulation_reset_method, value_reset_method_map = get_reset_methods(
+            model_etree, road_runner.model,
+            list(model_change_target_tellurium_id_map.values()) + list(variable_target_tellurium_observable_map.values()))
+
         # Add the variables to the dictionaries:
-        allroadrunners[subtask.id] = road_runner
         model_change_target_tellurium_id_maps[subtask.id] = model_change_target_tellurium_id_map
         exec_alg_kisao_ids[subtask.id] = exec_alg_kisao_id
         variable_target_tellurium_observable_maps[subtask.id] = variable_target_tellurium_observable_map
         solvers[subtask.id] = solver
+        solver_configurations[subtask.id] = solver_configuration
+        selections[subtask.id] = variable_tellurium_observable_ids
+        active_task_ids[slot] = subtask.id
+        simulation_reset_methods[subtask.id] = simulation_reset_method
+        value_reset_methods[subtask.id] = value_reset_method_map
+        initial_values[subtask.id] = subtask_initial_values
 
     # return preprocssed information about the task
     return PreprocesssedTask(
@@ -532,9 +1124,60 @@ def preprocess_sed_task(task, variables, config=None, simulator_config=None):
         model_change_target_tellurium_id_maps=model_change_target_tellurium_id_maps,
         algorithm_kisao_ids=exec_alg_kisao_ids,
         variable_target_tellurium_observable_maps=variable_target_tellurium_observable_maps,
+        solver_configurations=solver_configurations,
+        selections=selections,
+        active_task_ids=active_task_ids,
+        simulation_reset_methods=simulation_reset_methods,
+        value_reset_methods=value_reset_methods,
+        initial_values=initial_values,
+        deadline=deadline,
+        solver_statistics={},
+        model_hashes={},
     )
 
 
+def validate_sed_task(task, variables, config=None, simulator_config=None):
+    """ Validate a SED task, its sub-tasks, and their models, changes, simulations and variables, without compiling the
+    models. These checks don't depend on the SED-ML interpreter.
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Raises:
+        :obj:`ValueError`: if the task or an aspect of the task is not valid
+    """
+    if not config:
+        config = get_config()
+
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    for subtask in get_all_tasks_from_task(task):
+        model = subtask.model
+        sim = subtask.simulation
+
+        if config.VALIDATE_SEDML:
+            error_summaries = [
+                lambda: 'Task `{}` is invalid.'.format(task.id),
+                lambda: 'Language for model `{}` is not supported.'.format(model.id),
+                lambda: 'Changes for model `{}` are invalid.'.format(model.id),
+                lambda: '{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id),
+                lambda: 'Simulation `{}` is invalid.'.format(sim.id),
+                lambda: 'Data generator variables for task `{}` are invalid.'.format(subtask.id),
+            ]
+            for (errors, warns), error_summary in zip(validate_sed_task_elements(subtask, variables, simulator_config),
+                                                      error_summaries):
+                raise_errors_warnings(errors, warns, error_summary=error_summary())
+
+        if config.VALIDATE_SEDML_MODELS:
+            raise_errors_warnings(*validate_model_with_cache(model, simulator_config),
+                                  error_summary='Model `{}` is invalid.'.format(model.id),
+                                  warning_summary='Model `{}` may be invalid.'.format(model.id))
+
+
 def get_model_variable_value(model, variable, preprocessed_task):
     if preprocessed_task is None:
         raise ValueError("Tellurium cannot obtain a model value without a working preprocessed_task.")
@@ -555,24 +1198,109 @@ def set_model_variable_value(model, target, symbol, value, preprocessed_task):
         submap = preprocessed_task.variable_target_tellurium_observable_maps[taskid]
         if (model.id, target, symbol) in submap:
             tellurium_id = submap[(model.id, target, symbol)]
-            preprocessed_task.road_runners[taskid][tellurium_id] = value
+            preprocessed_task.road_runners.set_value(taskid, tellurium_id, value,
+                                                     get_value_reset_method(taskid, tellurium_id, preprocessed_task))
             success = True
     if not success:
         for taskid in preprocessed_task.model_change_target_tellurium_id_maps:
             submap = preprocessed_task.model_change_target_tellurium_id_maps[taskid]
             if (model.id, target, symbol) in submap:
                 tellurium_id = submap[(model.id, target, symbol)]
-                preprocessed_task.road_runners[taskid][tellurium_id] = value
+                preprocessed_task.road_runners.set_value(taskid, tellurium_id, value,
+                                                         get_value_reset_method(taskid, tellurium_id, preprocessed_task))
                 success = True
     if not success:
         if "reaction[" in target and "kineticLaw/" in target:
             raise NotImplementedError("Unable to process a change to model '" + model.id + "' with the target "
-                                      + target + " because changing local parameters is not yet implemented.")
+                                      + target + " because the global parameter which the local parameter was promoted "
+                                      + "to could not be determined.")
         raise ValueError("No stored variable with target '" + target + "' and symbol '" +
                          str(symbol if symbol else '') + "' in model " + model.id)
 
 
-def get_model_change_target_tellurium_change_map(model_etree, changes, alg_kisao_id, model, model_id):
+def get_local_parameter_tellurium_id_map(model_etree, model):
+    """ Get a mapping from the local parameters of the kinetic laws of an SBML model to the ids of the global parameters
+    which :obj:`load_road_runner` promoted them to. Promoted parameters are usually named ``{reaction id}_{parameter id}``,
+    but their names are suffixed when they collide with the ids of other components. Promoted parameters are appended
+    to the global parameters in the order of the local parameters.
+
+    Args:
+        model_etree (:obj:`lxml.etree._ElementTree`): element tree for model
+        model (:obj:`roadrunner.roadrunner.ExecutableModel`): model compiled with its local parameters promoted
+
+    Returns:
+        :obj:`dict`: dictionary that maps tuples of the ids of reactions and their local parameters to the ids of the
+        global parameters which they were promoted to
+    """
+    local_parameter_ids = []
+    for reaction in model_etree.xpath('/*[local-name()="sbml"]/*[local-name()="model"]'
+                                      '/*[local-name()="listOfReactions"]/*[local-name()="reaction"]'):
+        for parameter in reaction.xpath('*[local-name()="kineticLaw"]'
+                                        '/*[local-name()="listOfParameters" or local-name()="listOfLocalParameters"]'
+                                        '/*[local-name()="parameter" or local-name()="localParameter"]'):
+            local_parameter_ids.append((reaction.get('id'), parameter.get('id')))
+
+    if not local_parameter_ids:
+        return {}
+
+    global_parameter_ids = set(model_etree.xpath('/*[local-name()="sbml"]/*[local-name()="model"]'
+                                                 '/*[local-name()="listOfParameters"]/*[local-name()="parameter"]/@id'))
+    promoted_ids = [id for id in model.getGlobalParameterIds() if id not in global_parameter_ids]
+    if len(promoted_ids) != len(local_parameter_ids) or any(
+            not promoted_id.startswith(reaction_id + '_' + parameter_id)
+            for (reaction_id, parameter_id), promoted_id in zip(local_parameter_ids, promoted_ids)):
+        return {}
+
+    return dict(zip(local_parameter_ids, promoted_ids))
+
+
+def get_local_parameter_tellurium_id(model_etree, target, local_parameter_tellurium_id_map):
+    """ Get the id of the global parameter which the local parameter targeted by a model change or variable was promoted to
+
+    Args:
+        model_etree (:obj:`lxml.etree._ElementTree`): element tree for model
+        target (:obj:`TargetGroupMixin`): model change or variable
+        local_parameter_tellurium_id_map (:obj:`dict`): dictionary that maps tuples of the ids of reactions and their local
+            parameters to the ids of the global parameters which they were promoted to
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`bool`: whether the target is a local parameter
+            * :obj:`str`: id of the promoted global parameter, or :obj:`None` if the target isn't a local parameter or its
+              promoted parameter is unknown
+
+    Raises:
+        :obj:`ValueError`: if the target doesn't match a single element of the model
+    """
+    if 'kineticLaw' not in target.target:
+        return False, None
+
+    x_path = target.target
+    if '/@' in x_path:
+        x_path, _, _ = x_path.rpartition('/@')
+    try:
+        elements = model_etree.xpath(x_path, namespaces=get_namespaces_with_prefixes(target.target_namespaces))
+    except lxml.etree.XPathError as exception:
+        raise ValueError('Target `{}` of `{}` is not a valid XPath: {}'.format(target.target, target.id, str(exception)))
+    if len(elements) != 1 or not isinstance(elements[0], lxml.etree._Element):
+        raise ValueError('Target `{}` of `{}` must match a single element of the model, not {}'.format(
+            target.target, target.id, len(elements) if isinstance(elements, list) else 'a value'))
+
+    element = elements[0]
+    kinetic_law = element.getparent().getparent() if element.getparent() is not None else None
+    if (
+        lxml.etree.QName(element).localname not in ['parameter', 'localParameter']
+        or kinetic_law is None
+        or lxml.etree.QName(kinetic_law).localname != 'kineticLaw'
+    ):
+        return False, None
+
+    return True, local_parameter_tellurium_id_map.get((kinetic_law.getparent().get('id'), element.get('id')), None)
+
+
+def get_model_change_target_tellurium_change_map(model_etree, changes, alg_kisao_id, model, model_id,
+                                                 local_parameter_tellurium_id_map=None):
     """ Get a mapping from XML XPath targets for model changes to tellurium identifiers for model changes
 
     Args:
@@ -580,11 +1308,16 @@ def get_model_change_target_tellurium_change_map(model_etree, changes, alg_kisao
         changes (:obj:`list` of :obj:`ModelChange`): list of model changes
         alg_kisao_id (:obj:`str`): algorithm KiSAO id
         model (:obj:`roadrunner.roadrunner.ExecutableModel`): model
+        local_parameter_tellurium_id_map (:obj:`dict`, optional): dictionary that maps tuples of the ids of reactions and
+            their local parameters to the ids of the global parameters which they were promoted to (see
+            :obj:`get_local_parameter_tellurium_id_map`)
 
     Returns:
         :obj:`dict`: dictionary that maps the targets of changes to their corresponding tellurium identifiers
     """
     change_targets_to_sbml_ids = validation.validate_target_xpaths(changes, model_etree, attr='id', separator="_")
+    if local_parameter_tellurium_id_map is None:
+        local_parameter_tellurium_id_map = get_local_parameter_tellurium_id_map(model_etree, model)
 
     species_ids = model.getFloatingSpeciesIds() + model.getBoundarySpeciesIds()
     component_ids = species_ids + model.getGlobalParameterIds() + model.getCompartmentIds()
@@ -606,7 +1339,12 @@ def get_model_change_target_tellurium_change_map(model_etree, changes, alg_kisao
 
         sbml_id = change_targets_to_sbml_ids[change.target]
 
-        if alg_kisao_id == 'KISAO_0000029' and sbml_id in species_ids:
+        is_local_parameter, local_parameter_id = get_local_parameter_tellurium_id(
+            model_etree, change, local_parameter_tellurium_id_map)
+        if is_local_parameter:
+            if local_parameter_id is not None:
+                target_tellurium_id_map[(model_id, change.target, change.symbol)] = local_parameter_id
+        elif KISAO_ALGORITHM_SCHEMAS[alg_kisao_id].stochastic and sbml_id in species_ids:
             target_tellurium_id_map[(model_id, change.target, change.symbol)] = '[' + sbml_id + ']'
         elif sbml_id in component_ids:
             target_tellurium_id_map[(model_id, change.target, change.symbol)] = sbml_id
@@ -614,7 +1352,8 @@ def get_model_change_target_tellurium_change_map(model_etree, changes, alg_kisao
     return target_tellurium_id_map
 
 
-def get_variable_target_tellurium_observable_map(model_etree, simulation, alg_kisao_id, variables, model, model_id):
+def get_variable_target_tellurium_observable_map(model_etree, simulation, alg_kisao_id, variables, model, model_id,
+                                                 local_parameter_tellurium_id_map=None):
     """ Get a mapping from XML XPath targets for variables of data generators to their corresponding tellurium identifiers
 
     Args:
@@ -623,11 +1362,16 @@ def get_variable_target_tellurium_observable_map(model_etree, simulation, alg_ki
         alg_kisao_id (:obj:`str`): algorithm KiSAO id
         variables (:obj:`list` of :obj:`Variable`): list of variables
         model (:obj:`roadrunner.roadrunner.ExecutableModel`): model
+        local_parameter_tellurium_id_map (:obj:`dict`, optional): dictionary that maps tuples of the ids of reactions and
+            their local parameters to the ids of the global parameters which they were promoted to (see
+            :obj:`get_local_parameter_tellurium_id_map`)
 
     Returns:
         :obj:`dict`: dictionary that maps tuples of variable targets and symbols to their corresponding tellurium identifiers
     """
     variable_targets_to_sbml_ids = validation.validate_target_xpaths(variables, model_etree, attr='id')
+    if local_parameter_tellurium_id_map is None:
+        local_parameter_tellurium_id_map = get_local_parameter_tellurium_id_map(model_etree, model)
 
     all_sbml_ids = model.getAllTimeCourseComponentIds()
     species_sbml_ids = model.getBoundarySpeciesIds() + model.getFloatingSpeciesIds()
@@ -646,9 +1390,13 @@ def get_variable_target_tellurium_observable_map(model_etree, simulation, alg_ki
 
         else:
             sbml_id = variable_targets_to_sbml_ids.get(variable.target, None)
+            is_local_parameter, local_parameter_id = get_local_parameter_tellurium_id(
+                model_etree, variable, local_parameter_tellurium_id_map)
+            if is_local_parameter:
+                sbml_id = local_parameter_id
 
             if sbml_id in all_sbml_ids:
-                if alg_kisao_id != 'KISAO_0000029' and sbml_id in species_sbml_ids:
+                if not KISAO_ALGORITHM_SCHEMAS[alg_kisao_id].stochastic and sbml_id in species_sbml_ids:
                     target_tellurium_observable_map[(model_id, variable.target, variable.symbol)] = '[' + sbml_id + ']'
                 else:
                     target_tellurium_observable_map[(model_id, variable.target, variable.symbol)] = sbml_id
@@ -689,6 +1437,191 @@ def get_variable_target_tellurium_observable_map(model_etree, simulation, alg_ki
     return target_tellurium_observable_map
 
 
+def get_tellurium_sedml_code(doc, sedml, working_dir, out_dir, plot_format, simulator_config=None):
+    """ Get the compiled Python code which tellurium generates to execute a SED-ML document and save its outputs
+
+    The code reads the working and output directories from the global variables ``__working_dir__`` and
+    ``__output_dir__`` so that it can be reused for the same SED-ML document and models in other directories. Code is
+    cached (up to ``simulator_config.code_cache_size`` SED documents) by the contents of the SED-ML document, its
+    models and data description files, and the plot format.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document which the SED-ML encodes
+        sedml (:obj:`str`): SED-ML document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        out_dir (:obj:`str`): directory where tellurium should save the outputs of the SED document
+        plot_format (:obj:`str`): format for plots (e.g., ``pdf``)
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`types.CodeType`: compiled code
+
+    Raises:
+        :obj:`ValueError`: if the working or output directory of the code generated by tellurium could not be
+            replaced with the global variables
+    """
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    key = None
+    if simulator_config.code_cache_size:
+        sedml_hash = hashlib.sha256(sedml.encode()).hexdigest()
+
+        source_hashes = []
+        for model_or_data_description in itertools.chain(doc.models, getattr(doc, 'data_descriptions', None) or []):
+            source_filename = os.path.join(working_dir, model_or_data_description.source)
+            if os.path.isfile(source_filename):
+                with open(source_filename, 'rb') as file:
+                    source_hashes.append(hashlib.sha256(file.read()).hexdigest())
+            else:
+                source_hashes.append(model_or_data_description.source)
+
+        key = (sedml_hash, tuple(source_hashes), plot_format)
+        code = _TELLURIUM_CODE_CACHE.get(key, None)
+        if code is not None:
+            _TELLURIUM_CODE_CACHE.move_to_end(key)
+            return code
+
+    factory = SEDMLCodeFactory(sedml,
+                               workingDir=working_dir,
+                               createOutputs=True,
+                               saveOutputs=True,
+                               outputDir=out_dir,
+                               )
+    factory.reportFormat = 'csv'
+    factory.plotFormat = plot_format
+    source = factory.toPython()
+
+    # read the working and output directories from global variables
+    working_dir_code = "workingDir = r'{}'".format(factory.workingDir)
+    if source.count(working_dir_code) == 0:
+        raise ValueError('The working directory of the code generated by tellurium could not be replaced')
+    source = source.replace(working_dir_code, "workingDir = __working_dir__")
+
+    out_dir_code = "os.path.join('{}', ".format(out_dir)
+    if source.count(out_dir_code) == 0 and doc.outputs:
+        raise ValueError('The output directory of the code generated by tellurium could not be replaced')
+    source = source.replace(out_dir_code, "os.path.join(__output_dir__, ")
+
+    code = compile(source, os.path.join(tempfile.gettempdir(), 'te-generated-sedml.py'), 'exec')
+
+    if key is not None:
+        _TELLURIUM_CODE_CACHE[key] = code
+        while len(_TELLURIUM_CODE_CACHE) > simulator_config.code_cache_size:
+            _TELLURIUM_CODE_CACHE.popitem(last=False)
+
+    return code
+
+
+class ReportBatchWriter(ReportWriter):
+    """ Writer which keeps each HDF5 file open until all of the reports of a SED document have been saved, rather than
+    reopening the file for each report
+
+    Reports are saved to HDF5 files as by :obj:`ReportWriter`, in chunked data sets with a configurable compression
+    filter. Reports in other formats are saved by :obj:`ReportWriter`.
+
+    Attributes:
+        h5_compression (:obj:`str`): compression filter for reports saved in HDF5 format (``gzip``, ``lzf`` or ``none``)
+    """
+
+    def __init__(self, h5_compression='gzip'):
+        """
+        Args:
+            h5_compression (:obj:`str`, optional): compression filter for reports saved in HDF5 format (``gzip``, ``lzf``
+                or ``none``)
+        """
+        self.h5_compression = h5_compression
+        self._h5_files = {}
+
+    def run(self, report, results, base_path, rel_path, format=ReportFormat.h5, type=Report):
+        """ Save a report
+
+        Args:
+            report (:obj:`Report`): report
+            results (:obj:`DataSetResults`): results of the data sets
+            base_path (:obj:`str`): path to save results
+            rel_path (:obj:`str`): path to save results relative to :obj:`base_path`
+            format (:obj:`ReportFormat`, optional): report format
+            type (:obj:`type`): type of output (e.g., subclass of :obj:`Output` such as :obj:`Report`, :obj:`Plot2D`)
+        """
+        if format == ReportFormat.h5:
+            self._write_h5(report, results, base_path, rel_path, type=type)
+        else:
+            super(ReportBatchWriter, self).run(report, results, base_path, rel_path, format=format, type=type)
+
+    def close(self):
+        """ Close the HDF5 files """
+        try:
+            for h5_file in self._h5_files.values():
+                h5_file.close()
+        finally:
+            self._h5_files = {}
+
+    def _write_h5(self, report, results, base_path, rel_path, type=Report):
+        filename = os.path.join(base_path, get_config().H5_REPORTS_PATH)
+        h5_file = self._h5_files.get(filename, None)
+        if h5_file is None:
+            if not os.path.isdir(base_path):
+                os.makedirs(base_path)
+            h5_file = self._h5_files[filename] = h5py.File(filename, 'a')
+
+        rel_path = '/'.join(rel_path.split(os.path.sep))
+
+        results_array = []
+        data_set_ids = []
+        data_set_labels = []
+        data_set_names = []
+        data_set_data_types = []
+        data_set_shapes = []
+        for data_set in report.data_sets:
+            if data_set.id in results:
+                data_set_result = results[data_set.id]
+                results_array.append(data_set_result)
+                data_set_ids.append(data_set.id)
+                data_set_labels.append(data_set.label)
+                data_set_names.append(data_set.name or '')
+                if data_set_result is None:
+                    data_set_data_types.append('__None__')
+                    data_set_shapes.append('')
+                else:
+                    data_set_dtype = data_set_result.dtype
+                    if data_set_dtype in [numpy.dtype('object'), numpy.dtype('void'), numpy.dtype('S'), numpy.dtype('a')]:
+                        msg = 'NumPy dtype should be a specific type such as `float64` or `int64` not `{}`.'.format(data_set_dtype.name)
+                        raise TypeError(msg)
+                    data_set_data_types.append(data_set_dtype.name)
+                    data_set_shapes.append(','.join(str(dim_len) for dim_len in data_set_result.shape))
+        results_array = numpy.array(pad_arrays_to_consistent_shapes(results_array))
+
+        if rel_path in h5_file:
+            del h5_file[rel_path]
+
+        if self.h5_compression == 'gzip':
+            compression_kwargs = {'compression': 'gzip', 'compression_opts': 9}
+        elif self.h5_compression == 'lzf':
+            compression_kwargs = {'compression': 'lzf'}
+        else:
+            compression_kwargs = {}
+        data_set = h5_file.create_dataset(rel_path, data=results_array, chunks=True, **compression_kwargs)
+        data_set.attrs['_type'] = Hdf5DataSetType(type).name
+        if report.id:
+            data_set.attrs['uri'] = rel_path
+            data_set.attrs['sedmlId'] = report.id
+        if report.name:
+            data_set.attrs['sedmlName'] = report.name
+        data_set.attrs['sedmlDataSetIds'] = data_set_ids
+        data_set.attrs['sedmlDataSetNames'] = data_set_names
+        data_set.attrs['sedmlDataSetLabels'] = data_set_labels
+        data_set.attrs['sedmlDataSetDataTypes'] = data_set_data_types
+        data_set.attrs['sedmlDataSetShapes'] = data_set_shapes
+
+        group_ids = rel_path.split('/')[0:-1]
+        for i_group in range(len(group_ids)):
+            uri = '/'.join(group_ids[0:i_group + 1])
+            group = h5_file[uri]
+            group.attrs['uri'] = uri
+            group.attrs['combineArchiveLocation'] = uri
+
+
 def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=None,
                                 apply_xml_model_changes=True,
                                 log=None, indent=0, pretty_print_modified_xml_models=False,
@@ -738,11 +1671,22 @@ def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=No
     # Create a temporary for tellurium's outputs
     # - Reports: CSV (Rows: time, Columns: data sets)
     # - Plots: PDF
-    tmp_out_dir = tempfile.mkdtemp()
+    tmp_out_dir = tempfile.mkdtemp(dir=simulator_config.scratch_dir)
 
-    # add a report for each plot to make tellurium output the data for each plot
+    # Determine the outputs for tellurium to generate
+    # - Plots are only rendered if visualization formats are requested
+    # - A report is added for each plot to make tellurium output the data for each plot, unless the data for plots is not saved
+    viz_formats = [VizFormat(format_value) for format_value in config.VIZ_FORMATS]
+    tellurium_doc = copy.copy(doc)
+    tellurium_doc.outputs = [output for output in doc.outputs
+                             if viz_formats or not isinstance(output, (Plot2D, Plot3D))]
     for output in doc.outputs:
         if isinstance(output, (Plot2D, Plot3D)):
+            if not simulator_config.save_plot_data:
+                if not viz_formats and config.LOG:
+                    log.outputs[output.id].status = Status.SKIPPED
+                continue
+
             report = Report(
                 id='__plot__' + output.id,
                 name=output.name)
@@ -768,8 +1712,6 @@ def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=No
                     data_generators[curve.y_data_generator.id] = curve.y_data_generator
                     labels[curve.y_data_generator.id] = curve.name or curve.y_data_generator.name or curve.y_data_generator.id
 
-            # print("LS DEBUG:  Labels are " + str(labels))
-
             for data_generator in data_generators.values():
                 report.data_sets.append(DataSet(
                     id='__data_set__{}_{}'.format(output.id, data_generator.id),
@@ -779,25 +1721,22 @@ def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=No
                 ))
 
             report.data_sets.sort(key=lambda data_set: data_set.id)
-            doc.outputs.append(report)
+            tellurium_doc.outputs.append(report)
 
-    filename_with_reports_for_plots = os.path.join(tmp_out_dir, 'simulation.sedml')
-    SedmlSimulationWriter().run(doc, filename_with_reports_for_plots, validate_models_with_languages=False)
+    # Only simulate the data needed for the reports if no plots are rendered
+    if not viz_formats:
+        tellurium_doc.data_generators = get_data_generators_for_outputs(tellurium_doc)
+        tellurium_doc.tasks = get_tasks_for_data_generators(tellurium_doc)
+
+    sedml_with_reports_for_plots = write_sed_doc_to_string(tellurium_doc)
 
     # Use tellurium to execute the SED document and generate the specified outputs
-    viz_formats = [VizFormat(format_value) for format_value in config.VIZ_FORMATS]
     with StandardOutputErrorCapturer(relay=False, level=log_level, disabled=not config.LOG) as captured:
         try:
-            factory = SEDMLCodeFactory(filename_with_reports_for_plots,
-                                       workingDir=working_dir,
-                                       createOutputs=True,
-                                       saveOutputs=True,
-                                       outputDir=tmp_out_dir,
-                                       )
             for viz_format in (viz_formats or [VizFormat.pdf]):
-                factory.reportFormat = 'csv'
-                factory.plotFormat = viz_format.value
-                factory.executePython()
+                code = get_tellurium_sedml_code(tellurium_doc, sedml_with_reports_for_plots, working_dir, tmp_out_dir,
+                                                viz_format.value, simulator_config=simulator_config)
+                exec(code, {'__working_dir__': working_dir, '__output_dir__': tmp_out_dir})
 
             if config.LOG:
                 log.output = captured.get_text()
@@ -823,49 +1762,74 @@ def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=No
     else:
         report_results = None
 
-    for report_filename in glob.glob(os.path.join(tmp_out_dir, '*.csv')):
-        report_id = os.path.splitext(os.path.basename(report_filename))[0]
-        is_plot = report_id.startswith('__plot__')
-        if is_plot:
-            output_id = report_id[len('__plot__'):]
-        else:
-            output_id = report_id
+    report_writer = ReportBatchWriter(h5_compression=simulator_config.h5_compression)
+    output_durations = {}
+    try:
+        for report_filename in glob.glob(os.path.join(tmp_out_dir, '*.csv')):
+            report_id = os.path.splitext(os.path.basename(report_filename))[0]
+            is_plot = report_id.startswith('__plot__')
+            if is_plot:
+                output_id = report_id[len('__plot__'):]
+            else:
+                output_id = report_id
 
-        if config.LOG:
-            log.outputs[output_id].status = Status.RUNNING
-            log.export()
-            output_start_time = datetime.datetime.now()
+            if config.LOG:
+                log.outputs[output_id].status = Status.RUNNING
+                log.export()
+                output_start_time = datetime.datetime.now()
 
-        # read report from CSV file produced by tellurium
-        data_set_df = pandas.read_csv(report_filename).transpose()
+            # read report from CSV file produced by tellurium
+            data_set_df = pandas.read_csv(report_filename).transpose()
 
-        # create pseudo-report for ReportWriter
-        output = next(output for output in doc.outputs if output.id == report_id)
-        if is_plot:
-            output.id = output_id
-        data_set_results = DataSetResults()
-        for data_set in output.data_sets:
+            # create pseudo-report for ReportWriter
+            output = next(output for output in tellurium_doc.outputs if output.id == report_id)
             if is_plot:
-                data_set.id = data_set.id[len('__data_set__{}_'.format(output_id)):]
-            data_set_results[data_set.id] = data_set_df.loc[data_set.label, :].to_numpy()
-
-        # append to data structure of report results
-        if config.COLLECT_SED_DOCUMENT_RESULTS:
-            report_results[output_id] = data_set_results
-
-        # save file in desired BioSimulators format(s)
-        report_formats = [ReportFormat(format_value) for format_value in config.REPORT_FORMATS]
-        for report_format in report_formats:
-            ReportWriter().run(output,
-                               data_set_results,
-                               base_out_path,
-                               os.path.join(rel_out_path, output_id) if rel_out_path else output_id,
-                               format=report_format)
+                output.id = output_id
+            data_set_results = DataSetResults()
+            for data_set in output.data_sets:
+                if is_plot:
+                    data_set.id = data_set.id[len('__data_set__{}_'.format(output_id)):]
+                data_set_results[data_set.id] = data_set_df.loc[data_set.label, :].to_numpy()
+
+            # append to data structure of report results
+            if config.COLLECT_SED_DOCUMENT_RESULTS:
+                report_results[output_id] = data_set_results
+
+            # save file in desired BioSimulators format(s)
+            report_formats = [ReportFormat(format_value) for format_value in config.REPORT_FORMATS]
+            for report_format in report_formats:
+                report_writer.run(output,
+                                  data_set_results,
+                                  base_out_path,
+                                  os.path.join(rel_out_path, output_id) if rel_out_path else output_id,
+                                  format=report_format)
 
+            if config.LOG:
+                output_durations[output_id] = (datetime.datetime.now() - output_start_time).total_seconds()
+
+    except Exception:
+        with contextlib.suppress(Exception):
+            report_writer.close()
+        shutil.rmtree(tmp_out_dir)
+        raise
+
+    # Close the HDF5 files of the reports
+    try:
+        report_writer.close()
+    except Exception as exception:
         if config.LOG:
-            log.outputs[output_id].status = Status.SUCCEEDED
-            log.outputs[output_id].duration = (datetime.datetime.now() - output_start_time).total_seconds()
+            for output_id in output_durations:
+                log.outputs[output_id].status = Status.FAILED
+                log.outputs[output_id].exception = exception
             log.export()
+        shutil.rmtree(tmp_out_dir)
+        raise
+
+    if config.LOG:
+        for output_id, duration in output_durations.items():
+            log.outputs[output_id].status = Status.SUCCEEDED
+            log.outputs[output_id].duration = duration
+        log.export()
 
     # Move the plot outputs to the permanent output directory
     out_dir = base_out_path
@@ -879,6 +1843,11 @@ def exec_sed_doc_with_tellurium(doc, working_dir, base_out_path, rel_out_path=No
         for viz_filename in glob.glob(os.path.join(tmp_out_dir, '*.' + viz_format.value)):
             shutil.move(viz_filename, out_dir)
 
+    if config.LOG and viz_formats and not simulator_config.save_plot_data:
+        for output in doc.outputs:
+            if isinstance(output, (Plot2D, Plot3D)):
+                log.outputs[output.id].status = Status.SUCCEEDED
+
     # finalize log
     if config.LOG:
         log.status = Status.SUCCEEDED
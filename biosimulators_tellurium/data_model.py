@@ -7,17 +7,32 @@
 """
 
 from biosimulators_utils.data_model import ValueType
+from biosimulators_utils.utils.core import validate_str_value, parse_value
 import collections
+import collections.abc
 import dataclasses
 import enum
-# import roadrunner
-# import typing
+import numpy
+import roadrunner
+import typing
 
 __all__ = [
     'SedmlInterpreter',
     'PlottingEngine',
     'KISAO_ALGORITHM_MAP',
+    'AlgorithmParameterSchema',
+    'AlgorithmSchema',
+    'KISAO_ALGORITHM_SCHEMAS',
+    'TauLeapingIntegrator',
+    'PYTHON_INTEGRATORS',
+    'SolverConfiguration',
+    'RESET_METHODS',
+    'RoadRunnerPool',
     'PreprocesssedTask',
+    'TaskCostPrediction',
+    'TaskPlan',
+    'ArchivePlan',
+    'SimulationTimeoutError',
 ]
 
 
@@ -163,6 +178,7 @@ KISAO_ALGORITHM_MAP = collections.OrderedDict([
         'kisao_id': 'KISAO_0000029',
         'id': 'gillespie',
         'name': "Gillespie direct method of the Stochastic Simulation Algorithm (SSA)",
+        'stochastic': True,
         'parameters': {
             'KISAO_0000488': {
                 'kisao_id': 'KISAO_0000488',
@@ -180,10 +196,40 @@ KISAO_ALGORITHM_MAP = collections.OrderedDict([
             },
         }
     }),
+    ('KISAO_0000040', {
+        'kisao_id': 'KISAO_0000040',
+        'id': 'tau_leaping',
+        'name': "Poisson tau-leaping method",
+        'stochastic': True,
+        'parameters': {
+            'KISAO_0000488': {
+                'kisao_id': 'KISAO_0000488',
+                'id': 'seed',
+                'name': 'Random number generator seed',
+                'type': ValueType.integer,
+                'default': None,
+            },
+            'KISAO_0000228': {
+                'kisao_id': 'KISAO_0000228',
+                'id': 'epsilon',
+                'name': 'Bound on the relative change of the propensities of reactions in each leap',
+                'type': ValueType.float,
+                'default': 0.03,
+            },
+            'KISAO_0000673': {
+                'kisao_id': 'KISAO_0000673',
+                'id': 'nonnegative',
+                'name': 'Reject leaps and skip reactions which would result in negative species amounts',
+                'type': ValueType.boolean,
+                'default': False,
+            },
+        }
+    }),
     ('KISAO_0000569', {
         'kisao_id': 'KISAO_0000569',
         'id': 'nleq2',
         'name': "Newton-type method for solving non-linear (NL) equations (EQ)",
+        'steady_state': True,
         'parameters': {
             'KISAO_0000209': {
                 'kisao_id': 'KISAO_0000209',
@@ -272,21 +318,577 @@ KISAO_ALGORITHM_MAP = collections.OrderedDict([
             },
         }
     }),
+    ('KISAO_0000282', {
+        'kisao_id': 'KISAO_0000282',
+        'id': 'newton',
+        'name': "KINSOL",
+        'steady_state': True,
+        'parameters': {
+            'KISAO_0000486': {
+                'kisao_id': 'KISAO_0000486',
+                'id': 'maximum_iterations',
+                'roadrunner_attribute': 'num_max_iters',
+                'name': 'Maximum number of iterations',
+                'type': ValueType.integer,
+                'default': 200,
+            },
+            'KISAO_0000565': {
+                'kisao_id': 'KISAO_0000565',
+                'id': 'function_norm_tolerance',
+                'roadrunner_attribute': 'func_norm_tol',
+                'name': 'Stopping tolerance on the scaled norm of the function (0 for the unit roundoff to the 1/3 power)',
+                'type': ValueType.float,
+                'default': 0.,
+            },
+            'KISAO_0000674': {
+                'kisao_id': 'KISAO_0000674',
+                'id': 'allow_presimulation',
+                'name': 'Presimulate',
+                'type': ValueType.boolean,
+                'default': True,
+            },
+            'KISAO_0000677': {
+                'kisao_id': 'KISAO_0000677',
+                'id': 'presimulation_maximum_steps',
+                'name': 'Maximum number of steps for presimulation',
+                'type': ValueType.integer,
+                'default': 500,
+            },
+            'KISAO_0000680': {
+                'kisao_id': 'KISAO_0000680',
+                'id': 'presimulation_time',
+                'name': 'Amount of time to presimulate',
+                'type': ValueType.float,
+                'default': 5.,
+            },
+            'KISAO_0000682': {
+                'kisao_id': 'KISAO_0000682',
+                'id': 'allow_approx',
+                'name': 'Whether to find an approximate solution if an exact solution could not be found',
+                'type': ValueType.boolean,
+                'default': True,
+            },
+            'KISAO_0000683': {
+                'kisao_id': 'KISAO_0000683',
+                'id': 'approx_tolerance',
+                'name': 'Relative tolerance for an approximate solution',
+                'type': ValueType.float,
+                'default': 0.000001,
+            },
+            'KISAO_0000678': {
+                'kisao_id': 'KISAO_0000678',
+                'id': 'approx_maximum_steps',
+                'name': 'Maximum number of steps for approximation',
+                'type': ValueType.integer,
+                'default': 10000,
+            },
+            'KISAO_0000679': {
+                'kisao_id': 'KISAO_0000679',
+                'id': 'approx_time',
+                'name': 'Maximum amount of time for approximation',
+                'type': ValueType.float,
+                'default': 10000.,
+            },
+            'KISAO_0000476': {
+                'kisao_id': 'KISAO_0000476',
+                'id': 'strategy',
+                'name': 'Globalization strategy of the Newton iteration (`none` or `linesearch`)',
+                'type': ValueType.string,
+                'default': 'none',
+                'solver_ids': {
+                    'none': 'newton',
+                    'linesearch': 'newton_linesearch',
+                },
+            },
+        }
+    }),
 ])
 
 
+@dataclasses.dataclass(frozen=True)
+class AlgorithmParameterSchema(object):
+    """ Compiled description of a parameter of an algorithm
+
+    Attributes:
+        kisao_id (:obj:`str`): KiSAO id of the parameter
+        id (:obj:`str`): id of the parameter
+        name (:obj:`str`): name of the parameter
+        type (:obj:`ValueType`): type of the parameter
+        default (:obj:`object`): default value of the parameter
+        roadrunner_attribute (:obj:`str`): name of the attribute of the RoadRunner solver which implements the parameter
+        solver_ids (:obj:`dict`): for parameters which select the RoadRunner solver which implements the algorithm rather
+            than configure it, dictionary that maps the values of the parameter to the ids of the solvers
+    """
+    kisao_id: str
+    id: str
+    name: str
+    type: ValueType
+    default: object
+    roadrunner_attribute: str
+    solver_ids: dict = dataclasses.field(default=None, hash=False)
+
+    def is_valid(self, value):
+        """ Determine whether a string-encoded value is a valid value of the parameter
+
+        Args:
+            value (:obj:`str`): string-encoded value
+
+        Returns:
+            :obj:`bool`: whether the value is valid
+        """
+        if self.solver_ids is not None:
+            return value in self.solver_ids
+        return validate_str_value(value, self.type)
+
+    def parse(self, value):
+        """ Parse a string-encoded value of the parameter
+
+        Args:
+            value (:obj:`str`): string-encoded value
+
+        Returns:
+            :obj:`object`: value
+        """
+        return parse_value(value, self.type)
+
+
+@dataclasses.dataclass(frozen=True)
+class AlgorithmSchema(object):
+    """ Compiled description of an algorithm
+
+    Attributes:
+        kisao_id (:obj:`str`): KiSAO id of the algorithm
+        id (:obj:`str`): id of the RoadRunner integrator or steady-state solver which implements the algorithm
+        name (:obj:`str`): name of the algorithm
+        steady_state (:obj:`bool`): whether the algorithm is a steady-state solver (rather than an integrator)
+        parameters (:obj:`collections.OrderedDict`): dictionary that maps the KiSAO ids of the parameters of the algorithm
+            to their schemas (:obj:`AlgorithmParameterSchema`)
+        stochastic (:obj:`bool`): whether the algorithm is stochastic
+    """
+    kisao_id: str
+    id: str
+    name: str
+    steady_state: bool
+    parameters: collections.OrderedDict
+    stochastic: bool = False
+
+
+def _compile_algorithm_schemas(algorithm_map):
+    """ Compile descriptions of algorithms into schemas
+
+    Args:
+        algorithm_map (:obj:`collections.OrderedDict`): dictionary that maps KiSAO ids of algorithms to their descriptions
+
+    Returns:
+        :obj:`collections.OrderedDict`: dictionary that maps KiSAO ids of algorithms to their schemas (:obj:`AlgorithmSchema`)
+    """
+    schemas = collections.OrderedDict()
+    for kisao_id, alg_props in algorithm_map.items():
+        schemas[kisao_id] = AlgorithmSchema(
+            kisao_id=kisao_id,
+            id=alg_props['id'],
+            name=alg_props['name'],
+            steady_state=alg_props.get('steady_state', False),
+            parameters=collections.OrderedDict(
+                (param_kisao_id, AlgorithmParameterSchema(
+                    kisao_id=param_kisao_id,
+                    id=param_props['id'],
+                    name=param_props['name'],
+                    type=param_props['type'],
+                    default=param_props['default'],
+                    roadrunner_attribute=param_props.get('roadrunner_attribute', param_props['id']),
+                    solver_ids=param_props.get('solver_ids', None),
+                ))
+                for param_kisao_id, param_props in alg_props['parameters'].items()
+            ),
+            stochastic=alg_props.get('stochastic', False),
+        )
+    return schemas
+
+
+KISAO_ALGORITHM_SCHEMAS = _compile_algorithm_schemas(KISAO_ALGORITHM_MAP)
+
+
+class TauLeapingIntegrator(object):
+    """ Integrator for the Poisson tau-leaping method, which RoadRunner doesn't implement (see
+    :obj:`biosimulators_tellurium.tau_leaping.simulate_tau_leaping`). Like the integrators of RoadRunner, the parameters
+    of the integrator are attributes, whose names can be enumerated with :obj:`getNumParams` and :obj:`getParamName`.
+
+    Attributes:
+        seed (:obj:`int`): seed for the random number generator, or :obj:`None` to seed the generator with fresh entropy
+        epsilon (:obj:`float`): bound on the relative change of the propensities of reactions in each leap
+        nonnegative (:obj:`bool`): whether to reject leaps, and skip exact firings of reactions, which would result in
+            negative species amounts
+    """
+    PARAMETERS = ('seed', 'epsilon', 'nonnegative')
+
+    def __init__(self):
+        self.seed = None
+        self.epsilon = 0.03
+        self.nonnegative = False
+        self._random_number_generator = None
+
+    def getName(self):
+        """ Get the name of the integrator
+
+        Returns:
+            :obj:`str`: name
+        """
+        return 'tau_leaping'
+
+    def getNumParams(self):
+        """ Get the number of parameters of the integrator
+
+        Returns:
+            :obj:`int`: number of parameters
+        """
+        return len(self.PARAMETERS)
+
+    def getParamName(self, i_param):
+        """ Get the name of a parameter of the integrator
+
+        Args:
+            i_param (:obj:`int`): index of the parameter
+
+        Returns:
+            :obj:`str`: name of the parameter
+        """
+        return self.PARAMETERS[i_param]
+
+    def get_random_number_generator(self):
+        """ Get the random number generator of the integrator, seeding it on first use
+
+        Returns:
+            :obj:`numpy.random.Generator`: random number generator
+        """
+        if self._random_number_generator is None:
+            self._random_number_generator = numpy.random.default_rng(self.seed)
+        return self._random_number_generator
+
+    def is_random_number_generator_used(self):
+        """ Determine whether random numbers have been drawn from the generator of the integrator since it was created
+
+        Returns:
+            :obj:`bool`: whether random numbers have been drawn
+        """
+        return self._random_number_generator is not None
+
+
+# :obj:`dict`: dictionary that maps the ids of the integrators which RoadRunner doesn't implement to their classes
+PYTHON_INTEGRATORS = {
+    'tau_leaping': TauLeapingIntegrator,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class SolverConfiguration(object):
+    """ Parsed configuration of a RoadRunner integrator or steady-state solver, which can be applied to multiple
+    RoadRunner instances and used as a key for caching
+
+    Attributes:
+        algorithm_kisao_id (:obj:`str`): KiSAO id of the algorithm to execute
+        solver_id (:obj:`str`): id of the RoadRunner integrator or steady-state solver
+        steady_state (:obj:`bool`): whether the solver is a steady-state solver (rather than an integrator)
+        parameter_values (:obj:`tuple` of :obj:`tuple`): names of attributes of the solver and their values
+    """
+    algorithm_kisao_id: str
+    solver_id: str
+    steady_state: bool
+    parameter_values: typing.Tuple[typing.Tuple[str, object], ...]
+
+    def apply(self, road_runner):
+        """ Select and configure the solver of a RoadRunner instance
+
+        Args:
+            road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance
+
+        Returns:
+            :obj:`roadrunner.Integrator`, :obj:`roadrunner.SteadyStateSolver`, or :obj:`TauLeapingIntegrator`: solver
+        """
+        if self.solver_id in PYTHON_INTEGRATORS:
+            # integrators which RoadRunner doesn't implement have no state in RoadRunner instances; each application
+            # creates a new integrator, which its users keep (see :obj:`PreprocesssedTask.solvers`) so that its random
+            # number generator is only seeded once
+            solver = PYTHON_INTEGRATORS[self.solver_id]()
+            for attribute, value in self.parameter_values:
+                setattr(solver, attribute, value)
+            return solver
+
+        if self.steady_state:
+            road_runner.setSteadyStateSolver(self.solver_id)
+        else:
+            road_runner.setIntegrator(self.solver_id)
+        solver = self.get_solver(road_runner)
+
+        for attribute, value in self.parameter_values:
+            setattr(solver, attribute, value)
+
+        return solver
+
+    def get_solver(self, road_runner):
+        """ Get the solver of a RoadRunner instance which this configuration applies to
+
+        Args:
+            road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance
+
+        Returns:
+            :obj:`roadrunner.Integrator` or :obj:`roadrunner.SteadyStateSolver`: solver, or :obj:`None` if RoadRunner
+            doesn't implement the solver (see :obj:`apply`)
+        """
+        if self.solver_id in PYTHON_INTEGRATORS:
+            return None
+
+        if self.steady_state:
+            return road_runner.getSteadyStateSolver()
+        else:
+            return road_runner.getIntegrator()
+
+
+# :obj:`tuple` of :obj:`str`: methods of RoadRunner instances which restore their initial states, from the cheapest (and
+# narrowest) to the most expensive. ``reset`` restores the time, floating species and variables of rate rules; ``resetAll``
+# also restores boundary species, compartments and global parameters. Both re-evaluate initial assignments. Both preserve
+# the initial values (``init(x)``) of models, which changes applied in memory set (see the ``IN_MEMORY_MODEL_CHANGES``
+# option), whereas ``resetToOrigin`` would discard them.
+RESET_METHODS = ('reset', 'resetAll')
+
+
+class RoadRunnerPool(collections.abc.Mapping):
+    """ Dictionary of the RoadRunner instances for the tasks of a (repeated) task which limits the number of instances
+    which are resident in memory
+
+    Multiple tasks can be assigned to the same slot (e.g., tasks which share a model). When more than
+    :obj:`max_resident` slots are resident, the state of the least recently used instance is serialized
+    (``saveStateS``) and the instance is released. Evicted instances are restored from their serialized states the next
+    time they are requested. Values and resets applied to evicted instances are deferred until they are restored.
+
+    The pool also tracks which instances have been modified (simulated or changed) since they were loaded or last reset,
+    and the cheapest of the :obj:`RESET_METHODS` which restores each modified instance. Unmodified instances are not
+    reset. Simulations whose results were reused rather than executed can be deferred, and are replayed before the state
+    of their instance is next needed.
+
+    Attributes:
+        max_resident (:obj:`int`): maximum number of resident instances (0 for no limit)
+        slots (:obj:`dict`): dictionary that maps the id of each task to its slot
+        num_evictions (:obj:`int`): number of times an instance has been evicted
+        num_restorations (:obj:`int`): number of times an instance has been restored
+        peak_num_resident (:obj:`int`): maximum number of instances which have been resident at once
+    """
+
+    def __init__(self, max_resident=0):
+        """
+        Args:
+            max_resident (:obj:`int`, optional): maximum number of resident instances (0 for no limit)
+        """
+        self.max_resident = max_resident
+        self.slots = {}
+        self.num_evictions = 0
+        self.num_restorations = 0
+        self.peak_num_resident = 0
+        self._resident = collections.OrderedDict()
+        self._states = {}
+        self._deferred_calls = {}
+        self._deferred_simulations = {}
+        self._modified = {}
+
+    def has_slot(self, slot):
+        """ Determine whether the pool has an instance for a slot
+
+        Args:
+            slot (:obj:`object`): slot
+
+        Returns:
+            :obj:`bool`: whether the pool has an instance for the slot
+        """
+        return slot in self._resident or slot in self._states
+
+    def add(self, task_id, slot, road_runner=None):
+        """ Assign a task to a slot, and, optionally, add the instance for the slot
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            slot (:obj:`object`): slot
+            road_runner (:obj:`roadrunner.RoadRunner`, optional): instance for the slot. Required if the pool doesn't
+                already have an instance for the slot.
+        """
+        if road_runner is not None:
+            self._deferred_calls.pop(slot, None)
+            self._deferred_simulations.pop(slot, None)
+            self._states.pop(slot, None)
+            self._modified.pop(slot, None)
+            self._make_resident(slot, road_runner)
+        elif not self.has_slot(slot):
+            raise ValueError('An instance must be provided for slot `{}`.'.format(slot))
+        self.slots[task_id] = slot
+
+    def get_state_sizes(self):
+        """ Get the sizes of the serialized states of the instances of the slots of the pool
+
+        Returns:
+            :obj:`dict`: dictionary that maps each slot to the size in bytes of the serialized state of its instance
+        """
+        sizes = {slot: len(road_runner.saveStateS()) for slot, road_runner in self._resident.items()}
+        sizes.update({slot: len(state) for slot, state in self._states.items()})
+        return sizes
+
+    def get_slot(self, slot):
+        """ Get the instance for a slot, restoring it if it has been evicted
+
+        Args:
+            slot (:obj:`object`): slot
+
+        Returns:
+            :obj:`roadrunner.RoadRunner`: instance
+        """
+        road_runner = self._resident.get(slot, None)
+        if road_runner is None:
+            road_runner = roadrunner.RoadRunner()
+            road_runner.loadStateS(self._states.pop(slot))
+            for method, args in self._deferred_calls.pop(slot, []):
+                getattr(road_runner, method)(*args)
+            self.num_restorations += 1
+            self._make_resident(slot, road_runner)
+        else:
+            self._resident.move_to_end(slot)
+            self._replay_deferred_simulation(slot, road_runner)
+        return road_runner
+
+    def is_modified(self, task_id):
+        """ Determine whether the instance for a task has been modified since it was loaded or last reset
+
+        Args:
+            task_id (:obj:`str`): id of the task
+
+        Returns:
+            :obj:`bool`: whether the instance has been modified
+        """
+        return self.slots[task_id] in self._modified
+
+    def mark_modified(self, task_id, reset_method='resetAll'):
+        """ Record that the instance for a task has been modified (e.g., simulated)
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            reset_method (:obj:`str`, optional): cheapest of the :obj:`RESET_METHODS` which undoes the modification
+        """
+        self._mark_modified(self.slots[task_id], reset_method)
+
+    def defer_simulation(self, task_id, simulate, reset_method='resetAll'):
+        """ Defer a simulation of the instance for a task until the state of the instance is next needed. The simulation
+        is discarded if the instance is reset first.
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            simulate (:obj:`types.FunctionType`): function which simulates an instance, given the instance
+            reset_method (:obj:`str`, optional): cheapest of the :obj:`RESET_METHODS` which undoes the simulation
+        """
+        slot = self.slots[task_id]
+        self._deferred_simulations[slot] = simulate
+        self._mark_modified(slot, reset_method)
+
+    def set_value(self, task_id, tellurium_id, value, reset_method='resetAll'):
+        """ Set a value of the model of the instance for a task, deferring the change if the instance has been evicted
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            tellurium_id (:obj:`str`): tellurium id of the model component
+            value (:obj:`float`): value
+            reset_method (:obj:`str`, optional): cheapest of the :obj:`RESET_METHODS` which undoes the change
+        """
+        slot = self.slots[task_id]
+        self._call(slot, '__setitem__', tellurium_id, value)
+        self._mark_modified(slot, reset_method)
+
+    def set_initial_values(self, task_id, initial_values):
+        """ Set the initial values of the model of the instance for a task (e.g., ``init(k1)``), and reset the instance
+        to its new initial state, deferring the changes if the instance has been evicted. The new initial values
+        become part of the initial state of the instance, which later resets restore.
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            initial_values (:obj:`collections.OrderedDict`): dictionary that maps the tellurium ids of initial values
+                to their values, in the order in which they should be set
+        """
+        slot = self.slots[task_id]
+        for tellurium_id, value in initial_values.items():
+            self._call(slot, '__setitem__', tellurium_id, value)
+        self._call(slot, 'resetAll')
+
+    def reset_all(self):
+        """ Reset each modified instance with the cheapest method which restores its initial state, deferring the resets
+        of evicted instances """
+        for slot, reset_method in self._modified.items():
+            self._deferred_simulations.pop(slot, None)
+            self._call(slot, reset_method)
+        self._modified.clear()
+
+    def _mark_modified(self, slot, reset_method):
+        current_reset_method = self._modified.get(slot, None)
+        if current_reset_method is None or RESET_METHODS.index(reset_method) > RESET_METHODS.index(current_reset_method):
+            self._modified[slot] = reset_method
+
+    def _call(self, slot, method, *args):
+        road_runner = self._resident.get(slot, None)
+        if road_runner is None:
+            self._deferred_calls.setdefault(slot, []).append((method, args))
+        else:
+            self._replay_deferred_simulation(slot, road_runner)
+            getattr(road_runner, method)(*args)
+
+    def _replay_deferred_simulation(self, slot, road_runner):
+        simulate = self._deferred_simulations.pop(slot, None)
+        if simulate is not None:
+            simulate(road_runner)
+
+    def _make_resident(self, slot, road_runner):
+        self._resident[slot] = road_runner
+        self._resident.move_to_end(slot)
+        while self.max_resident and len(self._resident) > self.max_resident:
+            evicted_slot, evicted_road_runner = self._resident.popitem(last=False)
+            self._replay_deferred_simulation(evicted_slot, evicted_road_runner)
+            self._states[evicted_slot] = evicted_road_runner.saveStateS()
+            self.num_evictions += 1
+        self.peak_num_resident = max(self.peak_num_resident, len(self._resident))
+
+    def __getitem__(self, task_id):
+        return self.get_slot(self.slots[task_id])
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+
 @dataclasses.dataclass
 class PreprocesssedTask(object):
     """ Processed information about a SED task
 
     Attributes:
-        road_runners (:obj:`roadrunner.RoadRunner`): Road Runner instances with model, per task
-        solver (:obj:`roadrunner.Integrator` or :obj:`roadrunner.SteadyStateSolver`): solver, per task
+        road_runners (:obj:`RoadRunnerPool`): Road Runner instances with model, per task
+        solver (:obj:`roadrunner.Integrator`, :obj:`roadrunner.SteadyStateSolver` or :obj:`TauLeapingIntegrator`):
+            solver, per task. Integrators which RoadRunner doesn't implement are created once per task and reused by all
+            of its executions.
         model_change_target_tellurium_id_map (:obj:`dict`): dictionaries that map the targets of
             changes to their corresponding tellurium identifiers (tuples of their type and index within their type), per task
         algorithm_kisao_id (:obj:`str`): dictionaries of KiSAO id of algorithm to execute, per task
         variable_target_tellurium_observable_maps (:obj:`dict`): dictionary of dictionaries that map tuples of variable targets and
             symbols to their corresponding tellurium observable identifiers, per task
+        solver_configurations (:obj:`dict`): configurations (:obj:`SolverConfiguration`) of the solvers, per task
+        selections (:obj:`dict`): tellurium observable identifiers to record, per task
+        active_task_ids (:obj:`dict`): dictionary that maps the slots of RoadRunner instances to the id of the task
+            which each instance is currently configured for. Multiple tasks can share a RoadRunner instance.
+        simulation_reset_methods (:obj:`dict`): cheapest of the :obj:`RESET_METHODS` which undoes a simulation (e.g., the
+            assignments of its events), per task
+        value_reset_methods (:obj:`dict`): dictionaries that map tellurium identifiers to the cheapest of the
+            :obj:`RESET_METHODS` which undoes a change to their values, per task
+        initial_values (:obj:`collections.OrderedDict`): dictionaries that map the tellurium ids of initial values (e.g.,
+            ``init(k1)``) which were set in memory rather than in the XML of the model to their values, per task
+        deadline (:obj:`float`): time (:obj:`time.monotonic`) by which the task must finish, or :obj:`None` if the task
+            has no time budget
+        solver_statistics (:obj:`dict`): work of the solvers of all of the executions of the task (e.g., of each iteration
+            of a repeated task)
+        model_hashes (:obj:`dict`): SHA-256 hashes of the contents of the model files, per task. Computed the first time
+            the results of a task are cached.
     """
     road_runners: dict
     # solvers is dict of this type: typing.Union[roadrunner.Integrator, roadrunner.SteadyStateSolver]
@@ -294,3 +896,88 @@ class PreprocesssedTask(object):
     model_change_target_tellurium_id_maps: dict
     algorithm_kisao_ids: dict
     variable_target_tellurium_observable_maps: dict
+    solver_configurations: dict = None
+    selections: dict = None
+    active_task_ids: dict = None
+    simulation_reset_methods: dict = None
+    value_reset_methods: dict = None
+    initial_values: dict = None
+    deadline: float = None
+    solver_statistics: dict = None
+    model_hashes: dict = None
+
+
+@dataclasses.dataclass
+class TaskCostPrediction(object):
+    """ Prediction of the cost of the execution of a SED task of a COMBINE/OMEX archive
+
+    Attributes:
+        sed_document (:obj:`str`): location of the SED document of the task within its archive
+        task (:obj:`str`): id of the task
+        model_hash (:obj:`str`): hash of the contents of the models of the task
+        algorithm (:obj:`str`): KiSAO ids of the algorithms of the simulations of the task
+        cost (:obj:`float`): estimated cost of the task (e.g., number of executions x number of time points x number of
+            model elements), in arbitrary units
+        duration (:obj:`float`): predicted duration of the task in seconds
+    """
+    sed_document: str
+    task: str
+    model_hash: str
+    algorithm: str
+    cost: float
+    duration: float = None
+
+
+@dataclasses.dataclass
+class TaskPlan(object):
+    """ Plan of the execution of a SED task of a COMBINE/OMEX archive
+
+    Attributes:
+        sed_document (:obj:`str`): location of the SED document of the task within its archive
+        task (:obj:`str`): id of the task
+        num_simulations (:obj:`int`): number of simulations of the task, including the simulations of the sub-tasks of
+            each iteration of repeated tasks
+        num_variables (:obj:`int`): number of variables which the task records
+        num_values (:obj:`int`): number of values of the result of each variable
+        result_size (:obj:`int`): size in bytes of the results of the variables
+        model_memory (:obj:`int`): estimated memory in bytes of the compiled models of the task
+        errors (:obj:`list` of :obj:`str`): errors in the models, changes and variables of the task
+    """
+    sed_document: str
+    task: str
+    num_simulations: int
+    num_variables: int
+    num_values: int
+    result_size: int
+    model_memory: int
+    errors: list
+
+
+@dataclasses.dataclass
+class ArchivePlan(object):
+    """ Plan of the execution of a COMBINE/OMEX archive, with estimates of its costs
+
+    Attributes:
+        archive (:obj:`str`): path to the archive
+        tasks (:obj:`list` of :obj:`TaskPlan`): plans of the tasks of the archive whose results its outputs need
+        num_simulations (:obj:`int`): number of simulations of the tasks
+        result_size (:obj:`int`): size in bytes of the results of the variables and data generators of the SED
+            documents of the archive
+        peak_memory (:obj:`int`): estimated peak memory in bytes for the results of the archive and the compiled models
+            of its tasks
+        report_sizes (:obj:`dict`): dictionary that maps the paths of the report files of the archive (relative to its
+            output directory) to their estimated sizes in bytes (without compression)
+        errors (:obj:`list` of :obj:`str`): errors in reading the archive
+    """
+    archive: str
+    tasks: list
+    num_simulations: int
+    result_size: int
+    peak_memory: int
+    report_sizes: dict
+    errors: list
+
+
+class SimulationTimeoutError(TimeoutError):
+    """ Exception raised when the execution of a task exceeds its time budget """
+    pass
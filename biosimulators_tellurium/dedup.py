@@ -0,0 +1,190 @@
+""" Methods for executing equivalent SED tasks once
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from .data_model import KISAO_ALGORITHM_SCHEMAS
+from .utils import get_data_generators_for_outputs
+from biosimulators_utils.report.data_model import VariableResults
+from biosimulators_utils.sedml.data_model import Task, ModelAttributeChange
+import collections
+
+
+__all__ = [
+    'get_equivalent_tasks',
+]
+
+
+def get_equivalent_tasks(doc):
+    """ Get the sets of equivalent tasks of a SED document which contribute to its outputs, i.e. tasks whose models, model
+    changes and simulations are equivalent, and which therefore produce the same results. Tasks which execute stochastic
+    algorithms without fixed seeds, or algorithms which tellurium doesn't implement, are never considered to be equivalent
+    to other tasks.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`Task`: sets of two or more equivalent tasks, in the order of the tasks of the
+            document
+    """
+    output_task_ids = set(variable.task.id
+                          for data_generator in get_data_generators_for_outputs(doc)
+                          for variable in data_generator.variables)
+
+    task_sets = collections.OrderedDict()
+    for task in doc.tasks:
+        if not isinstance(task, Task) or task.id not in output_task_ids:
+            continue
+
+        model = task.model
+        sim = task.simulation
+        alg_schema = KISAO_ALGORITHM_SCHEMAS.get(sim.algorithm.kisao_id, None)
+        if (
+            alg_schema is None
+            or (alg_schema.stochastic and 'KISAO_0000488' not in [change.kisao_id for change in sim.algorithm.changes])
+        ):
+            continue
+
+        if all(isinstance(change, ModelAttributeChange) for change in model.changes):
+            model_key = (
+                model.source,
+                model.language,
+                tuple((change.target, frozenset(change.target_namespaces.items()), change.new_value)
+                      for change in model.changes),
+            )
+        else:
+            model_key = id(model)
+
+        sim_key = (
+            sim.__class__.__name__,
+            tuple(getattr(sim, attr, None) for attr in ['initial_time', 'output_start_time', 'output_end_time', 'number_of_steps']),
+            sim.algorithm.kisao_id,
+            tuple((change.kisao_id, change.new_value) for change in sim.algorithm.changes),
+        )
+
+        task_sets.setdefault((model_key, sim_key), []).append(task)
+
+    return [tasks for tasks in task_sets.values() if len(tasks) > 1]
+
+
+class _TaskDeduplicator(object):
+    """ Wrapper for the executers of the biosimulators SED-ML interpreter which only simulates the first of each set of
+    equivalent tasks of a SED document (see :obj:`get_equivalent_tasks`). The first task of each set records the
+    variables of all of the tasks of the set, and its results are reused for the other tasks of the set.
+
+    Attributes:
+        primary_task_ids (:obj:`dict`): dictionary that maps the id of each duplicate task to the id of the first task
+            which is equivalent to it
+    """
+
+    def __init__(self, doc, task_executer, preprocessed_task_executer, set_value_executer):
+        """
+        Args:
+            doc (:obj:`SedDocument`): SED document
+            task_executer (:obj:`types.FunctionType`): function which executes a task
+            preprocessed_task_executer (:obj:`types.FunctionType`): function which preprocesses a task
+            set_value_executer (:obj:`types.FunctionType`): function which sets a value of the model of a preprocessed task
+        """
+        self._task_executer = task_executer
+        self._preprocessed_task_executer = preprocessed_task_executer
+        self._set_value_executer = set_value_executer
+
+        data_generators = get_data_generators_for_outputs(doc)
+        variables = [variable for data_generator in data_generators for variable in data_generator.variables]
+
+        self.primary_task_ids = {}
+        self._duplicate_variables = {}
+        for tasks in get_equivalent_tasks(doc):
+            task_ids = set(task.id for task in tasks)
+            self._duplicate_variables[tasks[0].id] = [variable for variable in variables
+                                                      if variable.task.id in task_ids and variable.task is not tasks[0]]
+            for task in tasks[1:]:
+                self.primary_task_ids[task.id] = tasks[0].id
+
+        self._preprocessed_tasks = {}
+        self._results = {}
+
+    def preprocess_task(self, task, variables, config=None):
+        """ Preprocess a task, unless it is a duplicate
+
+        Args:
+            task (:obj:`AbstractTask`): task
+            variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+            config (:obj:`Config`, optional): BioSimulators common configuration
+
+        Returns:
+            :obj:`PreprocessedTask`: preprocessed information about the task, or the id of the first equivalent task if
+                the task is a duplicate
+        """
+        if task.id in self.primary_task_ids:
+            return self.primary_task_ids[task.id]
+
+        duplicate_variables = self._duplicate_variables.get(task.id, None)
+        if duplicate_variables is None:
+            return self._preprocessed_task_executer(task, variables, config=config)
+
+        try:
+            preprocessed_task = self._preprocessed_task_executer(task, variables + duplicate_variables, config=config)
+        except Exception as exception:
+            self._results[task.id] = (exception, None)
+            raise
+        self._preprocessed_tasks[task.id] = preprocessed_task
+        return preprocessed_task
+
+    def exec_task(self, task, variables, preprocessed_task=None, log=None, config=None):
+        """ Execute a task, or get the results of the first equivalent task if the task is a duplicate
+
+        Args:
+            task (:obj:`Task`): task
+            variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+            preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task
+            log (:obj:`TaskLog`, optional): log for the task
+            config (:obj:`Config`, optional): BioSimulators common configuration
+
+        Returns:
+            :obj:`tuple`:
+
+                :obj:`VariableResults`: results of variables
+                :obj:`TaskLog`: log
+        """
+        primary_task_id = self.primary_task_ids.get(task.id, None)
+        if primary_task_id is not None and isinstance(preprocessed_task, str):
+            primary_results, primary_log = self._results[primary_task_id]
+            if isinstance(primary_results, Exception):
+                raise primary_results.__class__(*primary_results.args)
+            if log:
+                log.algorithm = primary_log.algorithm if primary_log else None
+                log.simulator_details = {'duplicateOf': primary_task_id}
+            return VariableResults((variable.id, primary_results[variable.id]) for variable in variables), log
+
+        duplicate_variables = self._duplicate_variables.get(task.id, None)
+        if duplicate_variables is None or preprocessed_task is not self._preprocessed_tasks.get(task.id, None):
+            return self._task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+
+        try:
+            results, log = self._task_executer(task, variables + duplicate_variables, preprocessed_task=preprocessed_task,
+                                               log=log, config=config)
+        except Exception as exception:
+            self._results[task.id] = (exception, None)
+            raise
+        self._results[task.id] = (results, log)
+        if log:
+            log.simulator_details['duplicates'] = sorted(
+                task_id for task_id, primary_task_id in self.primary_task_ids.items() if primary_task_id == task.id)
+        return results, log
+
+    def set_value(self, model, target, symbol, value, preprocessed_task):
+        """ Set a value of the model of a preprocessed task. The values of duplicate tasks are ignored because
+        they have already been set for the first equivalent task.
+
+        Args:
+            model (:obj:`Model`): model
+            target (:obj:`str`): target of the value
+            symbol (:obj:`str`): symbol of the value
+            value (:obj:`float`): value
+            preprocessed_task (:obj:`PreprocessedTask`): preprocessed information about the task
+        """
+        if not isinstance(preprocessed_task, str):
+            self._set_value_executer(model, target, symbol, value, preprocessed_task)
@@ -0,0 +1,393 @@
+""" Methods for precomputing the model changes of repeated tasks and applying model changes in memory
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from biosimulators_utils.sedml.data_model import (RepeatedTask, ModelLanguage, ModelAttributeChange, ComputeModelChange,
+                                                  SetValueComputeModelChange, ReplaceElementModelChange,
+                                                  RemoveElementModelChange, VectorRange)
+from biosimulators_utils.sedml.math import (compile_math, eval_math, MATHEMATICAL_FUNCTIONS, RESERVED_MATHEMATICAL_SYMBOLS,
+                                            AGGREGATE_MATH_FUNCTIONS)
+from biosimulators_utils.sedml.utils import resolve_range
+from biosimulators_utils.xml.utils import get_namespaces_with_prefixes
+import collections
+import lxml.etree
+import numpy
+import os
+import re
+
+
+__all__ = [
+    'precompute_compute_model_changes',
+    'plan_in_memory_model_changes',
+]
+
+# :obj:`dict`: NumPy implementations of the :obj:`MATHEMATICAL_FUNCTIONS` of SED-ML, which evaluate expressions for arrays
+# of values at once. Functions which aren't overridden fail for arrays, and expressions which use them are evaluated for
+# each value.
+_VECTORIZED_MATHEMATICAL_FUNCTIONS = dict(
+    MATHEMATICAL_FUNCTIONS,
+    abs=numpy.abs,
+    exp=numpy.exp,
+    ln=numpy.log,
+    log=lambda *args: numpy.log(args[-1]) / numpy.log(args[0] if len(args) > 1 else 10.),
+    floor=numpy.floor,
+    ceiling=numpy.ceil,
+    sin=numpy.sin,
+    cos=numpy.cos,
+    tan=numpy.tan,
+    sinh=numpy.sinh,
+    cosh=numpy.cosh,
+    tanh=numpy.tanh,
+    arcsin=numpy.arcsin,
+    arccos=numpy.arccos,
+    arctan=numpy.arctan,
+    arcsinh=numpy.arcsinh,
+    arccosh=numpy.arccosh,
+    arctanh=numpy.arctanh,
+)
+
+# :obj:`tuple`: SED-ML functions which draw random numbers, and whose values would differ if they were evaluated for all of
+# the iterations of a repeated task before its execution
+_RANDOM_MATHEMATICAL_FUNCTIONS = ('uniform', 'normal', 'lognormal', 'poisson', 'gamma')
+
+
+def precompute_compute_model_changes(doc):
+    """ Evaluate the values of the set value changes of the repeated tasks of a SED document which only depend on
+    ranges and parameters for all of the iterations of their tasks at once, and replace the math of each of these changes
+    with a vector range of its values. This avoids compiling and evaluating the math of each change for each iteration.
+
+    Changes which depend on the values of variables of models, which draw random numbers, or whose values can't be
+    evaluated before the execution of their task (e.g., because they depend on functional ranges of variables of models)
+    are left unchanged.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`list` of :obj:`SetValueComputeModelChange`: changes whose values were precomputed
+    """
+    precomputed_changes = []
+    for task in doc.tasks:
+        if not isinstance(task, RepeatedTask):
+            continue
+
+        try:
+            num_iterations = len(resolve_range(task.range))
+        except Exception:
+            continue
+
+        for i_change, change in enumerate(task.changes):
+            if not isinstance(change, SetValueComputeModelChange) or change.variables:
+                continue
+
+            try:
+                compiled_math = compile_math(change.math)
+                if set(compiled_math.co_names).intersection(_RANDOM_MATHEMATICAL_FUNCTIONS):
+                    continue
+
+                range_values = {}
+                if change.range:
+                    range_values[change.range.id] = list(resolve_range(change.range))[0:num_iterations]
+                    if len(range_values[change.range.id]) < num_iterations:
+                        continue
+
+                values = eval_vectorized_math(change.math, compiled_math, range_values,
+                                              {param.id: param.value for param in change.parameters}, num_iterations)
+            except Exception:
+                continue
+
+            values_range = VectorRange(id='__{}_change_{}_values'.format(task.id, i_change), values=values.tolist())
+            task.ranges.append(values_range)
+            change.range = values_range
+            change.math = values_range.id
+            change.parameters = []
+            precomputed_changes.append(change)
+
+    return precomputed_changes
+
+
+def eval_vectorized_math(math, compiled_math, range_values, parameter_values, num_values):
+    """ Evaluate a mathematical expression for each of the values of its ranges at once, using NumPy, or, if the
+    expression can't be evaluated for arrays (e.g., because it uses aggregate functions such as ``max``, which would
+    aggregate the arrays), for each value with :obj:`eval_math`
+
+    Args:
+        math (:obj:`str`): mathematical expression
+        compiled_math (:obj:`_ast.Expression`): compiled expression
+        range_values (:obj:`dict`): dictionary that maps the ids of ranges to their values
+        parameter_values (:obj:`dict`): dictionary that maps the ids of parameters to their values
+        num_values (:obj:`int`): number of values to evaluate
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the expression
+
+    Raises:
+        :obj:`ValueError`: if the expression could not be evaluated
+    """
+    workspace = dict(parameter_values)
+    workspace.update((id, numpy.array(range_value, dtype=numpy.float64)) for id, range_value in range_values.items())
+    if (
+        not set(RESERVED_MATHEMATICAL_SYMBOLS.keys()).intersection(workspace.keys())
+        and not set(compiled_math.co_names).intersection(AGGREGATE_MATH_FUNCTIONS)
+    ):
+        try:
+            with numpy.errstate(all='raise'):
+                values = eval(compiled_math, _VECTORIZED_MATHEMATICAL_FUNCTIONS,
+                              dict(**RESERVED_MATHEMATICAL_SYMBOLS, **workspace))
+                return numpy.broadcast_to(numpy.asarray(values, dtype=numpy.float64), (num_values,)).copy()
+        except Exception:
+            pass
+
+    values = numpy.full((num_values,), numpy.nan)
+    for i_value in range(num_values):
+        workspace = dict(parameter_values)
+        workspace.update((id, range_value[i_value]) for id, range_value in range_values.items())
+        values[i_value] = eval_math(math, compiled_math, workspace)
+    return values
+
+
+def plan_in_memory_model_changes(doc, working_dir):
+    """ Plan which changes of the models of a SED document can be applied to the initial values of their compiled
+    RoadRunner instances (e.g., ``init(k1)``) rather than to their XML. Tasks whose models only differ in these changes
+    can then share a single compilation of their model (see :obj:`load_road_runner`).
+
+    Changes are only applied in memory to local SBML files whose XML isn't read by other elements of the document (e.g.,
+    by the variables of compute changes, repeated tasks and functional ranges, or by other models), and only if they
+    set the initial value of a species, compartment or parameter (see :obj:`get_initial_value_target`) which isn't
+    within an element which is replaced or removed by another change of the model.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+
+    Returns:
+        :obj:`dict`: dictionary that maps the ids of models to the lists of their changes which can be applied in memory
+    """
+    excluded_model_ids = set()
+    variables = []
+    for model in doc.models:
+        if model.source.startswith('#'):
+            excluded_model_ids.add(model.source[1:])
+        for change in model.changes:
+            if isinstance(change, ComputeModelChange):
+                excluded_model_ids.add(model.id)
+                variables.extend(change.variables)
+    for task in doc.tasks:
+        if isinstance(task, RepeatedTask):
+            for change in task.changes:
+                variables.extend(change.variables)
+            for task_range in task.ranges:
+                variables.extend(getattr(task_range, 'variables', []))
+    excluded_model_ids.update(variable.model.id for variable in variables if variable.model is not None)
+
+    plan = {}
+    for model in doc.models:
+        if (
+            model.id in excluded_model_ids
+            or not model.changes
+            or not model.language
+            or not model.language.startswith(ModelLanguage.SBML.value)
+            or model.source.startswith(('#', 'http://', 'https://', 'urn:'))
+        ):
+            continue
+
+        try:
+            model_etree = lxml.etree.parse(os.path.join(working_dir, model.source))
+        except (OSError, lxml.etree.XMLSyntaxError):
+            continue
+
+        # XPaths of the elements which other changes replace or remove
+        structural_paths = []
+        for change in model.changes:
+            if isinstance(change, (ReplaceElementModelChange, RemoveElementModelChange)):
+                try:
+                    elements = model_etree.xpath(change.target, namespaces=get_namespaces_with_prefixes(change.target_namespaces))
+                except lxml.etree.XPathError:
+                    elements = None
+                if not elements or not all(isinstance(element, lxml.etree._Element) for element in elements):
+                    structural_paths = None
+                    break
+                structural_paths.extend(model_etree.getpath(element) for element in elements)
+        if structural_paths is None:
+            continue
+
+        changes = []
+        for change in model.changes:
+            element, attribute = get_model_change_element(model_etree, change)
+            if element is None or get_initial_value_target(element, attribute) is None:
+                continue
+            try:
+                float(change.new_value)
+            except ValueError:
+                continue
+            path = model_etree.getpath(element)
+            if any(path == structural_path or path.startswith(structural_path + '/') for structural_path in structural_paths):
+                continue
+            changes.append(change)
+
+        if changes:
+            plan[model.id] = changes
+
+    return plan
+
+
+def get_model_change_element(model_etree, change):
+    """ Get the element and attribute of an SBML model whose value a model attribute change sets, following the rules
+    which the biosimulators SED-ML interpreter uses to apply changes to XML. Changes whose targets are elements (e.g.,
+    ``/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='S1']``) set the initial concentrations of species,
+    the sizes of compartments and the values of parameters.
+
+    Args:
+        model_etree (:obj:`lxml.etree._ElementTree`): element tree for model
+        change (:obj:`ModelChange`): model change
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`lxml.etree._Element`: element, or :obj:`None` if the change isn't a model attribute change whose
+              target matches a single element
+            * :obj:`str`: attribute, or :obj:`None` if the change isn't applied to an attribute of the XML of the model
+    """
+    if not isinstance(change, ModelAttributeChange):
+        return None, None
+
+    x_path_captures = re.split(r'[\[\]]', change.target)
+    if len(x_path_captures) == 3 and '@' in x_path_captures[1] and x_path_captures[2] == '':
+        x_path = change.target
+        attribute = None
+    else:
+        x_path, sep, attribute = change.target.rpartition('/@')
+        if not sep or ':' in attribute:
+            return None, None
+
+    try:
+        elements = model_etree.xpath(x_path, namespaces=get_namespaces_with_prefixes(change.target_namespaces))
+    except lxml.etree.XPathError:
+        return None, None
+    if len(elements) != 1 or not isinstance(elements[0], lxml.etree._Element):
+        return None, None
+
+    element = elements[0]
+    if attribute is None:
+        attribute = {
+            'species': 'initialConcentration',
+            'compartment': 'size',
+            'parameter': 'value',
+        }.get(lxml.etree.QName(element).localname, None)
+        if attribute is None or element.get(attribute) is None:
+            return None, None
+    return element, attribute
+
+
+def get_initial_value_target(element, attribute):
+    """ Determine whether an attribute of an element of an SBML model is the initial value of a species, compartment,
+    global parameter or local parameter whose value isn't determined by an initial assignment or an assignment rule,
+    and, therefore, whether it can be changed in the compiled model (e.g., ``init(k1)``) rather than in its XML
+
+    Args:
+        element (:obj:`lxml.etree._Element`): element
+        attribute (:obj:`str`): attribute
+
+    Returns:
+        :obj:`tuple`: type of the initial value (``compartment``, ``concentration``, ``amount``, ``parameter`` or
+        ``localParameter``), the id of the component, and the id of the reaction of a local parameter (otherwise
+        :obj:`None`); or :obj:`None` if the attribute isn't such an initial value
+    """
+    if attribute is None or element.get(attribute) is None or element.get('id') is None:
+        return None
+
+    element_type = lxml.etree.QName(element).localname
+    parent = element.getparent()
+    grandparent = parent.getparent() if parent is not None else None
+    if grandparent is None:
+        return None
+
+    if element_type in ['parameter', 'localParameter'] and attribute == 'value' \
+            and lxml.etree.QName(grandparent).localname == 'kineticLaw':
+        return ('localParameter', element.get('id'), grandparent.getparent().get('id'))
+
+    if element_type == 'compartment' and attribute == 'size':
+        initial_value_type = 'compartment'
+    elif element_type == 'species' and attribute == 'initialConcentration':
+        initial_value_type = 'concentration'
+    elif element_type == 'species' and attribute == 'initialAmount':
+        initial_value_type = 'amount'
+    elif element_type == 'parameter' and attribute == 'value':
+        initial_value_type = 'parameter'
+    else:
+        return None
+
+    if lxml.etree.QName(grandparent).localname != 'model':
+        return None
+    determined_ids = grandparent.xpath('*[local-name()="listOfInitialAssignments"]/*[local-name()="initialAssignment"]/@symbol'
+                                       ' | *[local-name()="listOfRules"]/*[local-name()="assignmentRule"]/@variable')
+    if element.get('id') in determined_ids:
+        return None
+
+    return (initial_value_type, element.get('id'), None)
+
+
+def get_in_memory_initial_values(model_etree, changes, model_id, local_parameter_tellurium_id_map):
+    """ Get the initial values of a compiled model (e.g., ``init(k1)``) which implement changes which are applied in
+    memory rather than to the XML of the model (see :obj:`plan_in_memory_model_changes`)
+
+    RoadRunner preserves the amounts of species when the sizes of their compartments change, whereas SBML preserves the
+    initial concentrations of species which are defined by their initial concentrations. Therefore, the initial
+    concentrations of the species of changed compartments are also set.
+
+    Args:
+        model_etree (:obj:`lxml.etree._ElementTree`): element tree for model
+        changes (:obj:`list` of :obj:`ModelAttributeChange`): model changes
+        model_id (:obj:`str`): id of the model
+        local_parameter_tellurium_id_map (:obj:`dict`): dictionary that maps tuples of the ids of reactions and their local
+            parameters to the ids of the global parameters which they were promoted to
+
+    Returns:
+        :obj:`collections.OrderedDict`: dictionary that maps tellurium ids of initial values to their values, in the order
+        in which they must be set (compartments, parameters and then species)
+    """
+    compartment_values = collections.OrderedDict()
+    parameter_values = collections.OrderedDict()
+    species_values = collections.OrderedDict()
+    for change in changes:
+        element, attribute = get_model_change_element(model_etree, change)
+        target = get_initial_value_target(element, attribute) if element is not None else None
+        if target is None:
+            raise ValueError(('The target `{}` of a change of model `{}` must match the initial value of a single species, '
+                              'compartment or parameter.').format(change.target, model_id))
+        initial_value_type, sbml_id, reaction_id = target
+        value = float(change.new_value)
+
+        if initial_value_type == 'compartment':
+            compartment_values['init(' + sbml_id + ')'] = value
+        elif initial_value_type == 'parameter':
+            parameter_values['init(' + sbml_id + ')'] = value
+        elif initial_value_type == 'localParameter':
+            tellurium_id = local_parameter_tellurium_id_map.get((reaction_id, sbml_id), None)
+            if tellurium_id is None:
+                raise NotImplementedError("Unable to process a change to model '" + model_id + "' with the target "
+                                          + change.target + " because the global parameter which the local parameter "
+                                          + "was promoted to could not be determined.")
+            parameter_values['init(' + tellurium_id + ')'] = value
+        elif initial_value_type == 'concentration':
+            species_values['init([' + sbml_id + '])'] = value
+        else:
+            species_values['init(' + sbml_id + ')'] = value
+
+    if compartment_values:
+        for species in model_etree.xpath('/*[local-name()="sbml"]/*[local-name()="model"]'
+                                         '/*[local-name()="listOfSpecies"]/*[local-name()="species"]'):
+            sbml_id = species.get('id')
+            if (
+                'init(' + str(species.get('compartment')) + ')' in compartment_values
+                and get_initial_value_target(species, 'initialConcentration') is not None
+                and 'init([' + sbml_id + '])' not in species_values
+                and 'init(' + sbml_id + ')' not in species_values
+            ):
+                species_values['init([' + sbml_id + '])'] = float(species.get('initialConcentration'))
+
+    return collections.OrderedDict(list(compartment_values.items())
+                                   + list(parameter_values.items())
+                                   + list(species_values.items()))
@@ -0,0 +1,257 @@
+""" Methods for planning the execution of COMBINE/OMEX archives without simulating them
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from .cache import load_road_runner
+from .config import Config as SimulatorConfig
+from .core import preprocess_sed_task, validate_sed_task
+from .data_model import SedmlInterpreter, TaskPlan, ArchivePlan
+from .utils import read_combine_archive_sed_docs, get_range_length
+from biosimulators_utils.config import get_config
+from biosimulators_utils.report.data_model import ReportFormat
+from biosimulators_utils.sedml.data_model import Task, UniformTimeCourseSimulation, Report
+from biosimulators_utils.sedml.utils import (get_models_referenced_by_task, get_variables_for_task,
+                                             resolve_model_and_apply_xml_changes)
+import numpy
+import os
+import shutil
+import tempfile
+
+
+__all__ = [
+    'plan_combine_archive',
+]
+
+# :obj:`int`: estimated number of bytes of each value of the reports which are saved in text formats (e.g., CSV)
+TEXT_REPORT_BYTES_PER_VALUE = 25
+
+# :obj:`int`: estimated number of bytes of the metadata of each report which is saved in HDF5 format (e.g., ids and labels
+# of data sets)
+H5_REPORT_BYTES_OVERHEAD = 12 * 1024
+
+# :obj:`int`: estimated number of bytes of memory of each resident RoadRunner instance per byte of its serialized state
+# (``saveStateS``), measured for BioModels with 2-51 reactions
+ROAD_RUNNER_BYTES_PER_STATE_BYTE = 10
+
+
+def plan_combine_archive(archive_filename, config=None, simulator_config=None):
+    """ Plan the execution of a COMBINE/OMEX archive without simulating it, and estimate the number of its simulations,
+    the sizes of its results, its peak memory and the sizes of its report files
+
+    The models, changes and variables of each task whose results the data generators of the SED documents of the
+    archive need are resolved and validated (:obj:`plan_sed_task`), and errors in them are recorded in the plan. This
+    compiles the models of the tasks with RoadRunner, so planning an archive takes about as long as loading its models.
+    The numbers of simulations and the sizes of the results and reports are estimated from the SED documents alone.
+
+    The tasks of an archive are executed one at a time, and their compiled models are released after their execution,
+    so the peak memory of an archive is estimated as the peak memory of its results plus the memory of the compiled
+    models of its largest task.
+
+    Args:
+        archive_filename (:obj:`str`): path to COMBINE/OMEX archive
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`ArchivePlan`: plan of the execution of the archive
+    """
+    if not config:
+        config = get_config()
+
+    plan = ArchivePlan(archive=archive_filename, tasks=[], num_simulations=0, result_size=0, peak_memory=0,
+                       report_sizes={}, errors=[])
+    result_memory = 0
+
+    archive_dir = tempfile.mkdtemp()
+    try:
+        try:
+            docs = read_combine_archive_sed_docs(archive_filename, archive_dir, config=config)
+        except Exception as exception:
+            plan.errors.append(str(exception))
+            docs = {}
+
+        for location, doc in docs.items():
+            working_dir = os.path.dirname(os.path.join(archive_dir, location))
+
+            task_shapes = {}
+            doc_result_size = 0
+            for task in doc.tasks:
+                variables = get_variables_for_task(doc, task)
+                if not variables:
+                    continue
+
+                task_shapes[task.id] = get_task_result_shape(task)
+                errors, model_memory = plan_sed_task(task, variables, doc, working_dir,
+                                                     config=config, simulator_config=simulator_config)
+                task_plan = TaskPlan(
+                    sed_document=location,
+                    task=task.id,
+                    num_simulations=get_num_task_simulations(task),
+                    num_variables=len(variables),
+                    num_values=int(numpy.prod(task_shapes[task.id])),
+                    result_size=None,
+                    model_memory=model_memory,
+                    errors=errors,
+                )
+                task_plan.result_size = task_plan.num_variables * task_plan.num_values * numpy.dtype('float64').itemsize
+                plan.tasks.append(task_plan)
+                doc_result_size += task_plan.result_size
+
+            # data generators have the padded shapes of their variables
+            data_generator_shapes = {}
+            for data_generator in doc.data_generators:
+                shapes = [task_shapes[variable.task.id] for variable in data_generator.variables
+                          if variable.task and variable.task.id in task_shapes]
+                if shapes:
+                    data_generator_shapes[data_generator.id] = get_padded_shape(shapes)
+                    doc_result_size += int(numpy.prod(data_generator_shapes[data_generator.id])) * numpy.dtype('float64').itemsize
+
+            plan.num_simulations += sum(task_plan.num_simulations for task_plan in plan.tasks
+                                        if task_plan.sed_document == location)
+            plan.result_size += doc_result_size
+            if config.COLLECT_COMBINE_ARCHIVE_RESULTS:
+                result_memory += doc_result_size
+            else:
+                result_memory = max(result_memory, doc_result_size)
+
+            for report in doc.outputs:
+                if not isinstance(report, Report):
+                    continue
+                shapes = [data_generator_shapes.get(data_set.data_generator.id, (0,)) for data_set in report.data_sets]
+                shape = (len(report.data_sets),) + get_padded_shape(shapes) if shapes else (0,)
+                for format in config.REPORT_FORMATS:
+                    if format == ReportFormat.h5:
+                        plan.report_sizes['reports.h5'] = (plan.report_sizes.get('reports.h5', 0)
+                                                           + int(numpy.prod(shape)) * numpy.dtype('float64').itemsize
+                                                           + H5_REPORT_BYTES_OVERHEAD)
+                    elif len(shape) <= 2:
+                        # multidimensional reports can't be saved in tabular formats
+                        plan.report_sizes[os.path.join(location, report.id + '.' + format.value)] = (
+                            int(numpy.prod(shape)) * TEXT_REPORT_BYTES_PER_VALUE)
+
+    finally:
+        shutil.rmtree(archive_dir)
+
+    plan.peak_memory = result_memory + max((task_plan.model_memory for task_plan in plan.tasks), default=0)
+
+    return plan
+
+
+def plan_sed_task(task, variables, doc, working_dir, config=None, simulator_config=None):
+    """ Resolve and validate the models, changes and variables of a SED task without simulating it, and estimate the
+    memory of its compiled models
+
+    With the BioSimulators SED-ML interpreter, the task is preprocessed (:obj:`preprocess_sed_task`) as for its
+    execution. Because the tellurium SED-ML interpreter executes tasks with code generated by tellurium, with it, the
+    task is only validated with the checks which don't depend on the interpreter (:obj:`validate_sed_task`), and each
+    model of the task is compiled once. Compiled models are cached (up to ``simulator_config.model_cache_size`` models),
+    so executing the task in the same process afterwards doesn't compile them again.
+
+    The memory of each compiled model is estimated from the size of its serialized state
+    (:obj:`ROAD_RUNNER_BYTES_PER_STATE_BYTE`). Instances which the preprocessed task evicts from memory
+    (``simulator_config.max_resident_models``) only occupy the size of their serialized states.
+
+    Args:
+        task (:obj:`AbstractTask`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        doc (:obj:`SedDocument`): SED document of the task
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`str`: errors in the task
+            * :obj:`int`: estimated memory in bytes of the compiled models of the task (0 if the task is invalid)
+    """
+    if not simulator_config:
+        simulator_config = SimulatorConfig()
+
+    models = get_models_referenced_by_task(task)
+    original_models = [(model, model.source, model.changes) for model in models]
+    temp_model_sources = []
+    try:
+        for model in models:
+            temp_model, temp_model_source, _, _ = resolve_model_and_apply_xml_changes(
+                model, doc, working_dir, apply_xml_model_changes=True)
+            model.source = temp_model.source
+            model.changes = temp_model.changes
+            if temp_model_source:
+                temp_model_sources.append(temp_model_source)
+
+        if simulator_config.sedml_interpreter == SedmlInterpreter.biosimulators:
+            preprocessed_task = preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            state_sizes = sorted(preprocessed_task.road_runners.get_state_sizes().values(), reverse=True)
+            num_resident = preprocessed_task.road_runners.max_resident or len(state_sizes)
+
+        else:
+            validate_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            state_sizes = [len(load_road_runner(source, simulator_config=simulator_config).saveStateS())
+                           for source in set(model.source for model in models)]
+            num_resident = len(state_sizes)
+
+        return [], ROAD_RUNNER_BYTES_PER_STATE_BYTE * sum(state_sizes[:num_resident]) + sum(state_sizes[num_resident:])
+
+    except Exception as exception:
+        return [str(exception)], 0
+
+    finally:
+        for model, source, changes in original_models:
+            model.source = source
+            model.changes = changes
+        for temp_model_source in temp_model_sources:
+            os.remove(temp_model_source)
+
+
+def get_num_task_simulations(task):
+    """ Get the number of simulations which a SED task executes, including the simulations of the sub-tasks of each
+    iteration of repeated tasks
+
+    Args:
+        task (:obj:`AbstractTask`): task
+
+    Returns:
+        :obj:`int`: number of simulations
+    """
+    if isinstance(task, Task):
+        return 1
+    return get_range_length(task.range) * sum(get_num_task_simulations(sub_task.task) for sub_task in task.sub_tasks)
+
+
+def get_task_result_shape(task):
+    """ Get the shape of the results of the variables of a SED task. The results of repeated tasks have a dimension for
+    their iterations and a dimension for their sub-tasks, and the results of their sub-tasks are padded to a consistent
+    shape.
+
+    Args:
+        task (:obj:`AbstractTask`): task
+
+    Returns:
+        :obj:`tuple` of :obj:`int`: shape
+    """
+    if isinstance(task, Task):
+        if isinstance(task.simulation, UniformTimeCourseSimulation):
+            return (task.simulation.number_of_steps + 1,)
+        return (1,)
+
+    return (get_range_length(task.range), len(task.sub_tasks)) + get_padded_shape(
+        [get_task_result_shape(sub_task.task) for sub_task in task.sub_tasks])
+
+
+def get_padded_shape(shapes):
+    """ Get the shape to which arrays with several shapes are padded (see :obj:`pad_arrays_to_consistent_shapes`)
+
+    Args:
+        shapes (:obj:`list` of :obj:`tuple` of :obj:`int`): shapes
+
+    Returns:
+        :obj:`tuple` of :obj:`int`: padded shape
+    """
+    num_dims = max((len(shape) for shape in shapes), default=0)
+    return tuple(
+        max((shape[i_dim] for shape in shapes if i_dim < len(shape)), default=0)
+        for i_dim in range(num_dims)
+    )
@@ -0,0 +1,123 @@
+""" Tau-leaping simulation of the stochastic kinetics of RoadRunner models
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+import numpy
+
+
+__all__ = [
+    'simulate_tau_leaping',
+]
+
+# :obj:`float`: minimum expected number of firings of reactions in a leap of the tau-leaping method. Steps whose selected
+# leaps are shorter than this are executed exactly with the direct method.
+TAU_LEAPING_MIN_EXPECTED_FIRINGS = 10.
+
+
+def simulate_tau_leaping(road_runner, integrator, start_time, end_time, number_of_points):
+    """ Simulate a time course of the model of a RoadRunner instance with the Poisson tau-leaping method
+
+    The propensities of the reactions are their rates, as computed by the compiled model, and the changes of the amounts of
+    the floating species are given by the full stoichiometry matrix of the model. The number of firings of each reaction
+    in each leap is sampled from a Poisson distribution. The length of each leap is selected so that the expected changes
+    of the amounts of the species, and their standard deviations, are at most ``integrator.epsilon`` times their amounts
+    (or 1) [Cao, Gillespie & Petzold, J Chem Phys 124:044109, 2006]. When fewer than
+    :obj:`TAU_LEAPING_MIN_EXPECTED_FIRINGS` firings are expected in a leap, a single reaction is fired exactly with the
+    direct method instead. If ``integrator.nonnegative`` is :obj:`True`, leaps which would result in negative species
+    amounts are rejected and retried with half the length, and exact firings which would result in negative species
+    amounts are skipped.
+
+    Args:
+        road_runner (:obj:`roadrunner.RoadRunner`): RoadRunner instance
+        integrator (:obj:`TauLeapingIntegrator`): configuration of the method
+        start_time (:obj:`float`): start time
+        end_time (:obj:`float`): end time
+        number_of_points (:obj:`int`): number of time points, including the start and end times
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the time course selections of the instance, with one row for each time point
+
+    Raises:
+        :obj:`NotImplementedError`: if the model has events or rate rules
+        :obj:`ValueError`: if the rate of a reaction is negative
+    """
+    model = road_runner.model
+    if model.getNumEvents() or model.getNumRateRules():
+        raise NotImplementedError('The tau-leaping method does not support models with events or rate rules.')
+
+    # index the rows and columns of the stoichiometry matrix by the ids of the species and reactions, because their orders
+    # can differ from the orders of the amounts of the species and the rates of the reactions of the compiled model
+    full_stoichiometry = road_runner.getFullStoichiometryMatrix()
+    species_rows = {species_id: i_row for i_row, species_id in enumerate(full_stoichiometry.rownames)}
+    reaction_columns = {reaction_id: i_column for i_column, reaction_id in enumerate(full_stoichiometry.colnames)}
+    stoichiometry = numpy.zeros((model.getNumFloatingSpecies(), model.getNumReactions()))
+    for i_species, species_id in enumerate(model.getFloatingSpeciesIds()):
+        if species_id in species_rows:
+            for i_reaction, reaction_id in enumerate(model.getReactionIds()):
+                stoichiometry[i_species, i_reaction] = full_stoichiometry[species_rows[species_id], reaction_columns[reaction_id]]
+    squared_stoichiometry = stoichiometry ** 2
+    random_number_generator = integrator.get_random_number_generator()
+
+    time = start_time
+    model.setTime(time)
+    amounts = numpy.array(model.getFloatingSpeciesAmounts(), dtype=float)
+
+    results = numpy.empty((number_of_points, len(road_runner.timeCourseSelections)))
+    results[0, :] = road_runner.getSelectedValues()
+    for i_point, point_time in enumerate(numpy.linspace(start_time, end_time, number_of_points)[1:], 1):
+        max_leap = numpy.inf
+        while time < point_time:
+            propensities = numpy.array(model.getReactionRates(), dtype=float)
+            if numpy.any(propensities < 0):
+                if numpy.all(amounts >= 0):
+                    raise ValueError('The rates of reactions {} are negative at time {}. The tau-leaping method requires '
+                                     'the reversible reactions of models to be split into pairs of irreversible reactions.'.format(
+                                         ', '.join(numpy.array(model.getReactionIds())[propensities < 0]), time))
+                # species with negative amounts (``nonnegative`` is false) can't react
+                propensities = numpy.maximum(propensities, 0.)
+            total_propensity = propensities.sum()
+            if total_propensity == 0:
+                time = point_time
+                break
+
+            # select the length of the leap
+            bounds = numpy.maximum(integrator.epsilon * numpy.abs(amounts), 1.)
+            with numpy.errstate(divide='ignore'):
+                leap = min(
+                    numpy.min(bounds / numpy.abs(stoichiometry @ propensities)),
+                    numpy.min(bounds ** 2 / (squared_stoichiometry @ propensities)),
+                    max_leap,
+                )
+
+            if leap * total_propensity < TAU_LEAPING_MIN_EXPECTED_FIRINGS:
+                # fire a single reaction with the direct method; because firings are memoryless, a firing after the next
+                # time point can be discarded
+                leap = random_number_generator.exponential(1. / total_propensity)
+                if leap >= point_time - time:
+                    time = point_time
+                    break
+                reaction = random_number_generator.choice(len(propensities), p=propensities / total_propensity)
+                new_amounts = amounts + stoichiometry[:, reaction]
+                if not integrator.nonnegative or numpy.all(new_amounts >= 0):
+                    amounts = new_amounts
+                time += leap
+
+            else:
+                leap = min(leap, point_time - time)
+                new_amounts = amounts + stoichiometry @ random_number_generator.poisson(propensities * leap)
+                if integrator.nonnegative and numpy.any(new_amounts < 0):
+                    max_leap = leap / 2
+                    continue
+                amounts = new_amounts
+                time = point_time if leap == point_time - time else time + leap
+                max_leap = numpy.inf
+
+            model.setTime(time)
+            model.setFloatingSpeciesAmounts(amounts)
+
+        model.setTime(point_time)
+        results[i_point, :] = road_runner.getSelectedValues()
+
+    return results
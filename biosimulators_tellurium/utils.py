@@ -0,0 +1,149 @@
+""" Utilities for reading and writing COMBINE/OMEX archives and SED documents
+
+:Date: 2026-10-19
+:License: MIT
+"""
+
+from biosimulators_utils.combine.io import CombineArchiveReader
+from biosimulators_utils.combine.utils import get_sedml_contents
+from biosimulators_utils.sedml.data_model import RepeatedTask, Report, Plot2D, Plot3D
+from biosimulators_utils.sedml.io import SedmlSimulationReader, SedmlSimulationWriter
+from biosimulators_utils.sedml.utils import resolve_range
+import collections
+import libsedml
+import os
+
+
+__all__ = [
+    'read_combine_archive_sed_docs',
+    'get_data_generators_for_outputs',
+    'get_tasks_for_data_generators',
+    'write_sed_doc_to_string',
+]
+
+
+def read_combine_archive_sed_docs(archive_filename, archive_dir, config=None):
+    """ Unpack a COMBINE/OMEX archive and read the SED documents which it executes, without validating them
+
+    Args:
+        archive_filename (:obj:`str`): path to COMBINE/OMEX archive
+        archive_dir (:obj:`str`): directory to unpack the archive to
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`collections.OrderedDict`: dictionary that maps the location of each SED document within the archive to the
+            document
+    """
+    archive = CombineArchiveReader().run(archive_filename, archive_dir, config=config)
+
+    docs = collections.OrderedDict()
+    for content in get_sedml_contents(archive):
+        filename = os.path.join(archive_dir, content.location)
+        docs[os.path.relpath(filename, archive_dir)] = SedmlSimulationReader().run(
+            filename, validate_semantics=False, validate_models_with_languages=False,
+            validate_targets_with_model_sources=False, config=config)
+    return docs
+
+
+def get_range_length(task_range):
+    """ Get the number of iterations of a range of a repeated task, without executing the task
+
+    Args:
+        task_range (:obj:`Range`): range
+
+    Returns:
+        :obj:`int`: number of iterations of the range (1 if it can't be determined)
+    """
+    while task_range is not None:
+        try:
+            return len(resolve_range(task_range))
+        except Exception:
+            # functional ranges which depend on models have the lengths of their ranges
+            task_range = getattr(task_range, 'range', None)
+    return 1
+
+
+def get_data_generators_for_outputs(doc):
+    """ Get the data generators of a SED document which are used by its outputs
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`list` of :obj:`DataGenerator`: data generators used by the outputs of the document, in the order of
+            :obj:`SedDocument.data_generators`
+    """
+    data_generator_ids = set()
+    for output in doc.outputs:
+        if isinstance(output, Report):
+            for data_set in output.data_sets:
+                data_generator_ids.add(data_set.data_generator.id)
+        elif isinstance(output, Plot2D):
+            for curve in output.curves:
+                data_generator_ids.add(curve.x_data_generator.id)
+                data_generator_ids.add(curve.y_data_generator.id)
+        elif isinstance(output, Plot3D):
+            for surface in output.surfaces:
+                data_generator_ids.add(surface.x_data_generator.id)
+                data_generator_ids.add(surface.y_data_generator.id)
+                data_generator_ids.add(surface.z_data_generator.id)
+
+    return [data_generator for data_generator in doc.data_generators if data_generator.id in data_generator_ids]
+
+
+def get_tasks_for_data_generators(doc):
+    """ Get the tasks of a SED document which are needed to compute its data generators, including the sub-tasks of
+    repeated tasks
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`list` of :obj:`AbstractTask`: tasks needed for the data generators of the document, in the order of
+            :obj:`SedDocument.tasks`
+    """
+    task_ids = set()
+
+    def add_task(task):
+        if task.id not in task_ids:
+            task_ids.add(task.id)
+            if isinstance(task, RepeatedTask):
+                for sub_task in task.sub_tasks:
+                    add_task(sub_task.task)
+
+    for data_generator in doc.data_generators:
+        for variable in data_generator.variables:
+            if variable.task:
+                add_task(variable.task)
+
+    return [task for task in doc.tasks if task.id in task_ids]
+
+
+class _SedmlSimulationStringWriter(SedmlSimulationWriter):
+    """ Writer which encodes SED documents into SED-ML strings rather than files
+
+    Attributes:
+        sedml (:obj:`str`): SED-ML for the last document which was written
+    """
+
+    def _export_doc(self, filename):
+        self.sedml = libsedml.writeSedMLToString(self._doc_sed)
+
+
+def write_sed_doc_to_string(doc):
+    """ Encode a SED document into a SED-ML string in memory
+
+    The document is not validated because it has already been validated when it was read.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`str`: SED-ML
+    """
+    writer = _SedmlSimulationStringWriter()
+    writer.run(doc, 'simulation.sedml',
+               validate_semantics=False,
+               validate_models_with_languages=False,
+               validate_targets_with_model_sources=False)
+    return writer.sedml
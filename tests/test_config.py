@@ -29,5 +29,148 @@ class ConfigTestCase(unittest.TestCase):
             with self.assertRaises(NotImplementedError):
                 Config()
 
+        # plot data
+        self.assertTrue(Config().save_plot_data)
+        with mock.patch.dict(os.environ, {'SAVE_PLOT_DATA': '0'}):
+            self.assertFalse(Config().save_plot_data)
+
+        # scratch directory
+        self.assertEqual(Config().scratch_dir, None)
+        with mock.patch.dict(os.environ, {'SCRATCH_DIR': '/dev/shm'}):
+            self.assertEqual(Config().scratch_dir, '/dev/shm')
+
+        # caching and batch execution
+        with mock.patch.dict(os.environ, {'MODEL_CACHE_SIZE': '4', 'NUM_WORKERS': '3'}):
+            self.assertEqual(Config().model_cache_size, 4)
+            self.assertEqual(Config().num_workers, 3)
+
+        with mock.patch.dict(os.environ, {'MODEL_CACHE_SIZE': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        with mock.patch.dict(os.environ, {'CODE_CACHE_SIZE': '2'}):
+            self.assertEqual(Config().code_cache_size, 2)
+
+        with mock.patch.dict(os.environ, {'CODE_CACHE_SIZE': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        # result cache
+        self.assertEqual(Config().result_cache_size, 0)
+        self.assertEqual(Config().result_cache_dir, None)
+
+        with mock.patch.dict(os.environ, {'RESULT_CACHE_SIZE': '8', 'RESULT_CACHE_DIR': '/tmp/results'}):
+            config = Config()
+            self.assertEqual(config.result_cache_size, 8)
+            self.assertEqual(config.result_cache_dir, '/tmp/results')
+
+        # validation cache
+        self.assertEqual(Config().validation_cache_size, 256)
+        self.assertEqual(Config().validation_cache_dir, None)
+
+        with mock.patch.dict(os.environ, {'VALIDATION_CACHE_SIZE': '2', 'VALIDATION_CACHE_DIR': '/tmp/validations'}):
+            config = Config()
+            self.assertEqual(config.validation_cache_size, 2)
+            self.assertEqual(config.validation_cache_dir, '/tmp/validations')
+
+        with mock.patch.dict(os.environ, {'VALIDATION_CACHE_SIZE': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        with mock.patch.dict(os.environ, {'RESULT_CACHE_SIZE': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        with mock.patch.dict(os.environ, {'NUM_WORKERS': '0'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        self.assertEqual(Config().runtime_db, None)
+        with mock.patch.dict(os.environ, {'RUNTIME_DB': '/tmp/runtimes.json'}):
+            self.assertEqual(Config().runtime_db, '/tmp/runtimes.json')
+
+        # HDF5 compression
+        self.assertEqual(Config().h5_compression, 'gzip')
+        with mock.patch.dict(os.environ, {'H5_COMPRESSION': 'LZF'}):
+            self.assertEqual(Config().h5_compression, 'lzf')
+        with mock.patch.dict(os.environ, {'H5_COMPRESSION': 'zstd'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        # incremental execution
+        self.assertFalse(Config().incremental)
+        with mock.patch.dict(os.environ, {'INCREMENTAL': '1'}):
+            self.assertTrue(Config().incremental)
+
+        # checkpoints
+        self.assertFalse(Config().checkpoint)
+        with mock.patch.dict(os.environ, {'CHECKPOINT': '1'}):
+            self.assertTrue(Config().checkpoint)
+
+        # task deduplication
+        self.assertFalse(Config().deduplicate_tasks)
+        with mock.patch.dict(os.environ, {'DEDUPLICATE_TASKS': '1'}):
+            self.assertTrue(Config().deduplicate_tasks)
+
+        # in-memory model changes
+        self.assertFalse(Config().in_memory_model_changes)
+        with mock.patch.dict(os.environ, {'IN_MEMORY_MODEL_CHANGES': '1'}):
+            self.assertTrue(Config().in_memory_model_changes)
+
+        # model sharing
+        self.assertFalse(Config().share_models)
+        with mock.patch.dict(os.environ, {'SHARE_MODELS': '1'}):
+            self.assertTrue(Config().share_models)
+
+        # resident models
+        self.assertEqual(Config().max_resident_models, 0)
+        with mock.patch.dict(os.environ, {'MAX_RESIDENT_MODELS': '2'}):
+            self.assertEqual(Config().max_resident_models, 2)
+
+        with mock.patch.dict(os.environ, {'MAX_RESIDENT_MODELS': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        # divergence checks
+        self.assertEqual(Config().simulation_chunk_size, 0)
+        self.assertEqual(Config().max_absolute_value, float('inf'))
+        with mock.patch.dict(os.environ, {'SIMULATION_CHUNK_SIZE': '100', 'MAX_ABSOLUTE_VALUE': '1e12'}):
+            self.assertEqual(Config().simulation_chunk_size, 100)
+            self.assertEqual(Config().max_absolute_value, 1e12)
+
+        with mock.patch.dict(os.environ, {'SIMULATION_CHUNK_SIZE': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        with mock.patch.dict(os.environ, {'MAX_ABSOLUTE_VALUE': '0'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        # fallbacks of steady-state solvers
+        self.assertEqual(Config().steady_state_solver_fallbacks, ['KISAO_0000569'])
+        with mock.patch.dict(os.environ, {'STEADY_STATE_SOLVER_FALLBACKS': 'KISAO_0000282, KISAO_0000569'}):
+            self.assertEqual(Config().steady_state_solver_fallbacks, ['KISAO_0000282', 'KISAO_0000569'])
+        with mock.patch.dict(os.environ, {'STEADY_STATE_SOLVER_FALLBACKS': ''}):
+            self.assertEqual(Config().steady_state_solver_fallbacks, [])
+        with mock.patch.dict(os.environ, {'STEADY_STATE_SOLVER_FALLBACKS': 'KISAO_0000019'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        # time limits
+        self.assertEqual(Config().task_time_limit, 0.)
+        self.assertEqual(Config().archive_time_limit, 0.)
+        self.assertEqual(Config().deadline, None)
+        with mock.patch.dict(os.environ, {'TASK_TIME_LIMIT': '60', 'ARCHIVE_TIME_LIMIT': '3600'}):
+            self.assertEqual(Config().task_time_limit, 60.)
+            self.assertEqual(Config().archive_time_limit, 3600.)
+
+        with mock.patch.dict(os.environ, {'TASK_TIME_LIMIT': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
+        with mock.patch.dict(os.environ, {'ARCHIVE_TIME_LIMIT': '-1'}):
+            with self.assertRaises(ValueError):
+                Config()
+
 if __name__ == "__main__":
     unittest.main()
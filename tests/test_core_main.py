@@ -7,37 +7,57 @@
 """
 
 from biosimulators_tellurium import __main__
+from biosimulators_tellurium import batch
+from biosimulators_tellurium import cache
+from biosimulators_tellurium import checkpoint
 from biosimulators_tellurium import core
+from biosimulators_tellurium import dedup
+from biosimulators_tellurium import model_changes
+from biosimulators_tellurium import planning
+from biosimulators_tellurium import tau_leaping
+from biosimulators_tellurium import utils as tellurium_utils
 from biosimulators_tellurium.config import Config as SimulatorConfig
-from biosimulators_tellurium.data_model import SedmlInterpreter
+from biosimulators_tellurium.data_model import SedmlInterpreter, TaskPlan, TauLeapingIntegrator, KISAO_ALGORITHM_SCHEMAS
 from biosimulators_utils.archive.io import ArchiveReader
 from biosimulators_utils.combine import data_model as combine_data_model
 from biosimulators_utils.combine.io import CombineArchiveWriter
 from biosimulators_utils.config import get_config
-from biosimulators_utils.log.data_model import Status
-from biosimulators_utils.report.io import ReportReader
+from biosimulators_utils.log.data_model import Status, TaskLog
+from biosimulators_utils.report.io import ReportReader, ReportWriter
 from biosimulators_utils.report import data_model as report_data_model
 from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.sedml import utils
+from biosimulators_utils.sedml import validation
 from biosimulators_utils.sedml.data_model import Report, DataSet
 from biosimulators_utils.sedml.io import SedmlSimulationWriter
 from biosimulators_utils.sedml.utils import append_all_nested_children_to_doc
 from biosimulators_utils.simulator.exec import exec_sedml_docs_in_archive_with_containerized_simulator
 from biosimulators_utils.simulator.specs import gen_algorithms_from_specs
 from biosimulators_utils.warnings import BioSimulatorsWarning
+from kisao.data_model import AlgorithmSubstitutionPolicy
 from kisao.exceptions import AlgorithmCannotBeSubstitutedException
 from kisao.warnings import AlgorithmSubstitutedWarning
 from unittest import mock
+import collections
+import concurrent.futures
 import copy
+import h5py
+import io
 import json
+import lxml.etree
 import numpy
 import numpy.testing
 import os
 import PyPDF2
+import roadrunner
 import shutil
+import tellurium
 import tellurium.sedml.tesedml
 import tempfile
 import unittest
+import warnings
 import yaml
+import zipfile
 
 
 class CoreTestCase(unittest.TestCase):
@@ -318,6 +338,206 @@ class CoreTestCase(unittest.TestCase):
         self.assertGreater(variable_results['C'], 0)
         self.assertGreater(variable_results['M'], 0)
 
+        solver_statistics = log.simulator_details['solverStatistics']
+        self.assertGreaterEqual(solver_statistics['steadyStateAttempts'], 1)
+        self.assertEqual(sum(solver_statistics['presimulationTimes'].values()), 1)
+
+    def test_exec_sed_task_steady_state_solver_fallbacks_with_biosimulators(self):
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.SteadyStateSimulation(
+                algorithm=sedml_data_model.Algorithm(
+                    kisao_id='KISAO_0000282',
+                ),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(
+                id='C',
+                target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                target_namespaces=self.NAMESPACES,
+                task=task),
+        ]
+
+        # KINSOL
+        expected_results, log = core.exec_sed_task(task, variables)
+        self.assertEqual(log.simulator_details['solver'], 'newton')
+        solver_statistics = log.simulator_details['solverStatistics']
+        self.assertEqual(set(solver_statistics['steadyStateSolvers'].keys()), set(['newton']))
+        self.assertEqual(solver_statistics['steadyStateSolvers']['newton']['successes'], 1)
+
+        # KINSOL with a line search
+        task.simulation.algorithm.changes = [
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000476', new_value='linesearch'),
+        ]
+        results, log = core.exec_sed_task(task, variables)
+        self.assertEqual(log.simulator_details['solver'], 'newton_linesearch')
+        solver_statistics = log.simulator_details['solverStatistics']
+        self.assertEqual(solver_statistics['steadyStateSolvers']['newton_linesearch']['successes'], 1)
+        numpy.testing.assert_allclose(results['C'], expected_results['C'], rtol=1e-6)
+
+        task.simulation.algorithm.changes = [
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000476', new_value='trust_region'),
+        ]
+        config = get_config()
+        config.ALGORITHM_SUBSTITUTION_POLICY = AlgorithmSubstitutionPolicy.NONE
+        with self.assertRaisesRegex(ValueError, 'not a valid string value'):
+            core.preprocess_sed_task(task, variables, config=config)
+
+        # fall back to NLEQ2 when KINSOL fails, and then restore KINSOL
+        task.simulation.algorithm.changes = [
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000486', new_value='1'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000674', new_value='false'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000682', new_value='false'),
+        ]
+        preprocessed_task = core.preprocess_sed_task(task, variables)
+        with mock.patch.object(roadrunner.RoadRunner, 'loadStateS', autospec=True,
+                               side_effect=roadrunner.RoadRunner.loadStateS) as load_state:
+            results, log = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        # the fallback starts from the state from which KINSOL started
+        self.assertEqual(load_state.call_count, 1)
+        numpy.testing.assert_allclose(results['C'], expected_results['C'], rtol=1e-6)
+        solver_statistics = log.simulator_details['solverStatistics']
+        self.assertEqual(solver_statistics['steadyStateAttempts'], 2)
+        self.assertEqual(solver_statistics['steadyStateSolvers']['newton']['attempts'], 1)
+        self.assertNotIn('successes', solver_statistics['steadyStateSolvers']['newton'])
+        self.assertEqual(solver_statistics['steadyStateSolvers']['nleq2']['successes'], 1)
+        self.assertEqual(preprocessed_task.road_runners[task.id].getSteadyStateSolver().getName(), 'newton')
+        self.assertEqual(preprocessed_task.solvers[task.id].num_max_iters, 1)
+
+        # without fallbacks
+        simulator_config = SimulatorConfig()
+        simulator_config.steady_state_solver_fallbacks = []
+        preprocessed_task = core.preprocess_sed_task(task, variables, simulator_config=simulator_config)
+        with self.assertRaisesRegex(ValueError, 'Steady state analysis failed'):
+            core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, simulator_config=simulator_config)
+        self.assertEqual(preprocessed_task.road_runners[task.id].getSteadyStateSolver().getName(), 'newton')
+        self.assertEqual(preprocessed_task.solvers[task.id].num_max_iters, 1)
+
+    def test_exec_sed_task_tau_leaping_with_biosimulators(self):
+        model_filename = os.path.join(self.dirname, 'model.xml')
+        with open(model_filename, 'w') as file:
+            file.write(tellurium.antimonyToSBML('''
+                J1: -> S; k1
+                J2: S -> ; k2 * S
+                k1 = 1000; k2 = 0.1; S = 0
+            '''))
+        namespaces = {'sbml': 'http://www.sbml.org/sbml/level3/version2/core'}
+
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=model_filename,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=50.,
+                number_of_points=10,
+                algorithm=sedml_data_model.Algorithm(
+                    kisao_id='KISAO_0000040',
+                    changes=[
+                        sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000488', new_value='3'),
+                    ],
+                ),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(
+                id='S',
+                target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='S']",
+                target_namespaces=namespaces,
+                task=task),
+        ]
+
+        variable_results, log = core.exec_sed_task(task, variables)
+        numpy.testing.assert_allclose(variable_results['Time'], numpy.linspace(0., 50., 11))
+        self.assertEqual(log.algorithm, 'KISAO_0000040')
+        self.assertEqual(log.simulator_details['solver'], 'tau_leaping')
+        self.assertEqual(log.simulator_details['seed'], 3)
+
+        # species are simulated in copy numbers, which are approximately those of the deterministic model
+        numpy.testing.assert_allclose(variable_results['S'], numpy.round(variable_results['S']))
+        expected_s = 1000. / 0.1 * (1 - numpy.exp(-0.1 * variable_results['Time']))
+        numpy.testing.assert_allclose(variable_results['S'][1:], expected_s[1:], rtol=0.1)
+
+        # simulations with fixed seeds are reproducible
+        other_variable_results, _ = core.exec_sed_task(task, variables)
+        numpy.testing.assert_allclose(other_variable_results['S'], variable_results['S'])
+
+        # the random number generator is seeded once per preprocessed task, rather than for each execution
+        preprocessed_task = core.preprocess_sed_task(task, variables)
+        first_results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        core.reset_all_models(preprocessed_task)
+        second_results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        numpy.testing.assert_allclose(first_results['S'], variable_results['S'])
+        self.assertFalse(numpy.array_equal(second_results['S'], first_results['S']))
+
+        task.simulation.algorithm.changes[0].new_value = '4'
+        other_variable_results, _ = core.exec_sed_task(task, variables)
+        self.assertFalse(numpy.array_equal(other_variable_results['S'], variable_results['S']))
+
+        # small copy numbers are simulated exactly, and never become negative
+        task.simulation.algorithm.changes.append(
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000673', new_value='true'))
+        task.model.source = os.path.join(self.dirname, 'model-small.xml')
+        with open(task.model.source, 'w') as file:
+            file.write(tellurium.antimonyToSBML('''
+                J1: S -> ; k2 * S
+                k2 = 0.1; S = 20
+            '''))
+        variable_results, _ = core.exec_sed_task(task, variables)
+        numpy.testing.assert_allclose(variable_results['S'], numpy.round(variable_results['S']))
+        self.assertTrue(numpy.all(variable_results['S'] >= 0))
+        self.assertTrue(numpy.all(numpy.diff(variable_results['S']) <= 0))
+
+        # tau-leaping can be substituted for other tau-leaping methods
+        task.simulation.algorithm.kisao_id = 'KISAO_0000084'
+        with mock.patch.dict('os.environ', {'ALGORITHM_SUBSTITUTION_POLICY': 'SIMILAR_APPROXIMATIONS'}):
+            with self.assertWarns(AlgorithmSubstitutedWarning):
+                _, log = core.exec_sed_task(task, variables)
+        self.assertEqual(log.algorithm, 'KISAO_0000040')
+
+    def test_simulate_tau_leaping_with_reordered_species(self):
+        # the analysis of conserved moieties orders the floating species differently from their declaration (C, A, B)
+        road_runner = roadrunner.RoadRunner()
+        road_runner.conservedMoietyAnalysis = True
+        road_runner.load(tellurium.antimonyToSBML('''
+            species C, A, B
+            J1: A -> B; k1 * A
+            k1 = 0.1; A = 1000; B = 0; C = 50
+        '''))
+        self.assertEqual(list(road_runner.model.getFloatingSpeciesIds()), ['A', 'C', 'B'])
+        road_runner.timeCourseSelections = ['time', 'C', 'A', 'B']
+
+        integrator = TauLeapingIntegrator()
+        integrator.seed = 1
+        results = tau_leaping.simulate_tau_leaping(road_runner, integrator, 0., 10., 6)
+        numpy.testing.assert_allclose(results[:, 1], numpy.full((6,), 50.))
+        numpy.testing.assert_allclose(results[:, 2] + results[:, 3], numpy.full((6,), 1000.))
+        self.assertTrue(numpy.all(numpy.diff(results[:, 2]) < 0))
+
+        # the rows of the stoichiometry matrix are matched to the species by their ids
+        stoichiometry = road_runner.getFullStoichiometryMatrix()
+        permuted_stoichiometry = stoichiometry.__class__(stoichiometry.shape)
+        permuted_stoichiometry[:] = numpy.array(stoichiometry)[::-1, :]
+        permuted_stoichiometry.rownames = list(stoichiometry.rownames)[::-1]
+        permuted_stoichiometry.colnames = list(stoichiometry.colnames)
+
+        road_runner.resetAll()
+        integrator = TauLeapingIntegrator()
+        integrator.seed = 1
+        with mock.patch.object(roadrunner.RoadRunner, 'getFullStoichiometryMatrix', return_value=permuted_stoichiometry):
+            numpy.testing.assert_allclose(tau_leaping.simulate_tau_leaping(road_runner, integrator, 0., 10., 6), results)
+
     def test_exec_sed_task_alg_substitution_with_biosimulators(self):
         # configure simulation
         task = sedml_data_model.Task(
@@ -387,6 +607,54 @@ class CoreTestCase(unittest.TestCase):
             with self.assertWarns(BioSimulatorsWarning):
                 core.exec_sed_task(task_2, variables)
 
+    def test_get_algorithm_substitution(self):
+        cache._ALGORITHM_SUBSTITUTION_CACHE.pop(('KISAO_0000088', AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES), None)
+        cache._ALGORITHM_SUBSTITUTION_CACHE.pop(('KISAO_0000088', AlgorithmSubstitutionPolicy.NONE), None)
+
+        with mock.patch('biosimulators_tellurium.cache.get_preferred_substitute_algorithm_by_ids') as get_substitute:
+            self.assertEqual(cache.get_algorithm_substitution('KISAO_0000019', AlgorithmSubstitutionPolicy.NONE), 'KISAO_0000019')
+            get_substitute.assert_not_called()
+
+        with mock.patch('biosimulators_tellurium.cache.get_preferred_substitute_algorithm_by_ids',
+                        wraps=cache.get_preferred_substitute_algorithm_by_ids) as get_substitute:
+            for _ in range(2):
+                with self.assertWarns(AlgorithmSubstitutedWarning):
+                    self.assertEqual(cache.get_algorithm_substitution('KISAO_0000088', AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES),
+                                     'KISAO_0000019')
+                with self.assertRaises(AlgorithmCannotBeSubstitutedException):
+                    cache.get_algorithm_substitution('KISAO_0000088', AlgorithmSubstitutionPolicy.NONE)
+            self.assertEqual(get_substitute.call_count, 2)
+
+    def test_get_solver_configuration(self):
+        cache._SOLVER_CONFIGURATION_CACHE.clear()
+        config = get_config()
+        algorithm = sedml_data_model.Algorithm(
+            kisao_id='KISAO_0000019',
+            changes=[
+                sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000209', new_value='1e-8'),
+                sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000571', new_value='1e-10'),
+            ],
+        )
+        solver_configuration = cache.get_solver_configuration(algorithm, 'KISAO_0000019',
+                                                             AlgorithmSubstitutionPolicy.NONE, config=config)
+        self.assertEqual(solver_configuration.solver_id, 'cvode')
+        self.assertFalse(solver_configuration.steady_state)
+        self.assertEqual(solver_configuration.parameter_values, (('relative_tolerance', 1e-8), ('absolute_tolerance', 1e-10)))
+
+        with mock.patch('biosimulators_tellurium.cache._compile_solver_configuration') as compile_solver_configuration:
+            self.assertIs(cache.get_solver_configuration(copy.deepcopy(algorithm), 'KISAO_0000019',
+                                                        AlgorithmSubstitutionPolicy.NONE, config=config),
+                          solver_configuration)
+            compile_solver_configuration.assert_not_called()
+
+        algorithm.changes.append(sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000488', new_value='1'))
+        for _ in range(2):
+            with self.assertRaises(NotImplementedError):
+                cache.get_solver_configuration(algorithm, 'KISAO_0000019', AlgorithmSubstitutionPolicy.NONE, config=config)
+            with self.assertWarns(BioSimulatorsWarning):
+                cache.get_solver_configuration(algorithm, 'KISAO_0000019', AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES,
+                                              config=config)
+
     def test_exec_sed_task_error_handling_with_biosimulators(self):
         # configure simulation
         task = sedml_data_model.Task(
@@ -636,7 +904,7 @@ class CoreTestCase(unittest.TestCase):
             source='model.xml',
             language=sedml_data_model.ModelLanguage.SBML.value,
         ))
-        if algorithm.kisao_id == 'KISAO_0000569':
+        if KISAO_ALGORITHM_SCHEMAS[algorithm.kisao_id].steady_state:
             doc.simulations.append(sedml_data_model.SteadyStateSimulation(
                 id='sim_steady_state',
                 algorithm=algorithm,
@@ -657,7 +925,7 @@ class CoreTestCase(unittest.TestCase):
             simulation=doc.simulations[0],
         ))
 
-        if algorithm.kisao_id != 'KISAO_0000569':
+        if not KISAO_ALGORITHM_SCHEMAS[algorithm.kisao_id].steady_state:
             doc.data_generators.append(sedml_data_model.DataGenerator(
                 id='data_gen_time',
                 variables=[
@@ -684,7 +952,7 @@ class CoreTestCase(unittest.TestCase):
 
         report = sedml_data_model.Report(id='report')
         doc.outputs.append(report)
-        if algorithm.kisao_id != 'KISAO_0000569':
+        if not KISAO_ALGORITHM_SCHEMAS[algorithm.kisao_id].steady_state:
             report.data_sets.append(sedml_data_model.DataSet(id='data_set_time', label='Time', data_generator=doc.data_generators[0]))
         report.data_sets.append(sedml_data_model.DataSet(id='data_set_C', label='C', data_generator=doc.data_generators[-1]))
 
@@ -700,7 +968,7 @@ class CoreTestCase(unittest.TestCase):
         self.assertEqual(sorted(report.keys()), sorted([d.id for d in doc.outputs[0].data_sets]))
 
         sim = doc.tasks[0].simulation
-        if doc.simulations[0].algorithm.kisao_id == 'KISAO_0000569':
+        if KISAO_ALGORITHM_SCHEMAS[doc.simulations[0].algorithm.kisao_id].steady_state:
             self.assertIn(report[doc.outputs[0].data_sets[0].id].shape, [(), (1,)])
             self.assertIsInstance(report[doc.outputs[0].data_sets[0].id].tolist(), (float, list))
         else:
@@ -709,7 +977,7 @@ class CoreTestCase(unittest.TestCase):
         for data_set_result in report.values():
             self.assertFalse(numpy.any(numpy.isnan(data_set_result)))
 
-        if doc.simulations[0].algorithm.kisao_id != 'KISAO_0000569':
+        if not KISAO_ALGORITHM_SCHEMAS[doc.simulations[0].algorithm.kisao_id].steady_state:
             self.assertIn('data_set_time', report)
             numpy.testing.assert_allclose(report[doc.outputs[0].data_sets[0].id],
                                           numpy.linspace(sim.output_start_time, sim.output_end_time, sim.number_of_points + 1))
@@ -768,7 +1036,7 @@ class CoreTestCase(unittest.TestCase):
                                                                        simulator_config=simulator_config)
                 self.assertEqual(set(results.keys()), set(['sim.sedml']))
                 self.assertEqual(set(results['sim.sedml'].keys()), set(['report']))
-                if alg.kisao_id == 'KISAO_0000569':
+                if KISAO_ALGORITHM_SCHEMAS[alg.kisao_id].steady_state:
                     self.assertEqual(set(results['sim.sedml']['report'].keys()), set(['data_set_C']))
                 else:
                     self.assertEqual(set(results['sim.sedml']['report'].keys()), set(['data_set_time', 'data_set_C']))
@@ -776,6 +1044,1218 @@ class CoreTestCase(unittest.TestCase):
                     raise log.exception
                 self._assert_combine_archive_outputs(doc, out_dir)
 
+    def test_exec_sedml_docs_in_combine_archives(self):
+        archive_dirname = os.path.join(self.dirname, 'archives')
+        os.mkdir(archive_dirname)
+        shutil.copyfile('tests/fixtures/BIOMD0000000297-with-reports.omex', os.path.join(archive_dirname, 'reports.omex'))
+        shutil.copyfile('tests/fixtures/BIOMD0000000297-with-plots.omex', os.path.join(archive_dirname, 'plots.omex'))
+
+        manifest_filename = os.path.join(archive_dirname, 'manifest.txt')
+        with open(manifest_filename, 'w') as file:
+            file.write('# archives\n')
+            file.write('reports.omex\n')
+            file.write('\n')
+            file.write('plots.omex\n')
+        archive_filenames = batch.read_combine_archive_manifest(manifest_filename)
+        self.assertEqual(archive_filenames, [
+            os.path.join(archive_dirname, 'reports.omex'),
+            os.path.join(archive_dirname, 'plots.omex'),
+        ])
+
+        for num_workers in [1, 2]:
+            out_dir = os.path.join(self.dirname, 'out-{}'.format(num_workers))
+            results = batch.exec_sedml_docs_in_combine_archives(archive_filenames, out_dir, num_workers=num_workers)
+            self.assertEqual(list(results.keys()), archive_filenames)
+            for _, log in results.values():
+                if log.exception:
+                    raise log.exception
+            self._assert_curated_combine_archive_outputs(os.path.join(out_dir, 'reports'), reports=True, plots=False)
+            self._assert_curated_combine_archive_outputs(os.path.join(out_dir, 'plots'), reports=False, plots=True)
+
+        with self.assertRaisesRegex(ValueError, 'unique names'):
+            batch.exec_sedml_docs_in_combine_archives(archive_filenames + archive_filenames[0:1], self.dirname)
+
+        # an exception raised by the execution of an archive is recorded in its log, and the other archives are executed
+        def exec_archive(archive_filename, out_dir, config=None, simulator_config=None):
+            if archive_filename.endswith('reports.omex'):
+                raise RuntimeError('Worker crashed')
+            return core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                           simulator_config=simulator_config)
+
+        for num_workers in [1, 2]:
+            out_dir = os.path.join(self.dirname, 'out-failed-{}'.format(num_workers))
+            with mock.patch.object(batch, 'exec_sedml_docs_in_combine_archive', side_effect=exec_archive):
+                # threads rather than processes, so that the patch applies to the workers
+                with mock.patch.object(concurrent.futures, 'ProcessPoolExecutor', concurrent.futures.ThreadPoolExecutor):
+                    results = batch.exec_sedml_docs_in_combine_archives(archive_filenames, out_dir, num_workers=num_workers)
+            results_0, log_0 = results[archive_filenames[0]]
+            self.assertEqual(results_0, None)
+            self.assertEqual(log_0.status, Status.FAILED)
+            self.assertEqual(str(log_0.exception), 'Worker crashed')
+            self.assertEqual(results[archive_filenames[1]][1].exception, None)
+            self._assert_curated_combine_archive_outputs(os.path.join(out_dir, 'plots'), reports=False, plots=True)
+
+        config = get_config()
+        config.DEBUG = True
+        with mock.patch.object(batch, 'exec_sedml_docs_in_combine_archive', side_effect=exec_archive):
+            with self.assertRaisesRegex(RuntimeError, 'Worker crashed'):
+                batch.exec_sedml_docs_in_combine_archives(archive_filenames, os.path.join(self.dirname, 'out-debug'),
+                                                          config=config, num_workers=1)
+
+    def test_exec_sedml_docs_in_combine_archives_with_runtime_db(self):
+        archive_dirname = os.path.join(self.dirname, 'archives')
+        os.mkdir(archive_dirname)
+        shutil.copyfile('tests/fixtures/BIOMD0000000297-with-reports.omex', os.path.join(archive_dirname, 'reports.omex'))
+        shutil.copyfile('tests/fixtures/repeat_no_reset.omex', os.path.join(archive_dirname, 'repeat_no_reset.omex'))
+        archive_filenames = [
+            os.path.join(archive_dirname, 'invalid.omex'),
+            os.path.join(archive_dirname, 'repeat_no_reset.omex'),
+            os.path.join(archive_dirname, 'reports.omex'),
+        ]
+
+        # the cost of a repeated task is the sum of the costs of the executions of its sub-tasks (11 iterations of a time
+        # course of 1001 points of a model with 4 elements)
+        predictions = batch.predict_archive_task_costs(archive_filenames[1])
+        self.assertEqual([(prediction.sed_document, prediction.task, prediction.algorithm) for prediction in predictions],
+                         [('repeat_no_reset.sedml', 'task1', 'KISAO_0000019')])
+        self.assertEqual(predictions[0].cost, 11 * 1001 * 4)
+        self.assertEqual(predictions[0].duration, predictions[0].cost * batch.DEFAULT_RUNTIME_PER_COST)
+        self.assertGreater(sum(prediction.cost for prediction in batch.predict_archive_task_costs(archive_filenames[2])),
+                           predictions[0].cost)
+        with self.assertWarnsRegex(BioSimulatorsWarning, 'could not be predicted'):
+            self.assertEqual(batch.predict_archive_task_costs(archive_filenames[0]), [])
+        with mock.patch.object(batch, 'get_model_cost_features', side_effect=KeyError('model')):
+            with self.assertRaises(KeyError):
+                batch.predict_archive_task_costs(archive_filenames[1])
+
+        # models which share a file are only read once
+        shutil.copyfile('tests/fixtures/BIOMD0000000297.xml', os.path.join(self.dirname, 'model.xml'))
+        doc = sedml_data_model.SedDocument(models=[
+            sedml_data_model.Model(id='model_1', source='model.xml'),
+            sedml_data_model.Model(id='model_2', source='model.xml'),
+            sedml_data_model.Model(id='model_3', source='#model_1'),
+        ])
+        with mock.patch('lxml.etree.fromstring', side_effect=lxml.etree.fromstring) as fromstring:
+            features = batch.get_model_cost_features(doc, self.dirname)
+        self.assertEqual(fromstring.call_count, 1)
+        self.assertEqual(features['model_1'], features['model_2'])
+        self.assertEqual(features['model_1'], features['model_3'])
+        self.assertGreater(features['model_1'][1], 1)
+
+        # archives are executed longest first
+        simulator_config = SimulatorConfig()
+        simulator_config.runtime_db = os.path.join(self.dirname, 'runtimes', 'runtimes.json')
+        with mock.patch.object(batch, 'exec_sedml_docs_in_combine_archive',
+                               side_effect=core.exec_sedml_docs_in_combine_archive) as exec_archive:
+            results = batch.exec_sedml_docs_in_combine_archives(archive_filenames, os.path.join(self.dirname, 'out'),
+                                                               simulator_config=simulator_config)
+        self.assertEqual([call[0][0] for call in exec_archive.call_args_list], archive_filenames[::-1])
+        self.assertEqual(list(results.keys()), archive_filenames)
+
+        # the predicted durations are recorded in the logs, and the runtimes in the database
+        log = results[archive_filenames[1]][1]
+        task_log = log.sed_documents['repeat_no_reset.sedml'].tasks['task1']
+        self.assertEqual(task_log.simulator_details['predictedDuration'], predictions[0].duration)
+        with open(os.path.join(self.dirname, 'out', 'repeat_no_reset', get_config().LOG_PATH), 'r') as file:
+            self.assertIn('predictedDuration', file.read())
+
+        runtime_db = batch.read_runtime_database(simulator_config.runtime_db)
+        self.assertEqual(runtime_db[predictions[0].model_hash]['KISAO_0000019'],
+                         {'cost': predictions[0].cost, 'duration': task_log.duration})
+
+        # durations are predicted from the observed runtimes
+        prediction = batch.predict_archive_task_costs(archive_filenames[1], runtime_db=runtime_db)[0]
+        self.assertAlmostEqual(prediction.duration, task_log.duration)
+
+        # durations of tasks with other models are predicted from the observed runtimes of the same algorithms, or of all
+        # algorithms
+        prediction.model_hash = 'other-model'
+        self.assertEqual(batch.predict_task_duration(prediction, {
+            'model-1': {'KISAO_0000019': {'cost': 1., 'duration': 2.}},
+            'model-2': {'KISAO_0000019': {'cost': 3., 'duration': 2.}, 'KISAO_0000029': {'cost': 1., 'duration': 10.}},
+        }), prediction.cost)
+        self.assertEqual(batch.predict_task_duration(prediction, {
+            'model-1': {'KISAO_0000029': {'cost': 1., 'duration': 2.}},
+        }), 2 * prediction.cost)
+
+    def test_plan_combine_archive(self):
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.h5, report_data_model.ReportFormat.csv]
+
+        # each iteration of the repeated task simulates 1001 time points of its sub-task; multidimensional reports can't be
+        # saved as CSV
+        cache.clear_caches()
+        plan = planning.plan_combine_archive('tests/fixtures/repeat_no_reset.omex', config=config)
+        self.assertEqual(plan.errors, [])
+
+        # planning compiles the models of the tasks, and caches them for their execution
+        self.assertEqual(len(cache._ROAD_RUNNER_STATE_CACHE), 1)
+        # the memory of the compiled model is estimated from the size of its state, which includes its selections
+        model_memory = plan.tasks[0].model_memory
+        self.assertAlmostEqual(model_memory, planning.ROAD_RUNNER_BYTES_PER_STATE_BYTE
+                               * len(list(cache._ROAD_RUNNER_STATE_CACHE.values())[0]), delta=0.01 * model_memory)
+        self.assertEqual(plan.tasks, [
+            TaskPlan(sed_document='repeat_no_reset.sedml', task='task1', num_simulations=11,
+                     num_variables=2, num_values=11 * 1 * 1001, result_size=2 * 11 * 1001 * 8,
+                     model_memory=model_memory, errors=[]),
+        ])
+        self.assertEqual(plan.num_simulations, 11)
+        self.assertEqual(plan.result_size, 2 * (2 * 11 * 1001 * 8))
+        self.assertEqual(plan.peak_memory, plan.result_size + model_memory)
+        self.assertEqual(plan.report_sizes, {})
+
+        # estimates of the sizes of reports, and of the peak memory of archives whose results aren't collected across
+        # SED documents
+        plan = planning.plan_combine_archive('tests/fixtures/BIOMD0000000297-with-reports.omex', config=config)
+        self.assertEqual(plan.errors, [])
+        self.assertEqual(plan.num_simulations, 2)
+        self.assertLess(plan.peak_memory - max(task_plan.model_memory for task_plan in plan.tasks), plan.result_size)
+
+        out_dir = os.path.join(self.dirname, 'out')
+        core.exec_sedml_docs_in_combine_archive('tests/fixtures/BIOMD0000000297-with-reports.omex', out_dir, config=config)
+        self.assertEqual(sorted(plan.report_sizes.keys()), [
+            'ex1/BIOMD0000000297.sedml/report_1_task1.csv',
+            'ex2/BIOMD0000000297.sedml/report_1_task1.csv',
+            'reports.h5',
+        ])
+        for filename, size in plan.report_sizes.items():
+            actual_size = os.path.getsize(os.path.join(out_dir, filename))
+            self.assertGreater(size, actual_size / 2)
+            self.assertLess(size, actual_size * 2)
+
+        # errors in tasks are recorded
+        with mock.patch.object(planning, 'preprocess_sed_task', side_effect=ValueError('Invalid target')):
+            plan = planning.plan_combine_archive('tests/fixtures/repeat_no_reset.omex', config=config)
+        self.assertEqual(plan.tasks[0].errors, ['Invalid target'])
+        self.assertEqual(plan.tasks[0].model_memory, 0)
+
+        # tasks are validated without preprocessing them with the tellurium SED-ML interpreter
+        simulator_config = SimulatorConfig()
+        simulator_config.sedml_interpreter = SedmlInterpreter.tellurium
+        plan = planning.plan_combine_archive('tests/fixtures/BIOMD0000000297-with-plots.omex', config=config,
+                                             simulator_config=simulator_config)
+        self.assertEqual(plan.errors, [])
+        self.assertNotEqual(plan.tasks, [])
+        for task_plan in plan.tasks:
+            self.assertEqual(task_plan.errors, [])
+            self.assertGreater(task_plan.model_memory, 0)
+        self.assertGreater(plan.peak_memory, plan.result_size)
+
+        plan = planning.plan_combine_archive(os.path.join(self.dirname, 'missing.omex'), config=config)
+        self.assertEqual(plan.tasks, [])
+        self.assertEqual(len(plan.errors), 1)
+
+    def test_get_reset_methods(self):
+        model_etree = lxml.etree.parse(self.EXAMPLE_MODEL_FILENAME)
+        road_runner = roadrunner.RoadRunner(self.EXAMPLE_MODEL_FILENAME)
+
+        simulation_reset_method, value_reset_methods = core.get_reset_methods(
+            model_etree, road_runner.model, ['C', '[C]', 'VM1', 'cell'])
+        self.assertEqual(simulation_reset_method, 'reset')
+        self.assertEqual(value_reset_methods, {'C': 'reset', '[C]': 'reset', 'VM1': 'resetAll', 'cell': 'resetAll'})
+
+        # events which assign global parameters can only be undone by resetting all of the components of the model
+        sbml_model = model_etree.getroot()[0]
+        lxml.etree.SubElement(sbml_model, '{{{}}}eventAssignment'.format(self.NAMESPACES['sbml']), variable='C')
+        self.assertEqual(core.get_reset_methods(model_etree, road_runner.model, [])[0], 'reset')
+        lxml.etree.SubElement(sbml_model, '{{{}}}eventAssignment'.format(self.NAMESPACES['sbml']), variable='VM1')
+        self.assertEqual(core.get_reset_methods(model_etree, road_runner.model, [])[0], 'resetAll')
+
+        # the instance of a task is only reset as far as its simulation requires
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=10.,
+                number_of_points=10,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(
+                id='VM1',
+                target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='VM1']",
+                target_namespaces=self.NAMESPACES,
+                task=task),
+        ]
+        preprocessed_task = core.preprocess_sed_task(task, variables)
+        self.assertEqual(core.get_task_reset_method(task, preprocessed_task), 'reset')
+        core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        self.assertTrue(preprocessed_task.road_runners.is_modified(task.id))
+        with mock.patch.object(preprocessed_task.road_runners[task.id], 'resetAll') as reset_all:
+            core.reset_all_models(preprocessed_task)
+            reset_all.assert_not_called()
+        self.assertEqual(preprocessed_task.road_runners[task.id]['time'], 0.)
+
+        core.set_model_variable_value(task.model, "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='VM1']",
+                                      None, 4., preprocessed_task)
+        core.reset_all_models(preprocessed_task)
+        self.assertEqual(preprocessed_task.road_runners[task.id]['VM1'], 3.)
+
+        # changes to the structure of models are applied to their XML before they are compiled, so the initial states of
+        # their instances, which `resetAll` restores, include the changes; `resetToOrigin` would also discard the initial
+        # values which are changed in memory
+        model_etree = lxml.etree.parse(self.EXAMPLE_MODEL_FILENAME)
+        parameters = model_etree.xpath('/sbml:sbml/sbml:model/sbml:listOfParameters', namespaces=self.NAMESPACES)[0]
+        lxml.etree.SubElement(parameters, '{{{}}}parameter'.format(self.NAMESPACES['sbml']), id='k_new', value='2')
+        changed_model_filename = os.path.join(self.dirname, 'changed-model.xml')
+        model_etree.write(changed_model_filename, xml_declaration=True, encoding='UTF-8')
+
+        road_runner = cache.load_road_runner(changed_model_filename)
+        road_runner['init(VM1)'] = 4.
+        road_runner.resetAll()
+        initial_amounts = road_runner.model.getFloatingSpeciesAmounts()
+
+        road_runner.simulate(0., 10., 11)
+        road_runner['VM1'] = 5.
+        road_runner['k_new'] = 6.
+        road_runner.resetAll()
+        self.assertEqual(road_runner['time'], 0.)
+        self.assertEqual(road_runner['VM1'], 4.)
+        self.assertEqual(road_runner['k_new'], 2.)
+        numpy.testing.assert_allclose(road_runner.model.getFloatingSpeciesAmounts(), initial_amounts)
+
+        road_runner.resetToOrigin()
+        self.assertEqual(road_runner['VM1'], 3.)
+        self.assertEqual(road_runner['k_new'], 2.)
+
+    def test_change_local_parameters(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'local_parameters.xml')
+        namespaces = {'sbml': 'http://www.sbml.org/sbml/level3/version1/core'}
+        local_parameter_target = ("/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction[@id='{}']"
+                                  "/sbml:kineticLaw/sbml:listOfLocalParameters/sbml:localParameter[@id='k']")
+
+        # the promoted id of the local parameter of `R1` collides with the id of a global parameter
+        road_runner = cache.load_road_runner(model_filename)
+        self.assertEqual(core.get_local_parameter_tellurium_id_map(lxml.etree.parse(model_filename), road_runner.model),
+                         {('R1', 'k'): 'R1_k_1', ('R2', 'k'): 'R2_k'})
+
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=model_filename,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=10.,
+                number_of_points=10,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(id='R1_k', target=local_parameter_target.format('R1'), target_namespaces=namespaces,
+                                      task=task),
+            sedml_data_model.Variable(
+                id='global_R1_k',
+                target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='R1_k']",
+                target_namespaces=namespaces,
+                task=task),
+        ]
+        preprocessed_task = core.preprocess_sed_task(task, variables)
+
+        # local parameters are changed in memory, without recompiling the model
+        with mock.patch.object(core, 'load_road_runner', side_effect=cache.load_road_runner) as load_road_runner:
+            for value in [0.2, 0.4]:
+                core.reset_all_models(preprocessed_task)
+                core.set_model_variable_value(task.model, local_parameter_target.format('R1'), None, value, preprocessed_task)
+                results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+                numpy.testing.assert_allclose(results['R1_k'], numpy.full((11,), value))
+                numpy.testing.assert_allclose(results['global_R1_k'], numpy.full((11,), 5.))
+            load_road_runner.assert_not_called()
+
+        # targets which don't match a single local parameter
+        model_etree = lxml.etree.parse(model_filename)
+        local_parameter_tellurium_id_map = core.get_local_parameter_tellurium_id_map(model_etree, road_runner.model)
+        variable = sedml_data_model.Variable(id='R3_k', target=local_parameter_target.format('R3'), target_namespaces=namespaces)
+        with self.assertRaisesRegex(ValueError, 'must match a single element'):
+            core.get_local_parameter_tellurium_id(model_etree, variable, local_parameter_tellurium_id_map)
+
+        variable.target = "/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction/sbml:kineticLaw["
+        with self.assertRaisesRegex(ValueError, 'not a valid XPath'):
+            core.get_local_parameter_tellurium_id(model_etree, variable, local_parameter_tellurium_id_map)
+
+    def test_load_road_runner(self):
+        cache.clear_caches()
+        simulator_config = SimulatorConfig()
+        simulator_config.model_cache_size = 1
+
+        road_runner = cache.load_road_runner(self.EXAMPLE_MODEL_FILENAME, simulator_config=simulator_config)
+        self.assertEqual(len(cache._ROAD_RUNNER_STATE_CACHE), 1)
+        road_runner['C'] = 2.
+        results = road_runner.simulate(0., 10., 11)
+
+        cached_road_runner = cache.load_road_runner(self.EXAMPLE_MODEL_FILENAME, simulator_config=simulator_config)
+        self.assertIsNot(cached_road_runner, road_runner)
+        self.assertNotEqual(cached_road_runner['C'], 2.)
+        cached_road_runner['C'] = 2.
+        numpy.testing.assert_allclose(cached_road_runner.simulate(0., 10., 11), results)
+
+        cache.load_road_runner('tests/fixtures/BIOMD0000000297.xml', simulator_config=simulator_config)
+        self.assertEqual(len(cache._ROAD_RUNNER_STATE_CACHE), 1)
+
+        simulator_config.model_cache_size = 0
+        cache.clear_caches()
+        cache.load_road_runner(self.EXAMPLE_MODEL_FILENAME, simulator_config=simulator_config)
+        self.assertEqual(len(cache._ROAD_RUNNER_STATE_CACHE), 0)
+
+    def test_exec_sed_task_with_shared_models(self):
+        model = sedml_data_model.Model(
+            id='model',
+            source=self.EXAMPLE_MODEL_FILENAME,
+            language=sedml_data_model.ModelLanguage.SBML.value,
+        )
+        tasks = []
+        for i_task, kisao_id in enumerate(['KISAO_0000019', 'KISAO_0000032']):
+            tasks.append(sedml_data_model.Task(
+                id='task_{}'.format(i_task),
+                model=model,
+                simulation=sedml_data_model.UniformTimeCourseSimulation(
+                    initial_time=0.,
+                    output_start_time=0.,
+                    output_end_time=10. * (i_task + 1),
+                    number_of_points=10,
+                    algorithm=sedml_data_model.Algorithm(kisao_id=kisao_id),
+                ),
+            ))
+        repeated_task = sedml_data_model.RepeatedTask(
+            id='repeated_task',
+            sub_tasks=[sedml_data_model.SubTask(task=task, order=i_task) for i_task, task in enumerate(tasks)],
+        )
+        variables = [
+            sedml_data_model.Variable(
+                id='C',
+                target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                target_namespaces=self.NAMESPACES,
+                task=repeated_task),
+        ]
+
+        simulator_config = SimulatorConfig()
+        simulator_config.share_models = False
+        preprocessed_task = core.preprocess_sed_task(repeated_task, variables, simulator_config=simulator_config)
+        self.assertIsNot(preprocessed_task.road_runners['task_0'], preprocessed_task.road_runners['task_1'])
+        expected_results = {}
+        for task in tasks:
+            expected_results[task.id], _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+
+        simulator_config.share_models = True
+        preprocessed_task = core.preprocess_sed_task(repeated_task, variables, simulator_config=simulator_config)
+        self.assertIs(preprocessed_task.road_runners['task_0'], preprocessed_task.road_runners['task_1'])
+        for task in tasks + tasks:
+            results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+            numpy.testing.assert_allclose(results['C'], expected_results[task.id]['C'], rtol=1e-4)
+            self.assertEqual(preprocessed_task.road_runners[task.id].getIntegrator().getName(),
+                             preprocessed_task.solver_configurations[task.id].solver_id)
+
+    def test_exec_sed_task_with_max_resident_models(self):
+        model = sedml_data_model.Model(
+            id='model',
+            source=self.EXAMPLE_MODEL_FILENAME,
+            language=sedml_data_model.ModelLanguage.SBML.value,
+        )
+        tasks = []
+        for i_task in range(3):
+            tasks.append(sedml_data_model.Task(
+                id='task_{}'.format(i_task),
+                model=model,
+                simulation=sedml_data_model.UniformTimeCourseSimulation(
+                    initial_time=0.,
+                    output_start_time=0.,
+                    output_end_time=10. * (i_task + 1),
+                    number_of_points=10,
+                    algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+                ),
+            ))
+        repeated_task = sedml_data_model.RepeatedTask(
+            id='repeated_task',
+            sub_tasks=[sedml_data_model.SubTask(task=task, order=i_task) for i_task, task in enumerate(tasks)],
+        )
+        target = "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']"
+        variables = [
+            sedml_data_model.Variable(id='C', target=target, target_namespaces=self.NAMESPACES, task=repeated_task),
+        ]
+
+        simulator_config = SimulatorConfig()
+        results = {}
+        for max_resident_models in [0, 1]:
+            simulator_config.max_resident_models = max_resident_models
+            preprocessed_task = core.preprocess_sed_task(repeated_task, variables, simulator_config=simulator_config)
+            results[max_resident_models] = []
+            for value in [0.01, 0.02]:
+                core.reset_all_models(preprocessed_task)
+                core.set_model_variable_value(model, target, None, value, preprocessed_task)
+                for task in tasks:
+                    task_results, log = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+                    self.assertEqual(task_results['C'][0], value)
+                    results[max_resident_models].append(task_results['C'])
+
+            if max_resident_models:
+                self.assertEqual(preprocessed_task.road_runners.peak_num_resident, 1)
+                self.assertGreater(preprocessed_task.road_runners.num_restorations, 0)
+            else:
+                self.assertEqual(preprocessed_task.road_runners.peak_num_resident, 3)
+
+        for unlimited_result, limited_result in zip(results[0], results[1]):
+            numpy.testing.assert_allclose(limited_result, unlimited_result)
+
+    def test_exec_sed_task_in_chunks(self):
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=5.,
+                output_end_time=20.,
+                number_of_points=30,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(
+                id='C',
+                target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                target_namespaces=self.NAMESPACES,
+                task=task),
+        ]
+
+        simulator_config = SimulatorConfig()
+        expected_results, _ = core.exec_sed_task(task, variables, simulator_config=simulator_config)
+
+        simulator_config.simulation_chunk_size = 7
+        results, _ = core.exec_sed_task(task, variables, simulator_config=simulator_config)
+        numpy.testing.assert_allclose(results['Time'], expected_results['Time'])
+        numpy.testing.assert_allclose(results['C'], expected_results['C'], rtol=1e-4)
+
+        simulator_config.max_absolute_value = numpy.max(expected_results['C']) * 0.999
+        i_expected_divergence = numpy.argmax(expected_results['C'] > simulator_config.max_absolute_value)
+        log = TaskLog()
+        with self.assertRaisesRegex(ValueError, 'out-of-bounds value.*at time .*algorithm `KISAO_0000019`'):
+            core.exec_sed_task(task, variables, log=log, config=get_config(), simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['divergence']['selections'], ['[C]'])
+        self.assertEqual(log.simulator_details['divergence']['time'], expected_results['Time'][i_expected_divergence])
+
+    def test_exec_sed_task_with_time_limits(self):
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=1000.,
+                number_of_points=1000,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+        ]
+
+        simulator_config = SimulatorConfig()
+        simulator_config.task_time_limit = 60.
+        results, _ = core.exec_sed_task(task, variables, simulator_config=simulator_config)
+        self.assertEqual(results['Time'].shape, (1001,))
+
+        # time courses of tasks with deadlines are simulated in chunks, unless the size of the chunks is set
+        with mock.patch.object(core, 'integrate_time_course', side_effect=core.integrate_time_course) as integrate_time_course:
+            with mock.patch.object(core, 'DEADLINE_SIMULATION_CHUNK_SIZE', 100):
+                default_chunked_results, _ = core.exec_sed_task(task, variables, simulator_config=simulator_config)
+        self.assertEqual(integrate_time_course.call_count, 10)
+        numpy.testing.assert_allclose(default_chunked_results['Time'], results['Time'])
+
+        simulator_config.task_time_limit = 0.
+        with mock.patch.object(core, 'integrate_time_course', side_effect=core.integrate_time_course) as integrate_time_course:
+            with mock.patch.object(core, 'DEADLINE_SIMULATION_CHUNK_SIZE', 100):
+                core.exec_sed_task(task, variables, simulator_config=simulator_config)
+        self.assertEqual(integrate_time_course.call_count, 1)
+
+        preprocessed_task = core.preprocess_sed_task(task, variables, simulator_config=simulator_config)
+        with mock.patch('time.monotonic', side_effect=[0., 1e6]):
+            with mock.patch.object(core, 'DEADLINE_SIMULATION_CHUNK_SIZE', 100):
+                preprocessed_task.deadline = 1.
+                with self.assertRaisesRegex(core.SimulationTimeoutError, 'exceeded its time budget at simulation time 100.0'):
+                    core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, simulator_config=simulator_config)
+
+        simulator_config.task_time_limit = 60.
+        simulator_config.simulation_chunk_size = 100
+        chunked_results, _ = core.exec_sed_task(task, variables, simulator_config=simulator_config)
+        numpy.testing.assert_allclose(chunked_results['Time'], results['Time'])
+
+        preprocessed_task = core.preprocess_sed_task(task, variables, simulator_config=simulator_config)
+        log = TaskLog()
+        with mock.patch('time.monotonic', side_effect=[0., 1e6]):
+            preprocessed_task.deadline = 1.
+            with self.assertRaisesRegex(core.SimulationTimeoutError, 'exceeded its time budget at simulation time 100.0'):
+                core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, log=log, config=get_config(),
+                                   simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['timeout'], {'time': 100.})
+
+        # archive time limit
+        doc, archive_filename = self._build_combine_archive()
+        simulator_config = SimulatorConfig()
+        simulator_config.archive_time_limit = 1e-6
+        config = get_config()
+        config.LOG = True
+        _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, self.dirname, config=config,
+                                                         simulator_config=simulator_config)
+        task_log = log.sed_documents['sim.sedml'].tasks['task_1']
+        self.assertEqual(task_log.status, Status.FAILED)
+        self.assertIsInstance(task_log.exception, core.SimulationTimeoutError)
+
+    def test_exec_sed_task_with_result_cache(self):
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                initial_time=0.,
+                output_start_time=5.,
+                output_end_time=20.,
+                number_of_points=30,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(
+                id='C',
+                target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                target_namespaces=self.NAMESPACES,
+                task=task),
+        ]
+        config = get_config()
+        cache.clear_caches()
+
+        # without the cache, a second execution continues from the state of the first
+        simulator_config = SimulatorConfig()
+        preprocessed_task = core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+        expected_results_1, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, config=config,
+                                                   simulator_config=simulator_config)
+        expected_results_2, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, config=config,
+                                                   simulator_config=simulator_config)
+
+        simulator_config.result_cache_size = 4
+        log = TaskLog()
+        core.exec_sed_task(task, variables, log=log, config=config, simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['resultCache'], 'miss')
+
+        preprocessed_task = core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+        log = TaskLog()
+        with mock.patch.object(core, 'simulate_time_course', side_effect=core.simulate_time_course) as simulate_time_course:
+            results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, log=log, config=config,
+                                            simulator_config=simulator_config)
+            simulate_time_course.assert_not_called()
+        self.assertEqual(log.simulator_details['resultCache'], 'hit')
+        numpy.testing.assert_allclose(results['C'], expected_results_1['C'])
+        self.assertEqual(set(preprocessed_task.model_hashes.keys()), set([task.id]))
+
+        # the skipped simulation is replayed before the instance is used again
+        log = TaskLog()
+        results, _ = core.exec_sed_task(task, variables, preprocessed_task=preprocessed_task, log=log, config=config,
+                                        simulator_config=simulator_config)
+        self.assertNotIn('resultCache', log.simulator_details)
+        numpy.testing.assert_allclose(results['C'], expected_results_2['C'])
+
+        # results are stored on disk
+        cache.clear_caches()
+        simulator_config.result_cache_dir = os.path.join(self.dirname, 'results')
+        core.exec_sed_task(task, variables, config=config, simulator_config=simulator_config)
+        self.assertEqual(len(os.listdir(simulator_config.result_cache_dir)), 1)
+
+        cache.clear_caches()
+        log = TaskLog()
+        results, _ = core.exec_sed_task(task, variables, log=log, config=config, simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['resultCache'], 'hit')
+        numpy.testing.assert_allclose(results['C'], expected_results_1['C'])
+
+        simulator_config.result_cache_size = 1
+        task.simulation.output_end_time = 30.
+        core.exec_sed_task(task, variables, config=config, simulator_config=simulator_config)
+        self.assertEqual(len(os.listdir(simulator_config.result_cache_dir)), 1)
+
+        # files are evicted in batches, rather than listing the directory each time results are cached
+        simulator_config.result_cache_size = 4
+        with mock.patch.object(core.glob, 'glob', side_effect=core.glob.glob) as glob:
+            for i_result in range(5):
+                cache.cache_results('key-{}'.format(i_result), numpy.array([i_result]), simulator_config)
+        self.assertEqual(glob.call_count, 1)
+        self.assertEqual(sorted(os.listdir(simulator_config.result_cache_dir)), ['key-1.npy', 'key-2.npy', 'key-3.npy', 'key-4.npy'])
+        simulator_config.result_cache_size = 1
+
+        # stochastic simulations are only cached with fixed seeds
+        task.simulation.algorithm = sedml_data_model.Algorithm(kisao_id='KISAO_0000029')
+        log = TaskLog()
+        core.exec_sed_task(task, variables, log=log, config=config, simulator_config=simulator_config)
+        self.assertNotIn('resultCache', log.simulator_details)
+
+        task.simulation.algorithm.changes.append(sedml_data_model.AlgorithmParameterChange(
+            kisao_id='KISAO_0000488', new_value='10'))
+        log = TaskLog()
+        core.exec_sed_task(task, variables, log=log, config=config, simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['resultCache'], 'miss')
+        log = TaskLog()
+        core.exec_sed_task(task, variables, log=log, config=config, simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['resultCache'], 'hit')
+
+        cache.clear_caches()
+
+    def test_preprocess_sed_task_with_validation_cache(self):
+        task = sedml_data_model.Task(
+            id='task',
+            model=sedml_data_model.Model(
+                id='model',
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                id='sim',
+                initial_time=0.,
+                output_start_time=0.,
+                output_end_time=10.,
+                number_of_points=10,
+                algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+            ),
+        )
+        variables = [
+            sedml_data_model.Variable(id='Time', symbol=sedml_data_model.Symbol.time, task=task),
+        ]
+        config = get_config()
+        config.VALIDATE_SEDML = True
+        config.VALIDATE_SEDML_MODELS = True
+        simulator_config = SimulatorConfig()
+        cache.clear_caches()
+
+        with mock.patch.object(validation, 'validate_model', side_effect=validation.validate_model) as validate_model:
+            with warnings.catch_warnings(record=True) as expected_warnings:
+                warnings.simplefilter('always')
+                core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(validate_model.call_count, 1)
+            self.assertTrue(any(self.EXAMPLE_MODEL_FILENAME in str(warning.message) for warning in expected_warnings))
+
+            with warnings.catch_warnings(record=True) as cached_warnings:
+                warnings.simplefilter('always')
+                core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(validate_model.call_count, 1)
+            self.assertEqual([str(warning.message) for warning in cached_warnings],
+                             [str(warning.message) for warning in expected_warnings])
+
+            # validations are reused by copies of model files
+            task.model.source = os.path.join(self.dirname, 'model.xml')
+            shutil.copyfile(self.EXAMPLE_MODEL_FILENAME, task.model.source)
+            with warnings.catch_warnings(record=True) as cached_warnings:
+                warnings.simplefilter('always')
+                core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(validate_model.call_count, 1)
+            self.assertEqual([str(warning.message) for warning in cached_warnings],
+                             [str(warning.message).replace(self.EXAMPLE_MODEL_FILENAME, task.model.source)
+                              for warning in expected_warnings])
+
+            # errors are raised again
+            task.simulation.output_end_time = -1.
+            for _ in range(2):
+                with self.assertRaisesRegex(ValueError, 'Simulation `sim` is invalid'):
+                    core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            task.simulation.output_end_time = 10.
+
+            # validations aren't shared by tasks with different ids, whose errors and warnings could mention their ids
+            num_validations = len(cache._VALIDATION_CACHE)
+            task.id = 'task_2'
+            core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(len(cache._VALIDATION_CACHE), num_validations + 1)
+            task.id = 'task'
+
+            # the least recently used validations are evicted from memory
+            self.assertGreater(len(cache._VALIDATION_CACHE), 2)
+            simulator_config.validation_cache_size = 2
+            core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(len(cache._VALIDATION_CACHE), 2)
+            simulator_config.validation_cache_size = 256
+
+            # validations are stored on disk
+            cache.clear_caches()
+            simulator_config.validation_cache_dir = os.path.join(self.dirname, 'validations')
+            core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(validate_model.call_count, 2)
+            self.assertEqual(len(os.listdir(simulator_config.validation_cache_dir)), 2)
+
+            cache.clear_caches()
+            core.preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+            self.assertEqual(validate_model.call_count, 2)
+
+        cache.clear_caches()
+
+    def test_exec_sed_doc_with_duplicate_tasks(self):
+        doc = self._build_sed_doc()
+        shutil.copyfile(self.EXAMPLE_MODEL_FILENAME, os.path.join(self.dirname, 'model.xml'))
+
+        doc.simulations.append(copy.deepcopy(doc.simulations[0]))
+        doc.simulations[1].id = 'sim_time_course_2'
+        doc.tasks.append(sedml_data_model.Task(
+            id='task_2',
+            model=doc.models[0],
+            simulation=doc.simulations[1],
+        ))
+        doc.data_generators.append(sedml_data_model.DataGenerator(
+            id='data_gen_C_2',
+            variables=[
+                sedml_data_model.Variable(
+                    id='var_C_2',
+                    target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                    target_namespaces=self.NAMESPACES,
+                    task=doc.tasks[1],
+                ),
+            ],
+            math='var_C_2',
+        ))
+        doc.outputs[0].data_sets.append(sedml_data_model.DataSet(id='data_set_C_2', label='C',
+                                                                 data_generator=doc.data_generators[-1]))
+        self.assertEqual(dedup.get_equivalent_tasks(doc), [doc.tasks])
+
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.csv]
+        config.COLLECT_SED_DOCUMENT_RESULTS = True
+
+        simulator_config = SimulatorConfig()
+        simulator_config.deduplicate_tasks = True
+        with mock.patch.object(core, 'preprocess_sed_task', side_effect=core.preprocess_sed_task) as preprocess_sed_task:
+            results, log = core.exec_sed_doc_with_biosimulators(doc, self.dirname, os.path.join(self.dirname, 'out'),
+                                                                config=config, simulator_config=simulator_config)
+            self.assertEqual(preprocess_sed_task.call_count, 1)
+        self.assertEqual(log.tasks['task_1'].simulator_details['duplicates'], ['task_2'])
+        self.assertEqual(log.tasks['task_2'].status, Status.SUCCEEDED)
+        self.assertEqual(log.tasks['task_2'].simulator_details, {'duplicateOf': 'task_1'})
+        numpy.testing.assert_allclose(results['report']['data_set_C_2'], results['report']['data_set_C'])
+
+        # tasks aren't deduplicated by default
+        with mock.patch.object(core, 'preprocess_sed_task', side_effect=core.preprocess_sed_task) as preprocess_sed_task:
+            expected_results, _ = core.exec_sed_doc_with_biosimulators(doc, self.dirname, os.path.join(self.dirname, 'out'),
+                                                                       config=config)
+            self.assertEqual(preprocess_sed_task.call_count, 2)
+        numpy.testing.assert_allclose(results['report']['data_set_C_2'], expected_results['report']['data_set_C_2'])
+
+        # stochastic simulations are only deduplicated with fixed seeds
+        doc.tasks[1].simulation.output_end_time = 20.
+        self.assertEqual(dedup.get_equivalent_tasks(doc), [])
+
+        for sim in doc.simulations:
+            sim.output_end_time = 10.
+            sim.algorithm = sedml_data_model.Algorithm(kisao_id='KISAO_0000029')
+        self.assertEqual(dedup.get_equivalent_tasks(doc), [])
+
+        for sim in doc.simulations:
+            sim.algorithm.changes.append(sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000488', new_value='1'))
+        self.assertEqual(dedup.get_equivalent_tasks(doc), [doc.tasks])
+
+    def test_exec_sed_doc_with_in_memory_model_changes(self):
+        shutil.copyfile(os.path.join(os.path.dirname(__file__), 'fixtures', 'local_parameters.xml'),
+                        os.path.join(self.dirname, 'model.xml'))
+        namespaces = {'sbml': 'http://www.sbml.org/sbml/level3/version1/core'}
+        model_target = '/sbml:sbml/sbml:model'
+
+        doc = sedml_data_model.SedDocument()
+        doc.simulations.append(sedml_data_model.UniformTimeCourseSimulation(
+            id='sim',
+            initial_time=0.,
+            output_start_time=0.,
+            output_end_time=10.,
+            number_of_points=10,
+            algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+        ))
+        doc.outputs.append(sedml_data_model.Report(id='report'))
+        for i_model, (size, R1_k, k, S1) in enumerate([('1', '5', '0.1', '10'), ('2', '3', '0.3', '20')]):
+            doc.models.append(sedml_data_model.Model(
+                id='model_{}'.format(i_model),
+                source='model.xml',
+                language=sedml_data_model.ModelLanguage.SBML.value,
+                changes=[
+                    sedml_data_model.ModelAttributeChange(
+                        target=model_target + "/sbml:listOfCompartments/sbml:compartment[@id='c']/@size",
+                        target_namespaces=namespaces,
+                        new_value=size),
+                    sedml_data_model.ModelAttributeChange(
+                        target=model_target + "/sbml:listOfParameters/sbml:parameter[@id='R1_k']",
+                        target_namespaces=namespaces,
+                        new_value=R1_k),
+                    sedml_data_model.ModelAttributeChange(
+                        target=(model_target + "/sbml:listOfReactions/sbml:reaction[@id='R1']/sbml:kineticLaw"
+                                "/sbml:listOfLocalParameters/sbml:localParameter[@id='k']/@value"),
+                        target_namespaces=namespaces,
+                        new_value=k),
+                    sedml_data_model.ModelAttributeChange(
+                        target=model_target + "/sbml:listOfSpecies/sbml:species[@id='S1']/@initialConcentration",
+                        target_namespaces=namespaces,
+                        new_value=S1),
+                ],
+            ))
+            doc.tasks.append(sedml_data_model.Task(id='task_{}'.format(i_model), model=doc.models[-1],
+                                                   simulation=doc.simulations[0]))
+            for species_id in ['S1', 'S2']:
+                doc.data_generators.append(sedml_data_model.DataGenerator(
+                    id='data_gen_{}_{}'.format(species_id, i_model),
+                    variables=[
+                        sedml_data_model.Variable(
+                            id='var_{}_{}'.format(species_id, i_model),
+                            target=model_target + "/sbml:listOfSpecies/sbml:species[@id='{}']".format(species_id),
+                            target_namespaces=namespaces,
+                            task=doc.tasks[-1],
+                        ),
+                    ],
+                    math='var_{}_{}'.format(species_id, i_model),
+                ))
+                doc.outputs[0].data_sets.append(sedml_data_model.DataSet(
+                    id='data_set_{}_{}'.format(species_id, i_model), label=species_id,
+                    data_generator=doc.data_generators[-1]))
+
+        # all of the changes set initial values
+        plan = model_changes.plan_in_memory_model_changes(doc, self.dirname)
+        self.assertEqual(plan, {model.id: model.changes for model in doc.models})
+
+        # the concentrations of the species of changed compartments are preserved
+        model_etree = lxml.etree.parse(os.path.join(self.dirname, 'model.xml'))
+        self.assertEqual(model_changes.get_in_memory_initial_values(model_etree, doc.models[1].changes[0:1], 'model_1', {}),
+                         collections.OrderedDict([('init(c)', 2.), ('init([S1])', 10.), ('init([S2])', 0.)]))
+        self.assertEqual(list(model_changes.get_in_memory_initial_values(model_etree, doc.models[1].changes, 'model_1',
+                                                                {('R1', 'k'): 'R1_k_1'}).keys()),
+                         ['init(c)', 'init(R1_k)', 'init(R1_k_1)', 'init([S1])', 'init([S2])'])
+
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.csv]
+        config.COLLECT_SED_DOCUMENT_RESULTS = True
+
+        # models which only differ in their initial values share a compilation
+        compiled_models = set()
+        original_load_road_runner = cache.load_road_runner
+
+        def load_road_runner(filename, **kwargs):
+            with open(filename, 'rb') as file:
+                compiled_models.add(file.read())
+            return original_load_road_runner(filename, **kwargs)
+
+        simulator_config = SimulatorConfig()
+        simulator_config.in_memory_model_changes = True
+        with mock.patch.object(core, 'load_road_runner', side_effect=load_road_runner):
+            results, log = core.exec_sed_doc_with_biosimulators(doc, self.dirname, os.path.join(self.dirname, 'out'),
+                                                                config=config, simulator_config=simulator_config)
+        self.assertEqual(len(compiled_models), 1)
+        self.assertEqual(len(doc.models[0].changes), 4)
+
+        simulator_config = SimulatorConfig()
+        simulator_config.in_memory_model_changes = False
+        compiled_models.clear()
+        with mock.patch.object(core, 'load_road_runner', side_effect=load_road_runner):
+            expected_results, _ = core.exec_sed_doc_with_biosimulators(doc, self.dirname, os.path.join(self.dirname, 'out'),
+                                                                       config=config, simulator_config=simulator_config)
+        self.assertEqual(len(compiled_models), 2)
+
+        for data_set in doc.outputs[0].data_sets:
+            numpy.testing.assert_allclose(results['report'][data_set.id], expected_results['report'][data_set.id], rtol=1e-6)
+        self.assertEqual(results['report']['data_set_S1_1'][0], 20.)
+
+        # changes within replaced elements and to initial values determined by initial assignments are applied to XML
+        doc.models[0].changes.append(sedml_data_model.ReplaceElementModelChange(
+            target=model_target + "/sbml:listOfParameters/sbml:parameter[@id='R1_k']",
+            target_namespaces=namespaces,
+            new_elements='<parameter xmlns="{}" id="R1_k" value="4" constant="true"/>'.format(namespaces['sbml'])))
+        doc.models[1].changes.append(sedml_data_model.AddElementModelChange(
+            target=model_target,
+            target_namespaces=namespaces,
+            new_elements=('<listOfInitialAssignments xmlns="{}"><initialAssignment symbol="S1"><math '
+                          'xmlns="http://www.w3.org/1998/Math/MathML"><cn>5</cn></math></initialAssignment>'
+                          '</listOfInitialAssignments>').format(namespaces['sbml'])))
+        plan = model_changes.plan_in_memory_model_changes(doc, self.dirname)
+        self.assertEqual(plan['model_0'], [doc.models[0].changes[0], doc.models[0].changes[2], doc.models[0].changes[3]])
+        self.assertEqual(plan['model_1'], doc.models[1].changes[0:4])
+
+        with open(os.path.join(self.dirname, 'model.xml'), 'r') as file:
+            xml = file.read()
+        with open(os.path.join(self.dirname, 'model.xml'), 'w') as file:
+            file.write(xml.replace('</listOfReactions>', (
+                '</listOfReactions><listOfInitialAssignments><initialAssignment symbol="S1"><math '
+                'xmlns="http://www.w3.org/1998/Math/MathML"><cn>5</cn></math></initialAssignment></listOfInitialAssignments>')))
+        plan = model_changes.plan_in_memory_model_changes(doc, self.dirname)
+        self.assertEqual(plan['model_0'], [doc.models[0].changes[0], doc.models[0].changes[2]])
+
+    def test_precompute_compute_model_changes(self):
+        model = sedml_data_model.Model(id='model', source='model.xml', language=sedml_data_model.ModelLanguage.SBML.value)
+        range = sedml_data_model.UniformRange(id='r', start=0., end=1., number_of_steps=4,
+                                              type=sedml_data_model.UniformRangeType.linear)
+        variable = sedml_data_model.Variable(id='v', target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']",
+                                             target_namespaces=self.NAMESPACES, model=model)
+        changes = []
+        for math, variables in [
+            ('k * 2 + sin(r) ^ 2', []),
+            ('max(r) + log(2, k)', []),
+            ('k', []),
+            ('r + v', [variable]),
+            ('r + uniform(0, 1)', []),
+        ]:
+            changes.append(sedml_data_model.SetValueComputeModelChange(
+                model=model, target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']",
+                target_namespaces=self.NAMESPACES, range=range, math=math, variables=variables,
+                parameters=[sedml_data_model.Parameter(id='k', value=3.)]))
+        task = sedml_data_model.RepeatedTask(id='task', range=range, ranges=[range], changes=changes)
+        doc = sedml_data_model.SedDocument(models=[model], tasks=[task])
+        expected_values = [
+            [utils.calc_compute_model_change_new_value(change, variable_values={'v': 1.}, range_values={'r': value})
+             for value in utils.resolve_range(range)]
+            for change in changes
+        ]
+
+        # changes which only depend on ranges and parameters are evaluated for all of the iterations at once
+        self.assertEqual(model_changes.precompute_compute_model_changes(doc), changes[0:3])
+        for change, values in zip(changes[0:3], expected_values):
+            self.assertEqual(change.math, change.range.id)
+            self.assertEqual(change.parameters, [])
+            self.assertIn(change.range, task.ranges)
+            numpy.testing.assert_allclose(utils.resolve_range(change.range), values, rtol=1e-12)
+            self.assertEqual(utils.calc_compute_model_change_new_value(change, range_values={change.range.id: change.range.values[1]}),
+                             change.range.values[1])
+        self.assertEqual(changes[3].math, 'r + v')
+        self.assertEqual(changes[4].math, 'r + uniform(0, 1)')
+
+    def test_exec_sedml_docs_in_combine_archive_incrementally(self):
+        doc = self._build_sed_doc()
+        doc.models.append(sedml_data_model.Model(
+            id='model_2',
+            source='model_2.xml',
+            language=sedml_data_model.ModelLanguage.SBML.value,
+        ))
+        doc.tasks.append(sedml_data_model.Task(
+            id='task_2',
+            model=doc.models[1],
+            simulation=doc.simulations[0],
+        ))
+        doc.data_generators.append(sedml_data_model.DataGenerator(
+            id='data_gen_C_2',
+            variables=[
+                sedml_data_model.Variable(
+                    id='var_C_2',
+                    target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='C']",
+                    target_namespaces=self.NAMESPACES,
+                    task=doc.tasks[1],
+                ),
+            ],
+            math='var_C_2',
+        ))
+        doc.outputs.append(sedml_data_model.Report(id='report_2', data_sets=[
+            sedml_data_model.DataSet(id='data_set_C_2', label='C', data_generator=doc.data_generators[-1]),
+        ]))
+
+        archive_dirname = os.path.join(self.dirname, 'archive')
+        os.mkdir(archive_dirname)
+        shutil.copyfile(self.EXAMPLE_MODEL_FILENAME, os.path.join(archive_dirname, 'model.xml'))
+        shutil.copyfile(self.EXAMPLE_MODEL_FILENAME, os.path.join(archive_dirname, 'model_2.xml'))
+        SedmlSimulationWriter().run(doc, os.path.join(archive_dirname, 'sim.sedml'))
+        archive = combine_data_model.CombineArchive(
+            contents=[
+                combine_data_model.CombineArchiveContent(
+                    'model.xml', combine_data_model.CombineArchiveContentFormat.SBML.value),
+                combine_data_model.CombineArchiveContent(
+                    'model_2.xml', combine_data_model.CombineArchiveContentFormat.SBML.value),
+                combine_data_model.CombineArchiveContent(
+                    'sim.sedml', combine_data_model.CombineArchiveContentFormat.SED_ML.value),
+            ],
+        )
+        archive_filename = os.path.join(self.dirname, 'archive.omex')
+        CombineArchiveWriter().run(archive, archive_dirname, archive_filename)
+
+        out_dir = os.path.join(self.dirname, 'out')
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.h5, report_data_model.ReportFormat.csv]
+        config.BUNDLE_OUTPUTS = True
+        config.KEEP_INDIVIDUAL_OUTPUTS = False
+        simulator_config = SimulatorConfig()
+        simulator_config.incremental = True
+
+        _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                         simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        manifest = checkpoint.read_incremental_manifest(out_dir)
+        self.assertEqual(sorted(manifest.keys()), ['sim.sedml/report', 'sim.sedml/report_2'])
+
+        # nothing changed
+        with mock.patch.object(core, 'exec_sed_doc', side_effect=core.exec_sed_doc) as exec_sed_doc:
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                             simulator_config=simulator_config)
+            exec_sed_doc.assert_not_called()
+        if log.exception:
+            raise log.exception
+        self.assertEqual(log.sed_documents['sim.sedml'].outputs['report'].status, Status.SKIPPED)
+        self.assertEqual(set(ReportReader().get_ids(out_dir)), set(['sim.sedml/report', 'sim.sedml/report_2']))
+        with zipfile.ZipFile(os.path.join(out_dir, 'reports.zip')) as bundle:
+            self.assertEqual(sorted(bundle.namelist()), ['sim.sedml/report.csv', 'sim.sedml/report_2.csv'])
+
+        # one model changed
+        with open(os.path.join(archive_dirname, 'model_2.xml'), 'r') as file:
+            model = file.read()
+        with open(os.path.join(archive_dirname, 'model_2.xml'), 'w') as file:
+            file.write(model.replace('id="VM1" name="VM1" value="3"', 'id="VM1" name="VM1" value="4"'))
+        CombineArchiveWriter().run(archive, archive_dirname, archive_filename)
+
+        with mock.patch.object(core, 'exec_sed_doc', side_effect=core.exec_sed_doc) as exec_sed_doc:
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                             simulator_config=simulator_config)
+            exec_sed_doc.assert_called_once()
+            exec_doc = exec_sed_doc.call_args[0][0]
+            self.assertEqual([output.id for output in exec_doc.outputs], ['report_2'])
+            self.assertEqual([task.id for task in exec_doc.tasks], ['task_2'])
+        if log.exception:
+            raise log.exception
+        self.assertEqual(log.sed_documents['sim.sedml'].tasks['task_1'].status, Status.SKIPPED)
+        self.assertEqual(log.sed_documents['sim.sedml'].tasks['task_2'].status, Status.SUCCEEDED)
+        self.assertEqual(log.sed_documents['sim.sedml'].outputs['report'].status, Status.SKIPPED)
+        self.assertEqual(log.sed_documents['sim.sedml'].outputs['report_2'].status, Status.SUCCEEDED)
+        self.assertNotEqual(checkpoint.read_incremental_manifest(out_dir)['sim.sedml/report_2'], manifest['sim.sedml/report_2'])
+        with zipfile.ZipFile(os.path.join(out_dir, 'reports.zip')) as bundle:
+            self.assertEqual(sorted(bundle.namelist()), ['sim.sedml/report.csv', 'sim.sedml/report_2.csv'])
+
+        # outputs whose files are missing are re-executed
+        os.remove(os.path.join(out_dir, 'reports.h5'))
+        with mock.patch.object(core, 'exec_sed_doc', side_effect=core.exec_sed_doc) as exec_sed_doc:
+            core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config, simulator_config=simulator_config)
+            self.assertEqual(len(exec_sed_doc.call_args[0][0].outputs), 2)
+
+    def test_exec_sedml_docs_in_combine_archive_solver_statistics(self):
+        archive_filename = 'tests/fixtures/repeat_no_reset.omex'
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.h5]
+
+        _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, self.dirname, config=config)
+        if log.exception:
+            raise log.exception
+
+        # the statistics of the repeated task include the work of each of its 11 iterations
+        solver_statistics = log.sed_documents['repeat_no_reset.sedml'].tasks['task1'].simulator_details['solverStatistics']
+        self.assertEqual(solver_statistics['integrations'], 11)
+        self.assertEqual(solver_statistics['steps'], 11 * 1000)
+        self.assertGreater(solver_statistics['integrationTime'], 0.)
+
+        summary = core.summarize_solver_statistics(log)
+        self.assertEqual(summary['tasks'], 1)
+        self.assertEqual(summary['integrations'], 11)
+        self.assertEqual(summary['slowestTasks'], ['repeat_no_reset.sedml/task1'])
+
+    def test_exec_sedml_docs_in_combine_archive_with_checkpoints(self):
+        archive_filename = 'tests/fixtures/repeat_no_reset.omex'
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.h5]
+        config.COLLECT_SED_DOCUMENT_RESULTS = True
+        config.COLLECT_COMBINE_ARCHIVE_RESULTS = True
+
+        expected_results, log = core.exec_sedml_docs_in_combine_archive(archive_filename, os.path.join(self.dirname, 'expected'),
+                                                                         config=config)
+        if log.exception:
+            raise log.exception
+
+        # interrupt the execution of the 6th iteration of the repeated task, whose iterations aren't reset
+        out_dir = os.path.join(self.dirname, 'out')
+        simulator_config = SimulatorConfig()
+        simulator_config.checkpoint = True
+        simulator_config.deduplicate_tasks = False
+        exec_sed_task = core.exec_sed_task
+
+        def interrupted_exec_sed_task(*args, **kwargs):
+            if interrupted_exec_sed_task.num_calls == 5:
+                raise RuntimeError('Preempted')
+            interrupted_exec_sed_task.num_calls += 1
+            return exec_sed_task(*args, **kwargs)
+        interrupted_exec_sed_task.num_calls = 0
+
+        with mock.patch.object(core, 'exec_sed_task', side_effect=interrupted_exec_sed_task):
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                             simulator_config=simulator_config)
+        self.assertIsNotNone(log.exception)
+        self.assertEqual(len(os.listdir(os.path.join(out_dir, checkpoint.CHECKPOINT_DIRNAME))), 1)
+
+        # resume the repeated task from the state of its last recorded iteration
+        with mock.patch.object(core, 'exec_sed_task', side_effect=exec_sed_task) as mock_exec_sed_task:
+            results, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                                   simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self.assertEqual(mock_exec_sed_task.call_count, 11 - 5)
+        for report_id, report_results in expected_results['repeat_no_reset.sedml'].items():
+            for data_set_id, data_set_results in report_results.items():
+                numpy.testing.assert_allclose(results['repeat_no_reset.sedml'][report_id][data_set_id], data_set_results,
+                                              rtol=1e-6)
+        self.assertFalse(os.path.isdir(os.path.join(out_dir, checkpoint.CHECKPOINT_DIRNAME)))
+
+        # the outputs of completed documents are reused
+        with mock.patch.object(core, 'exec_sed_doc', side_effect=core.exec_sed_doc) as exec_sed_doc:
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config,
+                                                             simulator_config=simulator_config)
+            exec_sed_doc.assert_not_called()
+        if log.exception:
+            raise log.exception
+
+    def test_ReportBatchWriter(self):
+        report = sedml_data_model.Report(id='report', name='Report', data_sets=[
+            sedml_data_model.DataSet(id='data_set_time', label='time'),
+            sedml_data_model.DataSet(id='data_set_C', label='C', name='C'),
+        ])
+        results = report_data_model.DataSetResults({
+            'data_set_time': numpy.linspace(0., 10., 11),
+            'data_set_C': numpy.linspace(0., 1., 6),
+        })
+
+        expected_dirname = os.path.join(self.dirname, 'expected')
+        for format in [report_data_model.ReportFormat.h5, report_data_model.ReportFormat.csv]:
+            ReportWriter().run(report, results, expected_dirname, 'a/b/report', format=format)
+
+        for h5_compression in ['gzip', 'lzf', 'none']:
+            dirname = os.path.join(self.dirname, h5_compression)
+            writer = core.ReportBatchWriter(h5_compression=h5_compression)
+            for rel_path in ['a/b/report', 'a/report', 'a/b/report']:
+                for format in [report_data_model.ReportFormat.h5, report_data_model.ReportFormat.csv]:
+                    writer.run(report, results, dirname, rel_path, format=format)
+            self.assertEqual(len(writer._h5_files), 1)
+            writer.close()
+            self.assertEqual(writer._h5_files, {})
+
+            self.assertEqual(sorted(ReportReader().get_ids(dirname)), ['a/b/report', 'a/report'])
+            for format in [report_data_model.ReportFormat.h5, report_data_model.ReportFormat.csv]:
+                expected_report = ReportReader().run(report, expected_dirname, 'a/b/report', format=format)
+                saved_report = ReportReader().run(report, dirname, 'a/b/report', format=format)
+                for data_set in report.data_sets:
+                    numpy.testing.assert_allclose(saved_report[data_set.id], expected_report[data_set.id])
+
+            with h5py.File(os.path.join(expected_dirname, 'reports.h5'), 'r') as expected_file:
+                with h5py.File(os.path.join(dirname, 'reports.h5'), 'r') as file:
+                    for key in ['a/b/report', 'a/b']:
+                        self.assertEqual({attr: numpy.array(value).tolist() for attr, value in file[key].attrs.items()},
+                                         {attr: numpy.array(value).tolist() for attr, value in expected_file[key].attrs.items()})
+                    self.assertIsNotNone(file['a/b/report'].chunks)
+                    self.assertEqual(file['a/b/report'].compression, None if h5_compression == 'none' else h5_compression)
+
+        # errors are raised when reports are saved
+        writer = core.ReportBatchWriter()
+        with self.assertRaisesRegex(TypeError, 'NumPy dtype'):
+            writer.run(report, report_data_model.DataSetResults({'data_set_time': numpy.array(['a'], dtype=object)}),
+                       self.dirname, 'report')
+        writer.close()
+
     def test_exec_sed_doc(self):
         with mock.patch('biosimulators_tellurium.core.exec_sed_doc_with_biosimulators', return_value=None):
             core.exec_sed_doc(None, None, None)
@@ -785,6 +2265,145 @@ class CoreTestCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             core.exec_sed_doc(None, None, None, simulator_config=simulator_config)
 
+    def test_exec_sedml_docs_in_combine_archive_with_cached_tellurium_code(self):
+        cache.clear_caches()
+        simulator_config = SimulatorConfig()
+        simulator_config.sedml_interpreter = SedmlInterpreter.tellurium
+        archive_filename = 'tests/fixtures/BIOMD0000000297-with-reports.omex'
+
+        dirname = os.path.join(self.dirname, 'first')
+        _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, dirname, simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self._assert_curated_combine_archive_outputs(dirname, reports=True, plots=False)
+        num_cached_codes = len(cache._TELLURIUM_CODE_CACHE)
+        self.assertGreater(num_cached_codes, 0)
+
+        # the working and output directories are different for the second execution
+        dirname = os.path.join(self.dirname, 'second')
+        with mock.patch('biosimulators_tellurium.core.SEDMLCodeFactory', side_effect=Exception('Code was regenerated')):
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, dirname, simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self._assert_curated_combine_archive_outputs(dirname, reports=True, plots=False)
+        self.assertEqual(len(cache._TELLURIUM_CODE_CACHE), num_cached_codes)
+
+        simulator_config.code_cache_size = 0
+        cache.clear_caches()
+        dirname = os.path.join(self.dirname, 'uncached')
+        _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, dirname, simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self.assertEqual(len(cache._TELLURIUM_CODE_CACHE), 0)
+
+    def test_get_tellurium_sedml_code_errors(self):
+        cache.clear_caches()
+        doc = sedml_data_model.SedDocument(outputs=[Report(id='report')])
+
+        class CodeFactory(object):
+            def __init__(self, sedml, workingDir, **kwargs):
+                self.workingDir = workingDir
+
+            def toPython(self):
+                return self.source
+
+        CodeFactory.source = "workingDir = r'other'\n"
+        with mock.patch('biosimulators_tellurium.core.SEDMLCodeFactory', CodeFactory):
+            with self.assertRaisesRegex(ValueError, 'working directory'):
+                core.get_tellurium_sedml_code(doc, '<sedML/>', self.dirname, 'out', 'pdf')
+
+        CodeFactory.source = "workingDir = r'{}'\nos.path.join('other', 'report.csv')\n".format(self.dirname)
+        with mock.patch('biosimulators_tellurium.core.SEDMLCodeFactory', CodeFactory):
+            with self.assertRaisesRegex(ValueError, 'output directory'):
+                core.get_tellurium_sedml_code(doc, '<sedML/>', self.dirname, 'out', 'pdf')
+
+        # data description files are part of the cache key
+        CodeFactory.source = "workingDir = r'{}'\nos.path.join('out', 'report.csv')\n".format(self.dirname)
+        doc.data_descriptions = [mock.Mock(source='data.csv')]
+        with open(os.path.join(self.dirname, 'data.csv'), 'w') as file:
+            file.write('a\n1\n')
+        with mock.patch('biosimulators_tellurium.core.SEDMLCodeFactory', CodeFactory):
+            code = core.get_tellurium_sedml_code(doc, '<sedML/>', self.dirname, 'out', 'pdf')
+            self.assertIs(core.get_tellurium_sedml_code(doc, '<sedML/>', self.dirname, 'out', 'pdf'), code)
+
+            with open(os.path.join(self.dirname, 'data.csv'), 'w') as file:
+                file.write('a\n2\n')
+            self.assertIsNot(core.get_tellurium_sedml_code(doc, '<sedML/>', self.dirname, 'out', 'pdf'), code)
+
+    def test_exec_sedml_docs_in_combine_archive_with_tellurium_reports_only(self):
+        archive_filename = 'tests/fixtures/BIOMD0000000297-with-reports-and-plots.omex'
+        simulator_config = SimulatorConfig()
+        simulator_config.sedml_interpreter = SedmlInterpreter.tellurium
+        config = get_config()
+        config.VIZ_FORMATS = []
+        config.LOG = True
+
+        # plots aren't rendered, but their data is saved
+        dirname = os.path.join(self.dirname, 'plot-data')
+        with mock.patch('tellurium.nextFigure', side_effect=Exception('Plot was rendered')):
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, dirname, config=config,
+                                                             simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self.assertIn('ex1/BIOMD0000000297.sedml/plot_1_task1', ReportReader().get_ids(dirname))
+        self.assertNotIn('plots.zip', os.listdir(dirname))
+
+        # only reports
+        simulator_config.save_plot_data = False
+        dirname = os.path.join(self.dirname, 'reports-only')
+        with mock.patch('tellurium.nextFigure', side_effect=Exception('Plot was rendered')):
+            _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, dirname, config=config,
+                                                             simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self.assertEqual(set(ReportReader().get_ids(dirname)), set([
+            'ex1/BIOMD0000000297.sedml/report_1_task1',
+            'ex2/BIOMD0000000297.sedml/report_1_task1',
+        ]))
+        doc_log = log.sed_documents['ex1/BIOMD0000000297.sedml']
+        self.assertEqual(doc_log.outputs['report_1_task1'].status, Status.SUCCEEDED)
+        self.assertEqual(doc_log.outputs['plot_1_task1'].status, Status.SKIPPED)
+
+    def test_get_data_generators_and_tasks_for_outputs(self):
+        doc = self._build_sed_doc()
+        doc.tasks.append(sedml_data_model.Task(id='unused_task', model=doc.models[0], simulation=doc.simulations[0]))
+        doc.data_generators.append(sedml_data_model.DataGenerator(
+            id='unused_data_generator',
+            variables=[sedml_data_model.Variable(id='var', symbol=sedml_data_model.Symbol.time.value, task=doc.tasks[-1])],
+            math='var',
+        ))
+
+        data_generators = tellurium_utils.get_data_generators_for_outputs(doc)
+        self.assertEqual(data_generators, doc.data_generators[0:-1])
+
+        doc.data_generators = data_generators
+        self.assertEqual(tellurium_utils.get_tasks_for_data_generators(doc), doc.tasks[0:-1])
+
+    def test_write_sed_doc_to_string(self):
+        doc = self._build_sed_doc()
+        sedml = tellurium_utils.write_sed_doc_to_string(doc)
+        self.assertIn('<sedML', sedml)
+        self.assertIn('id="task_1"', sedml)
+
+        factory = tellurium.sedml.tesedml.SEDMLCodeFactory(sedml, workingDir=self.dirname)
+        self.assertEqual(factory.doc.getListOfTasks()[0].getId(), 'task_1')
+
+    def test_exec_sedml_docs_in_combine_archive_with_tellurium_scratch_dir(self):
+        simulator_config = SimulatorConfig()
+        simulator_config.sedml_interpreter = SedmlInterpreter.tellurium
+        simulator_config.scratch_dir = os.path.join(self.dirname, 'scratch')
+        os.mkdir(simulator_config.scratch_dir)
+
+        out_dir = os.path.join(self.dirname, 'out')
+        with mock.patch('tempfile.mkdtemp', wraps=tempfile.mkdtemp) as mkdtemp:
+            _, log = core.exec_sedml_docs_in_combine_archive('tests/fixtures/BIOMD0000000297-with-reports.omex', out_dir,
+                                                             simulator_config=simulator_config)
+        if log.exception:
+            raise log.exception
+        self._assert_curated_combine_archive_outputs(out_dir, reports=True, plots=False)
+        self.assertIn(mock.call(dir=simulator_config.scratch_dir), mkdtemp.call_args_list)
+        self.assertEqual(os.listdir(simulator_config.scratch_dir), [])
+
     # tellurium error handling
     def test_exec_sedml_docs_in_combine_archive_with_tellurium_error_handling(self):
         archive_filename = 'tests/fixtures/BIOMD0000000297-with-reports-and-plots.omex'
@@ -792,7 +2411,8 @@ class CoreTestCase(unittest.TestCase):
         simulator_config = SimulatorConfig()
         simulator_config.sedml_interpreter = SedmlInterpreter.tellurium
 
-        with mock.patch.object(tellurium.sedml.tesedml.SEDMLCodeFactory, 'executePython', side_effect=Exception('my error')):
+        cache.clear_caches()
+        with mock.patch.object(tellurium.sedml.tesedml.SEDMLCodeFactory, 'toPython', side_effect=Exception('my error')):
             _, log = core.exec_sedml_docs_in_combine_archive(archive_filename, self.dirname, simulator_config=simulator_config)
         with self.assertRaisesRegex(Exception, 'my error'):
             if log.exception:
@@ -810,6 +2430,47 @@ class CoreTestCase(unittest.TestCase):
 
         self._assert_curated_combine_archive_outputs(self.dirname, reports=True, plots=True)
 
+    def test_exec_sedml_docs_in_combine_archives_with_cli(self):
+        manifest_filename = os.path.join(self.dirname, 'manifest.txt')
+        with open(manifest_filename, 'w') as file:
+            file.write(os.path.abspath('tests/fixtures/BIOMD0000000297-with-reports-and-plots.omex') + '\n')
+        out_dir = os.path.join(self.dirname, 'out')
+        env = self._get_combine_archive_exec_env()
+
+        with mock.patch.dict(os.environ, env):
+            with __main__.App(argv=['--manifest', manifest_filename, '-o', out_dir]) as app:
+                app.run()
+
+        self._assert_curated_combine_archive_outputs(os.path.join(out_dir, 'BIOMD0000000297-with-reports-and-plots'),
+                                                     reports=True, plots=True)
+
+        with self.assertRaisesRegex(SystemExit, 'must be provided'):
+            with __main__.App(argv=['-o', out_dir]) as app:
+                app.run()
+
+        with self.assertRaisesRegex(SystemExit, 'Only one'):
+            with __main__.App(argv=['-i', 'archive.omex', '--manifest', manifest_filename, '-o', out_dir]) as app:
+                app.run()
+
+    def test_plan_combine_archives_with_cli(self):
+        manifest_filename = os.path.join(self.dirname, 'manifest.txt')
+        with open(manifest_filename, 'w') as file:
+            file.write(os.path.abspath('tests/fixtures/repeat_no_reset.omex') + '\n')
+            file.write(os.path.abspath('tests/fixtures/BIOMD0000000297-with-reports.omex') + '\n')
+        out_dir = os.path.join(self.dirname, 'out')
+
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with __main__.App(argv=['--manifest', manifest_filename, '-o', out_dir, '--plan']) as app:
+                app.run()
+        plans = json.loads(stdout.getvalue())
+        self.assertEqual([plan['num_simulations'] for plan in plans], [11, 2])
+        self.assertFalse(os.path.isdir(out_dir))
+
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with __main__.App(argv=['-i', 'tests/fixtures/repeat_no_reset.omex', '-o', out_dir, '--plan']) as app:
+                app.run()
+        self.assertEqual(json.loads(stdout.getvalue())[0]['tasks'][0]['num_values'], 11 * 1001)
+
     def test_sim_with_docker_image(self):
         archive_filename = 'tests/fixtures/BIOMD0000000297-with-reports-and-plots.omex'
         env = self._get_combine_archive_exec_env()
@@ -1,5 +1,8 @@
-from biosimulators_tellurium.data_model import SedmlInterpreter, PlottingEngine, KISAO_ALGORITHM_MAP
+from biosimulators_tellurium.data_model import (SedmlInterpreter, PlottingEngine, KISAO_ALGORITHM_MAP, KISAO_ALGORITHM_SCHEMAS,
+                                                 SolverConfiguration, RoadRunnerPool, TauLeapingIntegrator)
 from biosimulators_utils.utils.core import parse_value
+from unittest import mock
+import roadrunner
 import unittest
 import json
 import os
@@ -49,5 +52,155 @@ class DataModelTestCase(unittest.TestCase):
                                  'Algorithm: `{}`, Parameter: `{}`'.format(alg_specs['kisaoId']['id'], param_specs['kisaoId']['id'])
                                  )
 
+    def test_KISAO_ALGORITHM_SCHEMAS(self):
+        self.assertEqual(list(KISAO_ALGORITHM_SCHEMAS.keys()), list(KISAO_ALGORITHM_MAP.keys()))
+        for kisao_id, alg_props in KISAO_ALGORITHM_MAP.items():
+            alg_schema = KISAO_ALGORITHM_SCHEMAS[kisao_id]
+            self.assertEqual(alg_schema.id, alg_props['id'])
+            self.assertEqual(alg_schema.steady_state, alg_props['id'] in ['nleq2', 'newton'])
+            self.assertEqual(alg_schema.stochastic, alg_props['id'] in ['gillespie', 'tau_leaping'])
+            self.assertEqual(list(alg_schema.parameters.keys()), list(alg_props['parameters'].keys()))
+            for param_kisao_id, param_props in alg_props['parameters'].items():
+                param_schema = alg_schema.parameters[param_kisao_id]
+                self.assertEqual(param_schema.type, param_props['type'])
+                self.assertEqual(param_schema.default, param_props['default'])
+                self.assertEqual(param_schema.roadrunner_attribute, param_props.get('roadrunner_attribute', param_props['id']))
+
+        param_schema = KISAO_ALGORITHM_SCHEMAS['KISAO_0000019'].parameters['KISAO_0000571']
+        self.assertEqual(param_schema.roadrunner_attribute, 'absolute_tolerance')
+        self.assertTrue(param_schema.is_valid('1e-8'))
+        self.assertFalse(param_schema.is_valid('abc'))
+        self.assertEqual(param_schema.parse('1e-8'), 1e-8)
+
+        # parameters which select the solver which implements an algorithm
+        param_schema = KISAO_ALGORITHM_SCHEMAS['KISAO_0000282'].parameters['KISAO_0000476']
+        self.assertEqual(param_schema.solver_ids, {'none': 'newton', 'linesearch': 'newton_linesearch'})
+        self.assertTrue(param_schema.is_valid('linesearch'))
+        self.assertFalse(param_schema.is_valid('trust_region'))
+
+    def test_SolverConfiguration(self):
+        config = SolverConfiguration(
+            algorithm_kisao_id='KISAO_0000019',
+            solver_id='cvode',
+            steady_state=False,
+            parameter_values=(('relative_tolerance', 1e-8), ('stiff', False)),
+        )
+        same_config = SolverConfiguration(
+            algorithm_kisao_id='KISAO_0000019',
+            solver_id='cvode',
+            steady_state=False,
+            parameter_values=(('relative_tolerance', 1e-8), ('stiff', False)),
+        )
+        self.assertEqual(hash(config), hash(same_config))
+        self.assertEqual(len(set([config, same_config])), 1)
+
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'BIOMD0000000003_url.xml')
+        for _ in range(2):
+            road_runner = roadrunner.RoadRunner(model_filename)
+            solver = config.apply(road_runner)
+            self.assertEqual(solver.getName(), 'cvode')
+            self.assertEqual(solver.relative_tolerance, 1e-8)
+            self.assertEqual(solver.stiff, False)
+
+        road_runner = roadrunner.RoadRunner(model_filename)
+        solver = SolverConfiguration('KISAO_0000569', 'nleq2', True, (('maximum_iterations', 50),)).apply(road_runner)
+        self.assertEqual(solver.getName(), 'nleq2')
+        self.assertEqual(solver.maximum_iterations, 50)
+        self.assertEqual(config.get_solver(road_runner).getName(), 'cvode')
+
+        # integrators which RoadRunner doesn't implement
+        tau_leaping_config = SolverConfiguration('KISAO_0000040', 'tau_leaping', False, (('seed', 3), ('epsilon', 0.01)))
+        solver = tau_leaping_config.apply(road_runner)
+        self.assertIsInstance(solver, TauLeapingIntegrator)
+        self.assertEqual(solver.getName(), 'tau_leaping')
+        self.assertEqual([solver.getParamName(i_param) for i_param in range(solver.getNumParams())],
+                         ['seed', 'epsilon', 'nonnegative'])
+        self.assertEqual(solver.seed, 3)
+        self.assertEqual(solver.epsilon, 0.01)
+        self.assertEqual(solver.nonnegative, False)
+        self.assertEqual(road_runner.getIntegrator().getName(), 'cvode')
+
+        # each application creates an integrator whose random number generator starts from the seed
+        self.assertEqual(tau_leaping_config.get_solver(road_runner), None)
+        other_solver = tau_leaping_config.apply(road_runner)
+        self.assertIsNot(other_solver, solver)
+        self.assertFalse(solver.is_random_number_generator_used())
+        self.assertEqual(solver.get_random_number_generator().random(), other_solver.get_random_number_generator().random())
+        self.assertTrue(solver.is_random_number_generator_used())
+        fresh_solver = tau_leaping_config.apply(road_runner)
+        self.assertNotEqual(solver.get_random_number_generator().random(), fresh_solver.get_random_number_generator().random())
+
+    def test_RoadRunnerPool(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'BIOMD0000000003_url.xml')
+        pool = RoadRunnerPool(max_resident=1)
+        road_runner_1 = roadrunner.RoadRunner(model_filename)
+        road_runner_1.setIntegrator('rk4')
+        pool.add('task_1', 'slot_1', road_runner_1)
+        pool.add('task_2', 'slot_1')
+        pool.add('task_3', 'slot_2', roadrunner.RoadRunner(model_filename))
+        with self.assertRaises(ValueError):
+            pool.add('task_4', 'slot_3')
+
+        self.assertEqual(len(pool), 3)
+        self.assertEqual(set(pool.keys()), set(['task_1', 'task_2', 'task_3']))
+        self.assertEqual(pool.num_evictions, 1)
+        self.assertTrue(pool.has_slot('slot_1'))
+
+        pool.set_value('task_1', 'VM1', 5.)
+        pool.set_value('task_3', 'VM1', 6.)
+        self.assertEqual(pool['task_3']['VM1'], 6.)
+
+        road_runner = pool['task_2']
+        self.assertIs(pool['task_1'], road_runner)
+        self.assertEqual(road_runner['VM1'], 5.)
+        self.assertEqual(road_runner.getIntegrator().getName(), 'rk4')
+        self.assertEqual(pool.num_restorations, 1)
+        self.assertEqual(pool.num_evictions, 2)
+        self.assertEqual(pool.peak_num_resident, 1)
+
+        pool.reset_all()
+        self.assertEqual(pool['task_3']['VM1'], 3.)
+        self.assertEqual(pool['task_1']['VM1'], 3.)
+
+        # modification tracking and deferred simulations
+        self.assertFalse(pool.is_modified('task_1'))
+        pool.set_value('task_1', 'VM1', 5.)
+        self.assertTrue(pool.is_modified('task_2'))
+        self.assertFalse(pool.is_modified('task_3'))
+
+        simulate = mock.Mock()
+        pool.defer_simulation('task_3', simulate)
+        self.assertTrue(pool.is_modified('task_3'))
+        pool.reset_all()
+        self.assertFalse(pool.is_modified('task_3'))
+        pool['task_3']
+        simulate.assert_not_called()
+
+        pool.defer_simulation('task_3', simulate)
+        pool['task_1']
+        simulate.assert_called_once()
+
+        # only modified instances are reset, with the cheapest method which restores their initial states
+        pool = RoadRunnerPool()
+        road_runners = [mock.MagicMock() for _ in range(3)]
+        for i_road_runner, road_runner in enumerate(road_runners):
+            pool.add('task_{}'.format(i_road_runner + 1), 'slot_{}'.format(i_road_runner + 1), road_runner)
+        pool.mark_modified('task_1', 'reset')
+        pool.mark_modified('task_2', 'reset')
+        pool.set_value('task_2', 'VM1', 5., 'resetAll')
+        pool.mark_modified('task_2', 'reset')
+        pool.reset_all()
+        road_runners[0].reset.assert_called_once_with()
+        road_runners[0].resetAll.assert_not_called()
+        road_runners[1].resetAll.assert_called_once_with()
+        road_runners[1].reset.assert_not_called()
+        road_runners[2].reset.assert_not_called()
+        road_runners[2].resetAll.assert_not_called()
+        self.assertFalse(pool.is_modified('task_2'))
+
+        pool.reset_all()
+        road_runners[0].reset.assert_called_once_with()
+        road_runners[1].resetAll.assert_called_once_with()
+
 if __name__ == "__main__":
     unittest.main()